@@ -0,0 +1,260 @@
+"""
+회의록 일괄 처리 CLI (backlog import).
+
+    python batch.py ./transcripts                  # 디렉터리 (하위 폴더 포함)
+    python batch.py "archive/2024-*.txt" --concurrency 4 --rate 30
+    python batch.py ./transcripts --dry-run        # 처리 대상만 확인 (API 호출 없음)
+
+진행 상황은 manifest(JSONL)에 파일 sha256 기준으로 기록되며,
+중단 후 같은 명령을 다시 실행하면 이미 완료된 파일은 건너뛴다.
+"""
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from config import get_settings
+from utils.logger import setup_logging, stop_logging
+from utils.admission import get_admission_controller
+from utils.deadline import Deadline
+from services.pipeline import MeetingPipeline, SUPPORTED_EXTENSIONS
+
+logger = logging.getLogger("Batch")
+
+DEFAULT_MANIFEST = "data/batch_manifest.jsonl"
+
+
+@dataclass
+class BatchFile:
+    path: str
+    size: int
+    sha256: str
+
+
+def discover_files(targets: List[str]) -> List[str]:
+    """디렉터리(재귀) 또는 glob 패턴에서 지원 확장자 파일 목록 수집 (중복 제거, 정렬)"""
+    found = set()
+    for target in targets:
+        if os.path.isdir(target):
+            candidates = glob.glob(os.path.join(target, "**", "*"), recursive=True)
+        else:
+            candidates = glob.glob(target, recursive=True)
+        for path in candidates:
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS:
+                found.add(os.path.abspath(path))
+    return sorted(found)
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    JSONL 진행 기록. 파일 내용(sha256) 기준이므로 파일을 옮기거나 이름을 바꿔도 중복 처리하지 않는다.
+    같은 sha256의 마지막 레코드가 현재 상태.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = {}
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # 강제 종료로 잘린 마지막 줄
+                    self.records[record["sha256"]] = record
+
+    def is_done(self, sha256: str) -> bool:
+        return self.records.get(sha256, {}).get("status") == "done"
+
+    def append(self, record: dict):
+        self.records[record["sha256"]] = record
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class Pacer:
+    """파일 시작 간격 제한 (분당 rate건). rate=0이면 제한 없음"""
+
+    def __init__(self, rate_per_minute: float):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+
+class BatchRunner:
+    def __init__(self, pipeline: MeetingPipeline, manifest: Manifest, concurrency: int,
+                 rate_per_minute: float, channel_id: Optional[str], send_email: bool, deadline_seconds: int):
+        self.pipeline = pipeline
+        self.manifest = manifest
+        self.concurrency = concurrency
+        self.pacer = Pacer(rate_per_minute)
+        self.channel_id = channel_id
+        self.send_email = send_email
+        self.deadline_seconds = deadline_seconds
+        self.admission = get_admission_controller()
+        self.stats = {"done": 0, "failed": 0, "bytes": 0, "busy_seconds": 0.0}
+        self._started = 0.0
+        self._total = 0
+
+    async def _process(self, item: BatchFile):
+        await self.pacer.wait()
+        filename = os.path.basename(item.path)
+        started = time.monotonic()
+        record = {"sha256": item.sha256, "file": item.path, "size": item.size}
+        try:
+            # 큰 파일이 몰려도 메모리 예산 안에서만 동시에 읽음 (한도 초과 파일은 AdmissionRejected로 failed 기록)
+            async with self.admission.reserve(item.sha256, item.size):
+                deadline = Deadline(self.deadline_seconds)
+                with open(item.path, encoding="utf-8") as f:
+                    content = f.read()
+                job_id = f"batch-{item.sha256[:16]}"
+                analysis = await self.pipeline.analyze(content, filename, deadline=deadline, job_id=job_id, channel_id=self.channel_id)
+                saved_page = await self.pipeline.save(analysis, self.channel_id, deadline=deadline, job_id=job_id)
+                record.update(status="done", title=analysis.meeting_title, page_id=saved_page.page_id, url=saved_page.url)
+                if self.send_email:
+                    email_ok, _ = await self.pipeline.notify(analysis, saved_page.url, deadline=deadline, channel_id=self.channel_id)
+                    record["email"] = email_ok
+            self.stats["done"] += 1
+            self.stats["bytes"] += item.size
+        except Exception as e:  # AnalysisError / NotionError / DeadlineExceeded / AdmissionRejected 포함
+            record.update(status="failed", error=str(e)[:500])
+            self.stats["failed"] += 1
+            logger.error(f"Failed: {filename}: {e}")
+
+        record["elapsed"] = round(time.monotonic() - started, 2)
+        self.stats["busy_seconds"] += record["elapsed"]
+        record["at"] = datetime.now().isoformat()
+        self.manifest.append(record)
+        self._log_progress(filename, record["status"])
+
+    def _log_progress(self, filename: str, status: str):
+        finished = self.stats["done"] + self.stats["failed"]
+        elapsed = time.monotonic() - self._started
+        per_minute = finished / elapsed * 60 if elapsed else 0.0
+        remaining = self._total - finished
+        eta = remaining / per_minute if per_minute else 0.0
+        logger.info(
+            f"[{finished}/{self._total}] {status}: {filename} ({per_minute:.1f} files/min, ETA {eta:.0f}min)",
+            extra={"sample_key": "batch.progress"} if status == "done" else None,
+        )
+
+    async def run(self, items: List[BatchFile]) -> dict:
+        self._started = time.monotonic()
+        self._total = len(items)
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await self._process(item)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(items)) or 1)))
+        finally:
+            await self.pipeline.close()
+
+        elapsed = time.monotonic() - self._started
+        finished = self.stats["done"] + self.stats["failed"]
+        return {
+            "files": finished,
+            "done": self.stats["done"],
+            "failed": self.stats["failed"],
+            "elapsed_seconds": round(elapsed, 1),
+            "files_per_minute": round(finished / elapsed * 60, 2) if elapsed else 0.0,
+            "kb_per_second": round(self.stats["bytes"] / 1024 / elapsed, 2) if elapsed else 0.0,
+            "avg_seconds_per_file": round(self.stats["busy_seconds"] / finished, 1) if finished else 0.0,
+            "llm_limiter": self.pipeline.agent_service.limiter.snapshot(),
+            "admission": self.admission.snapshot(),
+        }
+
+
+def parse_args(argv=None):
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Process a backlog of meeting transcripts into Notion")
+    parser.add_argument("targets", nargs="+", help="directory or glob pattern (e.g. 'archive/**/*.txt')")
+    parser.add_argument("--concurrency", type=int, default=settings.pipeline_workers, help="files processed at once")
+    parser.add_argument("--rate", type=float, default=0, help="max file starts per minute (0 = unlimited)")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="resumable progress manifest (JSONL)")
+    parser.add_argument("--channel-id", default=None, help="use this channel's CHANNEL_NOTION_MAP entry")
+    parser.add_argument("--email", action="store_true", help="also send the Make.com email for each meeting")
+    parser.add_argument("--skip-failed", action="store_true", help="do not retry files recorded as failed")
+    parser.add_argument("--dry-run", action="store_true", help="list what would be processed; no API calls")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> int:
+    setup_logging(use_queue=False)
+    args = parse_args(argv)
+
+    paths = discover_files(args.targets)
+    manifest = Manifest(args.manifest)
+    items, skipped = [], 0
+    for path in paths:
+        sha256 = await asyncio.to_thread(_sha256, path)
+        record = manifest.records.get(sha256)
+        if manifest.is_done(sha256) or (record and record.get("status") == "failed" and args.skip_failed):
+            skipped += 1
+            continue
+        items.append(BatchFile(path=path, size=os.path.getsize(path), sha256=sha256))
+
+    logger.info(f"Found {len(paths)} files: {len(items)} to process, {skipped} already in manifest")
+    if args.dry_run:
+        for item in items:
+            print(f"{item.size:>10}  {item.path}")
+        print(f"{len(items)} files, {sum(item.size for item in items) / 1024:.1f} KB to process ({skipped} skipped)")
+        return 0
+    if not items:
+        return 0
+
+    settings = get_settings()
+    runner = BatchRunner(
+        MeetingPipeline(), manifest, args.concurrency, args.rate,
+        args.channel_id, args.email, settings.job_deadline_seconds,
+    )
+    report = await runner.run(items)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = asyncio.run(main())
+    except KeyboardInterrupt:
+        # 완료된 파일은 manifest에 기록되어 있으므로 다시 실행하면 이어서 처리
+        exit_code = 130
+    finally:
+        stop_logging()
+    sys.exit(exit_code)
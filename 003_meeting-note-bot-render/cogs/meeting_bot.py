@@ -1,39 +1,85 @@
 import discord
 from discord.ext import commands
+import io
 import logging
 import os
+import re
+import time
 from datetime import datetime
+from config import get_settings
 from server import bot_stats
-from utils.exceptions import AnalysisError, NotionError
-from services.agent_service import AgentService
-from services.email_service import EmailService
-from services.notion_service import NotionService
+from utils.scheduler import get_scheduler
+from utils.checkpoint import get_checkpoint_store
+from utils.job_queue import get_job_queue
+from utils.job_registry import get_job_registry
+from utils.admission import AdmissionRejected, get_admission_controller
+from services.meeting_job import MeetingJob, STAGE_LABELS
+from services.pipeline import MeetingPipeline, SUPPORTED_EXTENSIONS
 
 logger = logging.getLogger("MeetingBotCog")
 
-# 지원 파일 확장자
-SUPPORTED_EXTENSIONS = ['.txt', '.md']
+# Notion URL / page ID (대시 포함 여부 무관)의 마지막 32자리 hex
+NOTION_PAGE_ID = re.compile(r"([0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12})(?:[?#]|$)", re.IGNORECASE)
 
 class MeetingBotCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.agent_service = AgentService()
-        self.email_service = EmailService()
-        self.notion_service = NotionService()
-
-        # Ensure temp directory exists
-        if not os.path.exists("temp"):
-            os.makedirs("temp")
+        self.pipeline = MeetingPipeline()
+        self.agent_service = self.pipeline.agent_service
+        self.notion_service = self.pipeline.notion_service
+        self.search_index = self.pipeline.search_index
+        self.action_index = self.pipeline.action_index
+        self.artifact_store = self.pipeline.artifact_store
+        self.scheduler = get_scheduler()
+        settings = get_settings()
+        self.job = MeetingJob(self.pipeline, settings.job_deadline_seconds)
+        # gateway 모드: 처리는 worker 프로세스가 담당하고 이 프로세스는 큐에 넣기만 함
+        self.gateway_mode = settings.process_mode == "gateway"
+        self.job_queue = get_job_queue() if self.gateway_mode else None
+        self.checkpoints = get_checkpoint_store()
+        self.admission = get_admission_controller()
+        self.registry = get_job_registry()
+        self.accepting = True
+        self._resumed = False
+        self._status_messages = {}  # job_id -> 진행 상태 메시지 (drain 시 안내용)
 
     @commands.Cog.listener()
     async def on_ready(self):
         bot_stats["bot_ready"] = True
         logger.info("Meeting Note Bot Cog loaded and ready.")
 
-    def _extract_text_from_file(self, file_path: str) -> str:
-        """txt/md 파일에서 텍스트 추출"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        # 직전 프로세스가 종료 전에 끝내지 못한 작업 재개 (재연결로 on_ready가 다시 와도 1회만)
+        if not self._resumed and not self.gateway_mode:
+            self._resumed = True
+            await self._resume_checkpoints()
+
+    async def cog_load(self):
+        if not self.gateway_mode:
+            self.scheduler.start()
+            self.pipeline.start()
+
+    async def cog_unload(self):
+        await self.scheduler.stop()
+        await self.pipeline.close()
+
+    async def drain(self, grace_seconds: float):
+        """
+        SIGTERM 시 main.py에서 호출: 새 업로드를 받지 않고, 실행 중인 작업은 grace_seconds까지 기다린다.
+        끝나지 못한 작업과 대기열의 작업은 마지막 완료 단계까지 checkpoint에 남아 다음 부팅 때 이어서 처리.
+        """
+        self.accepting = False
+        if self.gateway_mode:
+            # 대기/실행 중인 작업은 큐(SQLite)와 worker 프로세스에 있으므로 기다릴 것이 없음
+            return {"finished": 0, "cancelled": 0}
+        result = await self.scheduler.drain(grace_seconds)
+        logger.info(f"Drain complete: finished={result['finished']}, cancelled={result['cancelled']}, checkpointed={len(self._status_messages)}")
+
+        for status_msg in list(self._status_messages.values()):
+            try:
+                await status_msg.edit(content="⏸️ 봇 재시작 중 — 재시작 후 이어서 처리합니다.", embed=None)
+            except Exception as e:
+                logger.warning(f"Failed to update status message on drain: {e}")
+        return result
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -44,89 +90,262 @@ class MeetingBotCog(commands.Cog):
             for attachment in message.attachments:
                 ext = os.path.splitext(attachment.filename)[1].lower()
                 if ext in SUPPORTED_EXTENSIONS:
-                    logger.info(f"Detected supported file: {attachment.filename} from {message.author}")
-                    await message.add_reaction("👀")
-                    status_msg = await message.reply(f"📥 Downloading **{attachment.filename}**...")
+                    if not self.accepting:
+                        await message.reply("🔄 봇이 재시작 중입니다. 잠시 후 다시 업로드해 주세요.")
+                        return
 
+                    # 다운로드 전에 크기로 거절 (한도 초과 파일은 대기열에도 넣지 않음)
                     try:
-                        # Download file
-                        file_path = os.path.join("temp", attachment.filename)
-                        await attachment.save(file_path)
-                        logger.info(f"File saved to {file_path}")
-
-                        # Read content
-                        content = self._extract_text_from_file(file_path)
-
-                        # Extract user prompt (디스코드 채팅창에 입력한 텍스트)
-                        user_prompt = message.content.strip() if message.content else None
-                        filename_without_ext = os.path.splitext(attachment.filename)[0]
-                        filename_hint = f"[파일명 힌트: {filename_without_ext}]"
-
-                        if user_prompt:
-                            logger.info(f"User text detected: '{user_prompt}' (will be used for title)")
-                            await status_msg.edit(content=f"🧠 Analyzing **{attachment.filename}** with custom instructions: \"{user_prompt}\"...")
-                            combined_prompt = f"{filename_hint}\n[사용자 입력 텍스트: {user_prompt}]\n사용자가 위 텍스트를 입력했습니다. 제목의 고객명과 회의주제에 반드시 반영하세요."
-                        else:
-                            await status_msg.edit(content=f"🧠 Analyzing **{attachment.filename}** with AI... (This may take a minute)")
-                            combined_prompt = filename_hint
-
-                        # 1. AI Analysis
-                        try:
-                            analysis_result = await self.agent_service.analyze_meeting(content, combined_prompt)
-                        except Exception as e:
-                            raise AnalysisError(f"AI analysis failed: {e}") from e
-
-                        # 2. Save to Notion
-                        await status_msg.edit(content=f"📝 Saving to Notion...")
-                        try:
-                            notion_url = await self.notion_service.create_page(analysis_result, str(message.channel.id))
-                        except Exception as e:
-                            raise NotionError(f"Notion save failed: {e}") from e
-
-                        # 3. Send Email (non-fatal)
-                        await status_msg.edit(content=f"📤 Sending email via Make.com...")
-                        try:
-                            make_success, make_msg = await self.email_service.send_email(analysis_result, notion_url)
-                        except Exception as e:
-                            logger.warning(f"Email failed (non-fatal): {e}")
-                            make_success, make_msg = False, str(e)
-
-                        # Final Confirmation
-                        embed = discord.Embed(
-                            title="✅ Meeting Minutes Created!",
-                            description=f"**{analysis_result.meeting_title}** has been processed.",
-                            color=discord.Color.green()
-                        )
-                        embed.add_field(name="Summary", value=analysis_result.executive_summary[:1024] if isinstance(analysis_result.executive_summary, str) else "\n".join(analysis_result.executive_summary)[:1024], inline=False)
-                        embed.add_field(name="Notion", value=f"[View Page]({notion_url})", inline=True)
-
-                        if make_success:
-                            embed.add_field(name="Email", value="✅ Sent via Make.com", inline=True)
-                        else:
-                            embed.add_field(name="Email", value=f"❌ Failed: {make_msg[:50]}", inline=True)
-
-                        await status_msg.edit(content="", embed=embed)
-                        await message.add_reaction("✅")
-
-                        # Update stats
-                        bot_stats["meetings_processed"] += 1
-                        bot_stats["last_processed_at"] = datetime.now().isoformat()
-
-                        # Cleanup
-                        os.remove(file_path)
-
-                    except AnalysisError as e:
-                        logger.error(f"Analysis failed for {attachment.filename}: {e}", exc_info=True)
-                        await status_msg.edit(content=f"❌ AI 분석 실패: {str(e)[:100]}")
-                        await message.add_reaction("❌")
-                    except NotionError as e:
-                        logger.error(f"Notion save failed for {attachment.filename}: {e}", exc_info=True)
-                        await status_msg.edit(content=f"❌ Notion 저장 실패: {str(e)[:100]}")
-                        await message.add_reaction("❌")
-                    except Exception as e:
-                        logger.error(f"Unexpected error for {attachment.filename}: {e}", exc_info=True)
-                        await status_msg.edit(content=f"❌ Error: {str(e)[:100]}")
+                        self.admission.check(attachment.size)
+                    except AdmissionRejected as e:
+                        await message.reply(f"❌ **{attachment.filename}**: {e}")
                         await message.add_reaction("❌")
+                        continue
+
+                    logger.info(f"Detected supported file: {attachment.filename} from {message.author}")
+                    await message.add_reaction("👀")
+                    status_msg = await message.reply(f"⏳ Queued **{attachment.filename}**...")
+
+                    state = {
+                        "job_id": f"{message.id}-{attachment.id}",
+                        "stage": "queued",
+                        "channel_id": message.channel.id,
+                        "message_id": message.id,
+                        "attachment_id": attachment.id,
+                        "status_message_id": status_msg.id,
+                        "filename": attachment.filename,
+                        "size": attachment.size,
+                    }
+                    if self.gateway_mode:
+                        position = await self.job_queue.enqueue(state)
+                        if position > 0:
+                            await status_msg.edit(content=f"⏳ Queued **{attachment.filename}** (이 채널 대기 {position}건)")
+                        continue
+
+                    await self.checkpoints.save(state["job_id"], state)
+                    await self._submit(message, attachment, status_msg, state)
+
+    async def _submit(self, message, attachment, status_msg, state: dict):
+        self._status_messages[state["job_id"]] = status_msg
+        # 대기 중인 작업도 /jobs에 보이고 취소할 수 있도록 등록
+        self.registry.register(state["job_id"], state["channel_id"], state["filename"], state["size"])
+        # 채널별 공정 스케줄러에 등록 (비용 = 파일 크기)
+        position = await self.scheduler.submit(
+            str(message.channel.id),
+            state["size"],
+            lambda message=message, attachment=attachment, status_msg=status_msg, state=state:
+                self._process_attachment(message, attachment, status_msg, state),
+            label=state["filename"],
+        )
+        if position > 0:
+            await status_msg.edit(content=f"⏳ Queued **{state['filename']}** (이 채널 대기 {position}건)")
+
+    async def _resume_checkpoints(self):
+        states = self.checkpoints.load_all()
+        if not states:
+            return
+        logger.info(f"Resuming {len(states)} checkpointed jobs")
+
+        for state in states:
+            try:
+                channel = self.bot.get_channel(state["channel_id"]) or await self.bot.fetch_channel(state["channel_id"])
+                message = await channel.fetch_message(state["message_id"])
+            except discord.HTTPException as e:
+                # 원본 메시지가 삭제됐거나 채널 접근 불가: 결과를 보고할 곳이 없으므로 폐기
+                logger.warning(f"Dropping checkpoint {state['job_id']}: original message unavailable ({e})")
+                self.checkpoints.remove(state["job_id"])
+                continue
+
+            attachment = next((a for a in message.attachments if a.id == state["attachment_id"]), None)
+            if attachment is None and "content" not in state:
+                logger.warning(f"Dropping checkpoint {state['job_id']}: attachment no longer available")
+                self.checkpoints.remove(state["job_id"])
+                continue
+
+            done = f" ({STAGE_LABELS[state['stage']]} 완료)" if state["stage"] != "queued" else ""
+            try:
+                status_msg = await channel.fetch_message(state["status_message_id"])
+                await status_msg.edit(content=f"▶️ 재시작 후 이어서 처리: **{state['filename']}**{done}")
+            except discord.HTTPException:
+                status_msg = await message.reply(f"▶️ 재시작 후 이어서 처리: **{state['filename']}**")
+                state["status_message_id"] = status_msg.id
+
+            await self._submit(message, attachment, status_msg, state)
+
+    async def _process_attachment(self, message, attachment, status_msg, state: dict):
+        succeeded = await self.job.run(message, attachment, status_msg, state, self.checkpoints)
+        self._status_messages.pop(state["job_id"], None)
+
+        if succeeded:
+            # Update stats
+            bot_stats["meetings_processed"] += 1
+            bot_stats["last_processed_at"] = datetime.now().isoformat()
+            bot_stats["prompt_cache"] = self.agent_service.cache_stats.snapshot()
+
+    # --- Commands ---
+
+    @commands.command(name="search")
+    async def search(self, ctx, *, query: str):
+        """!search <검색어>: 이 채널의 Notion DB에 저장된 회의록 검색"""
+        _, database_id = self.notion_service.get_notion_config_for_channel(str(ctx.channel.id))
+        results = await self.search_index.search(query, database_id=database_id)
+
+        if not results:
+            await ctx.reply(f"🔍 **{query}** 검색 결과가 없습니다.")
+            return
+
+        embed = discord.Embed(title=f"🔍 {query}", color=discord.Color.blue())
+        for result in results:
+            snippet = result["snippet"] or ""
+            embed.add_field(
+                name=f"{result['title']} ({result['meeting_date']})"[:256],
+                value=f"{snippet[:200]}\n[View Page]({result['notion_url']})"[:1024],
+                inline=False,
+            )
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="reindex")
+    @commands.has_permissions(administrator=True)
+    async def reindex(self, ctx):
+        """!reindex: 이 채널의 Notion DB 전체를 읽어 검색 인덱스 재구성 (관리자 전용)"""
+        client, database_id = self.notion_service.get_notion_config_for_channel(str(ctx.channel.id))
+        if not database_id:
+            await ctx.reply("❌ 이 채널에 연결된 Notion DB가 없습니다.")
+            return
+
+        status_msg = await ctx.reply("🔄 Notion DB에서 회의록을 읽는 중...")
+
+        async def on_progress(indexed):
+            await status_msg.edit(content=f"🔄 {indexed}건 인덱싱 중...")
+
+        try:
+            indexed = await self.search_index.backfill(self.notion_service, client, database_id, on_progress=on_progress)
+        except Exception as e:
+            logger.error(f"Reindex failed for database {database_id}: {e}", exc_info=True)
+            await status_msg.edit(content=f"❌ 재인덱싱 실패: {str(e)[:100]}")
+            return
+        await status_msg.edit(content=f"✅ {indexed}건 인덱싱 완료 (전체 {self.search_index.count(database_id)}건)")
+
+    @staticmethod
+    def _format_action(item: dict, with_assignee: bool = True) -> str:
+        due = item["due_date"] or item["due_text"]
+        owner = f"@{item['assignee']} · " if with_assignee else ""
+        return f"☐ {item['action']} ({owner}~{due}) — [{item['meeting_title']}]({item['notion_url']})"
+
+    @commands.command(name="actions")
+    async def actions(self, ctx, *, name: str = None):
+        """!actions [@이름]: 담당자의 미완료 Action Item (이름 없으면 담당자별 건수)"""
+        _, database_id = self.notion_service.get_notion_config_for_channel(str(ctx.channel.id))
+
+        if ctx.message.mentions:
+            name = ctx.message.mentions[0].display_name
+
+        if not name:
+            counts = await self.action_index.assignee_counts(database_id)
+            if not counts:
+                await ctx.reply("📋 미완료 Action Item이 없습니다.")
+                return
+            lines = [f"**{row['assignee']}**: {row['open']}건" + (f" (⚠️ 기한 초과 {row['overdue']})" if row["overdue"] else "") for row in counts[:25]]
+            await ctx.reply("📋 담당자별 미완료 Action Item\n" + "\n".join(lines))
+            return
+
+        items = await self.action_index.open_items(name, database_id=database_id)
+        if not items:
+            await ctx.reply(f"📋 **{name}** 님의 미완료 Action Item이 없습니다.")
+            return
+        embed = discord.Embed(title=f"📋 {name} — 미완료 {len(items)}건", color=discord.Color.blue())
+        embed.description = "\n".join(self._format_action(item, with_assignee=False) for item in items)[:4096]
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="overdue")
+    async def overdue(self, ctx):
+        """!overdue: 기한이 지난 미완료 Action Item"""
+        _, database_id = self.notion_service.get_notion_config_for_channel(str(ctx.channel.id))
+        items = await self.action_index.overdue(database_id)
+        if not items:
+            await ctx.reply("✅ 기한이 지난 Action Item이 없습니다.")
+            return
+        embed = discord.Embed(title=f"⚠️ 기한 초과 {len(items)}건", color=discord.Color.orange())
+        embed.description = "\n".join(self._format_action(item) for item in items)[:4096]
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="syncactions")
+    @commands.has_permissions(administrator=True)
+    async def syncactions(self, ctx):
+        """!syncactions: Notion 체크박스 상태를 읽어 완료된 Action Item 반영"""
+        client, database_id = self.notion_service.get_notion_config_for_channel(str(ctx.channel.id))
+        status_msg = await ctx.reply("🔄 Notion 체크 상태 동기화 중...")
+
+        async def on_progress(done, total):
+            await status_msg.edit(content=f"🔄 {done}/{total} 페이지 동기화 중...")
+
+        result = await self.action_index.sync_from_notion(self.notion_service, client, database_id, on_progress=on_progress)
+        failed = f", 실패 {result['failed']}" if result["failed"] else ""
+        await status_msg.edit(content=f"✅ {result['synced']}/{result['pages']} 페이지 동기화 완료{failed}")
+
+    async def _find_archived(self, ctx, target: str = None):
+        """
+        보관된 작업 조회: Notion URL / page ID, 업로드 메시지 ID,
+        또는 원본 업로드(혹은 봇의 처리 결과 메시지)에 답장으로 명령 실행.
+        명령을 실행한 채널에서 올린 작업만 찾는다 (다른 팀 채널의 회의록은 ID를 알아도 조회 불가).
+        """
+        channel_id = str(ctx.channel.id)
+        if target:
+            match = NOTION_PAGE_ID.search(target.strip())
+            if match:
+                return await self.artifact_store.find(page_id=match.group(1), channel_id=channel_id)
+            if target.strip().isdigit():
+                return await self.artifact_store.find(message_id=target.strip(), channel_id=channel_id)
+            return None
+
+        reference = ctx.message.reference
+        if reference is None or reference.message_id is None:
+            return None
+        job = await self.artifact_store.find(message_id=str(reference.message_id), channel_id=channel_id)
+        if job is None:
+            # 봇의 상태/결과 메시지에 답장한 경우: 그 메시지가 가리키는 원본 업로드로 조회
+            try:
+                replied = reference.resolved if isinstance(reference.resolved, discord.Message) else await ctx.channel.fetch_message(reference.message_id)
+            except discord.HTTPException:
+                return None
+            if replied.reference and replied.reference.message_id:
+                job = await self.artifact_store.find(message_id=str(replied.reference.message_id), channel_id=channel_id)
+        return job
+
+    @commands.command(name="resend")
+    @commands.has_permissions(administrator=True)
+    async def resend(self, ctx, *, target: str = None):
+        """!resend [Notion URL | 메시지 ID]: 보관된 분석 결과로 이메일 재전송 (LLM 호출 없음, 관리자 전용)"""
+        job = await self._find_archived(ctx, target)
+        analysis = await self.artifact_store.load_analysis(job["job_id"]) if job else None
+        if analysis is None:
+            await ctx.reply("❌ 보관된 회의록을 찾지 못했습니다. Notion URL 또는 업로드 메시지 ID를 지정하거나 원본 메시지에 답장으로 실행하세요.")
+            return
+
+        success, message = await self.pipeline.notify(analysis, job["notion_url"], channel_id=job["channel_id"] or str(ctx.channel.id))
+        if success:
+            await ctx.reply(f"📤 **{analysis.meeting_title}** 이메일 재전송: {message}")
+        else:
+            await ctx.reply(f"❌ 이메일 재전송 실패: {message[:100]}")
+
+    @commands.command(name="render")
+    async def render(self, ctx, *, target: str = None):
+        """
+        !render [Notion URL | 메시지 ID]: 보관된 분석 결과를 Markdown 파일로 다시 생성.
+        이 채널에 올라온 회의록만 대상이라 (원문을 이미 볼 수 있는 채널 멤버) 별도 권한은 요구하지 않음.
+        """
+        started = time.perf_counter()
+        job = await self._find_archived(ctx, target)
+        analysis = await self.artifact_store.load_analysis(job["job_id"]) if job else None
+        if analysis is None:
+            await ctx.reply("❌ 보관된 회의록을 찾지 못했습니다. Notion URL 또는 업로드 메시지 ID를 지정하거나 원본 메시지에 답장으로 실행하세요.")
+            return
+
+        markdown = analysis.to_markdown()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        filename = re.sub(r'[\\/:*?"<>|]', "_", analysis.meeting_title)
+        file = discord.File(io.BytesIO(markdown.encode("utf-8")), filename=f"{filename}.md")
+        await ctx.reply(f"📄 **{analysis.meeting_title}** ({elapsed_ms:.0f}ms)", file=file)
 
 async def setup(bot):
     await bot.add_cog(MeetingBotCog(bot))
@@ -1,5 +1,7 @@
 import json
 import logging
+import math
+import os
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import model_validator
@@ -27,17 +29,62 @@ class Settings(BaseSettings):
     llm_provider: str = "google"
     google_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
+    analysis_mode: str = "single"  # single | parallel (섹션별 동시 생성)
+
+    # LLM 동시성 제한 (AIMD) / circuit breaker
+    llm_initial_concurrency: int = 2
+    llm_max_concurrency: int = 8
+    llm_max_retries: int = 2
+    llm_breaker_threshold: int = 5
+    llm_breaker_cooldown: int = 60  # seconds
 
     # Make.com (optional)
     make_webhook_url: Optional[str] = None
+    email_digest_mode: bool = False  # True면 회의별 웹훅 대신 묶어서 전송
+    email_digest_window: int = 900  # seconds, 첫 건이 쌓인 뒤 전송까지 최대 대기
+    email_digest_max_items: int = 10  # 이 건수가 쌓이면 window 전이라도 전송
+    email_digest_path: str = "data/digest.db"  # 전송 전 digest 항목 (프로세스 간 공유, 전송 성공 후 삭제)
+    email_recipient_groups: Optional[str] = None  # JSON: {"channel_id": "group"}
+    email_summary_refine: bool = False  # True면 분석 결과만으로 짧은 LLM 호출 1회 더 해서 이메일 요약을 다듬음
 
     # Channel mapping (optional)
     channel_notion_map: Optional[str] = None
 
+    # Process mode (optional)
+    process_mode: str = "single"  # single | gateway (Discord 수신 + 큐 적재만, 처리는 worker.py)
+    worker_processes: int = 1  # gateway 모드에서 main.py가 띄우고 감시할 worker 수 (0 = CPU 코어 수, -1 = 띄우지 않음)
+    job_queue_path: str = "data/jobs.db"  # gateway ↔ worker 작업 큐 (SQLite)
+
+    # Pipeline scheduling (optional)
+    pipeline_workers: int = 2
+    channel_weights: Optional[str] = None  # JSON: {"channel_id": weight}
+    scheduler_shortest_first: bool = False
+    job_deadline_seconds: int = 600  # 작업 1건 전체 시간 예산 (단계별로 분배)
+    shutdown_grace_seconds: int = 25  # SIGTERM 후 실행 중인 작업을 기다리는 시간 (Render 기본 종료 유예 30초)
+
+    # Admission control (optional)
+    memory_budget_mb: int = 200  # 컨테이너 전체에서 처리 중인 회의록들의 추정 메모리 합계 (Render free 512MB 기준, gateway 모드는 worker 수로 나눔)
+    max_attachment_mb: float = 5.0  # 이보다 큰 첨부파일은 다운로드 전에 거절
+    max_transcript_tokens: int = 300000  # 추정 토큰이 이보다 많으면 거절 (모델 컨텍스트 한도 대비)
+
+    # Local storage
+    search_index_path: str = "data/meetings.db"  # 회의록 전문 검색 인덱스 (SQLite FTS5)
+    checkpoint_dir: str = "data/checkpoints"  # 종료 시 끝나지 못한 작업 상태 (다음 부팅 때 재개)
+    artifact_dir: str = "data/artifacts"  # 원문 / LLM 응답 / 분석 결과 보관 (zstd, !resend · !render용)
+    artifact_retention_days: int = 180  # 0 = 기간 제한 없음
+    artifact_max_mb: int = 500  # 넘으면 오래된 작업부터 삭제 (0 = 제한 없음)
+
     # Server / Render
     port: int = 10000
     render_external_url: Optional[str] = None
     self_ping_interval: int = 780  # 13 minutes in seconds
+    loop_stall_threshold_ms: int = 250  # 이벤트 루프 stall 스택 캡처 기준
+    debug_token: Optional[str] = None  # /debug/* 엔드포인트 인증 토큰 (미설정 시 비활성)
+
+    # Record / replay (optional)
+    cassette_mode: str = "off"  # off | record | replay (LLM, Notion, 웹훅 호출을 기록/재생)
+    cassette_path: str = "data/cassettes/recording-{pid}.jsonl.gz"  # {pid}: 프로세스별 파일
+    cassette_time_scale: float = 1.0  # replay 시 기록된 지연 시간 배율 (0 = 대기 없음)
 
     @model_validator(mode="after")
     def validate_llm_keys(self):
@@ -47,6 +94,37 @@ class Settings(BaseSettings):
             raise ValueError("OPENAI_API_KEY is required when LLM_PROVIDER=openai")
         return self
 
+    @model_validator(mode="after")
+    def validate_memory_budget(self):
+        # worker 예산(MEMORY_BUDGET_MB / worker 수)이 최대 크기 첨부파일 1건도 못 담으면
+        # 한도 안의 파일이 gateway에서 거절되므로 설정 단계에서 알림
+        from utils.admission import MEMORY_COPY_FACTOR
+        needed = self.max_attachment_mb * 1024 * 1024 * MEMORY_COPY_FACTOR
+        if self.get_memory_budget_bytes() < needed:
+            raise ValueError(
+                f"MEMORY_BUDGET_MB={self.memory_budget_mb} gives each of {max(1, self.get_worker_processes())} workers "
+                f"{self.get_memory_budget_bytes() / 1024 / 1024:.0f}MB, but one MAX_ATTACHMENT_MB={self.max_attachment_mb} "
+                f"file needs ~{needed / 1024 / 1024:.0f}MB: raise MEMORY_BUDGET_MB, lower WORKER_PROCESSES or MAX_ATTACHMENT_MB"
+            )
+        return self
+
+    def get_worker_processes(self) -> int:
+        """gateway 모드에서 main.py가 띄우는 worker 수 (WORKER_PROCESSES=0이면 CPU 코어 수, -1이면 0)"""
+        if self.worker_processes < 0:
+            return 0
+        return self.worker_processes or os.cpu_count() or 1
+
+    def get_memory_budget_bytes(self) -> int:
+        """
+        이 프로세스의 admission 예산. gateway 모드에서는 worker마다 자기 controller를 가지므로
+        MEMORY_BUDGET_MB를 worker 수로 나눠 합계가 컨테이너 예산을 넘지 않게 한다.
+        (WORKER_PROCESSES=-1로 worker를 직접 실행하면 MEMORY_BUDGET_MB가 worker 1개의 예산)
+        """
+        budget = self.memory_budget_mb * 1024 * 1024
+        if self.process_mode == "gateway":
+            budget //= max(1, self.get_worker_processes())
+        return budget
+
     def get_channel_notion_map(self) -> dict:
         if not self.channel_notion_map:
             return {}
@@ -56,6 +134,39 @@ class Settings(BaseSettings):
             logger.warning("Invalid CHANNEL_NOTION_MAP JSON, using empty mapping")
             return {}
 
+    def get_email_recipient_groups(self) -> dict:
+        if not self.email_recipient_groups:
+            return {}
+        try:
+            return json.loads(self.email_recipient_groups)
+        except json.JSONDecodeError:
+            logger.warning("Invalid EMAIL_RECIPIENT_GROUPS JSON, grouping digests by channel")
+            return {}
+
+    def get_channel_weights(self) -> dict:
+        if not self.channel_weights:
+            return {}
+        try:
+            raw = json.loads(self.channel_weights)
+        except json.JSONDecodeError:
+            logger.warning("Invalid CHANNEL_WEIGHTS JSON, using equal weights")
+            return {}
+        if not isinstance(raw, dict):
+            logger.warning("CHANNEL_WEIGHTS must be a JSON object, using equal weights")
+            return {}
+        weights = {}
+        for channel_id, value in raw.items():
+            try:
+                weight = float(value)
+            except (TypeError, ValueError):
+                weight = None
+            # 숫자가 아니거나 0 이하 / inf / nan이면 그 채널만 기본 weight(1.0)
+            if weight is None or not math.isfinite(weight) or weight <= 0:
+                logger.warning(f"Invalid CHANNEL_WEIGHTS value for channel {channel_id}: {value!r}, using default weight")
+                continue
+            weights[str(channel_id)] = weight
+        return weights
+
 
 # Singleton
 _settings: Optional[Settings] = None
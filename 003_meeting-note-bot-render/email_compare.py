@@ -0,0 +1,165 @@
+"""
+이메일 요약 품질 / 비용 비교: 원문으로 한 번 더 생성하는 2-pass(analyze_for_email) vs
+이미 만든 MeetingAnalysis에서 구성하는 요약(EmailSummary.from_analysis, --refine이면 분석 결과만으로 다듬기).
+
+    python email_compare.py ./transcripts
+    python email_compare.py "samples/*.txt" --refine --output data/email_compare.json
+    CASSETTE_MODE=record python email_compare.py ./transcripts   # 같은 응답으로 반복 비교하려면 기록 후 replay
+
+2-pass 결과를 기준으로 핵심 포인트 / 결정사항 커버리지, Next Action 담당자 재현율, 요약 유사도(문자 bigram Dice)와
+이메일 요약에 추가로 든 LLM 호출 수 / 입력·출력 토큰 / 소요 시간을 파일별·평균으로 출력한다.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import time
+from typing import List
+
+from utils.logger import setup_logging, stop_logging
+from services.agent_service import AgentService, EmailSummary, trace_llm_calls
+from services.pipeline import build_analysis_prompt
+from batch import discover_files
+
+logger = logging.getLogger("EmailCompare")
+
+METRICS = ("summary_similarity", "key_point_coverage", "decision_coverage", "assignee_recall")
+
+
+def _bigrams(text: str) -> set:
+    compact = re.sub(r"\s+", "", text.lower())
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+def similarity(a: str, b: str) -> float:
+    """문자 bigram Dice 계수 (형태소 분석 없이 한국어 문장 비교)"""
+    left, right = _bigrams(a), _bigrams(b)
+    if not left or not right:
+        return 1.0 if left == right else 0.0
+    return 2 * len(left & right) / (len(left) + len(right))
+
+
+def coverage(reference: List[str], candidate: List[str]) -> float:
+    """기준 항목마다 후보 중 가장 비슷한 항목의 유사도 평균 (기준이 비어 있으면 1.0)"""
+    if not reference:
+        return 1.0
+    return sum(max((similarity(ref, cand) for cand in candidate), default=0.0) for ref in reference) / len(reference)
+
+
+def compare_summaries(candidate: EmailSummary, reference: EmailSummary) -> dict:
+    reference_assignees = {item.assignee.strip() for item in reference.next_actions if item.assignee.strip()}
+    candidate_assignees = [item.assignee.strip() for item in candidate.next_actions]
+    found = sum(1 for name in reference_assignees if any(name in other or other in name for other in candidate_assignees if other))
+    return {
+        "summary_similarity": round(similarity(candidate.executive_summary, reference.executive_summary), 3),
+        "key_point_coverage": round(coverage(reference.key_points, candidate.key_points), 3),
+        "decision_coverage": round(coverage(reference.decisions, candidate.decisions), 3),
+        "assignee_recall": round(found / len(reference_assignees), 3) if reference_assignees else 1.0,
+        "actions": [len(candidate.next_actions), len(reference.next_actions)],
+        "body_chars": [len(candidate.to_email_body()), len(reference.to_email_body())],
+    }
+
+
+def _cost(calls: List[dict], seconds: float) -> dict:
+    usage = [call.get("usage") or {} for call in calls]
+    return {
+        "llm_calls": len(calls),
+        "input_tokens": sum(u.get("input_tokens", 0) for u in usage),
+        "output_tokens": sum(u.get("output_tokens", 0) for u in usage),
+        "seconds": round(seconds, 3),
+    }
+
+
+async def _timed(coro_factory):
+    started = time.perf_counter()
+    with trace_llm_calls() as calls:
+        result = await coro_factory()
+    return result, _cost(calls, time.perf_counter() - started)
+
+
+async def compare_file(agent: AgentService, path: str, refine: bool) -> dict:
+    filename = os.path.basename(path)
+    result = {"file": filename}
+    try:
+        with open(path, encoding="utf-8") as f:
+            transcript = f.read()
+
+        analysis, result["analysis"] = await _timed(
+            lambda: agent.analyze_meeting(transcript, build_analysis_prompt(filename)))
+        reference, result["two_pass"] = await _timed(lambda: agent.analyze_for_email(transcript))
+        candidates = {"from_analysis": await _timed(lambda: agent.summarize_for_email(analysis))}
+        if refine:
+            candidates["refined"] = await _timed(lambda: agent.summarize_for_email(analysis, refine=True))
+
+        result["summaries"] = {"two_pass": reference.model_dump()}
+        for name, (summary, cost) in candidates.items():
+            result[name] = {**cost, **compare_summaries(summary, reference)}
+            result["summaries"][name] = summary.model_dump()
+        result["status"] = "done"
+    except Exception as e:
+        result.update(status="failed", error=str(e)[:300])
+        logger.error(f"Comparison failed: {filename}: {e}")
+    return result
+
+
+def aggregate(results: List[dict], variant: str) -> dict:
+    rows = [r[variant] for r in results if r["status"] == "done" and variant in r]
+    if not rows:
+        return {}
+    totals = {key: round(sum(row[key] for row in rows) / len(rows), 3) for key in METRICS if key in rows[0]}
+    totals.update({key: sum(row[key] for row in rows) for key in ("llm_calls", "input_tokens", "output_tokens")})
+    totals["seconds"] = round(sum(row["seconds"] for row in rows), 3)
+    return totals
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two-pass email summaries against summaries built from the analysis")
+    parser.add_argument("targets", nargs="+", help="directory or glob pattern of transcripts")
+    parser.add_argument("--refine", action="store_true", help="also compare the analysis-only LLM refine pass")
+    parser.add_argument("--concurrency", type=int, default=1, help="files compared at once")
+    parser.add_argument("--output", default=None, help="write the full report (including summaries) to this JSON file")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> int:
+    setup_logging(use_queue=False)
+    args = parse_args(argv)
+    paths = discover_files(args.targets)
+    if not paths:
+        logger.error(f"No transcripts found in {args.targets}")
+        return 2
+
+    agent = AgentService()
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def run(path):
+        async with semaphore:
+            return await compare_file(agent, path, args.refine)
+
+    results = await asyncio.gather(*(run(path) for path in paths))
+    variants = ("two_pass", "from_analysis") + (("refined",) if args.refine else ())
+    report = {
+        "files": len(results),
+        "failed": sum(1 for r in results if r["status"] != "done"),
+        "totals": {variant: aggregate(results, variant) for variant in ("analysis",) + variants},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for result in results:
+        result.pop("summaries", None)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = asyncio.run(main())
+    finally:
+        stop_logging()
+    sys.exit(exit_code)
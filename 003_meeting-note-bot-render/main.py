@@ -1,16 +1,86 @@
 import asyncio
+import os
 import signal
+import sys
 import logging
 import discord
 from discord.ext import commands
 
 from config import get_settings
-from utils.logger import setup_logging
+from utils.logger import setup_logging, stop_logging
 from server import start_server
+from utils.loop_monitor import get_loop_watchdog
 
 logger = logging.getLogger("Main")
 
 
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worker.py")
+# 죽은 worker 재시작 대기: 1초부터 두 배씩 최대 60초, 이 시간 이상 살아 있었으면 다시 1초부터
+WORKER_RESTART_MIN_SECONDS = 1
+WORKER_RESTART_MAX_SECONDS = 60
+WORKER_HEALTHY_SECONDS = 60
+
+
+class WorkerSupervisor:
+    """
+    gateway 모드: 같은 컨테이너 안에 worker.py 프로세스를 count개 실행 (로그는 stdout 공유).
+    worker가 비정상 종료하면 (OOM, 예외 등) backoff를 두고 같은 자리에 다시 띄운다.
+    죽은 worker가 처리하던 작업은 heartbeat가 끊긴 뒤 다른 worker가 이어서 처리.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.processes: list = [None] * count
+        self.restarts = 0
+        self._tasks: list = []
+        self._stopping = False
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._watch(slot)) for slot in range(self.count)]
+
+    async def _watch(self, slot: int):
+        loop = asyncio.get_running_loop()
+        delay = WORKER_RESTART_MIN_SECONDS
+        while not self._stopping:
+            started = loop.time()
+            process = await asyncio.create_subprocess_exec(sys.executable, WORKER_PATH)
+            self.processes[slot] = process
+            logger.info(f"Worker {slot} started: pid={process.pid}")
+
+            returncode = await process.wait()
+            if self._stopping or returncode == 0:
+                # 0 = 신호를 받아 drain 후 정상 종료 (Ctrl+C 등으로 프로세스 그룹 전체가 종료되는 중)
+                return
+            if loop.time() - started >= WORKER_HEALTHY_SECONDS:
+                delay = WORKER_RESTART_MIN_SECONDS
+            self.restarts += 1
+            logger.warning(f"Worker {slot} exited: pid={process.pid}, code={returncode}, restarting in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WORKER_RESTART_MAX_SECONDS)
+
+    async def stop(self, timeout: float):
+        """재시작을 멈추고 실행 중인 worker를 drain 후 종료"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await stop_workers([p for p in self.processes if p is not None], timeout)
+
+
+async def stop_workers(processes: list, timeout: float):
+    """SIGTERM 전달 → worker가 자체 drain 후 종료하도록 기다리고, 시간이 지나면 강제 종료"""
+    for process in processes:
+        if process.returncode is None:
+            process.send_signal(signal.SIGTERM)
+    try:
+        await asyncio.wait_for(asyncio.gather(*(p.wait() for p in processes)), timeout=timeout)
+    except asyncio.TimeoutError:
+        for process in processes:
+            if process.returncode is None:
+                process.kill()
+        logger.warning("Killed workers that did not exit within the grace period")
+
+
 async def main():
     # 1. Setup logging
     setup_logging()
@@ -23,7 +93,9 @@ async def main():
         logger.error(f"Configuration error: {e}")
         return
 
-    # 3. Start HTTP server (for Render port binding + health check)
+    # 3. Start event loop watchdog + HTTP server (for Render port binding + health check)
+    watchdog = get_loop_watchdog()
+    watchdog.start()
     runner, ping_task = await start_server(
         port=settings.port,
         render_url=settings.render_external_url,
@@ -36,7 +108,13 @@ async def main():
     bot = commands.Bot(command_prefix="!", intents=intents)
 
     await bot.load_extension("cogs.meeting_bot")
-    logger.info("Starting Meeting Note Bot...")
+    logger.info(f"Starting Meeting Note Bot... (process_mode={settings.process_mode})")
+
+    # gateway 모드: 처리 worker 프로세스 실행 (WORKER_PROCESSES=-1이면 외부에서 worker.py를 직접 실행)
+    workers = None
+    if settings.process_mode == "gateway" and settings.worker_processes >= 0:
+        workers = WorkerSupervisor(settings.get_worker_processes())
+        workers.start()
 
     # 5. Graceful shutdown
     loop = asyncio.get_running_loop()
@@ -60,13 +138,25 @@ async def main():
                 return_when=asyncio.FIRST_COMPLETED,
             )
 
+            # 7. Drain: 새 업로드 거부 → 실행 중인 작업 대기(grace) → 남은 작업 checkpoint
+            #    Discord 연결을 유지한 채로 진행해야 상태 메시지를 갱신할 수 있으므로 bot.close() 전에 수행
+            if shutdown_task in done:
+                cog = bot.get_cog("MeetingBotCog")
+                if cog is not None:
+                    await cog.drain(settings.shutdown_grace_seconds)
+                await bot.close()
+
             for task in pending:
                 task.cancel()
     finally:
+        if workers:
+            await workers.stop(settings.shutdown_grace_seconds + 5)
         if ping_task:
             ping_task.cancel()
+        watchdog.stop()
         await runner.cleanup()
         logger.info("Cleanup complete")
+        stop_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+기록된 cassette로 회의록 처리를 오프라인 재생 (성능 회귀 테스트).
+
+    CASSETTE_MODE=record python main.py            # 운영/스테이징에서 외부 호출 기록
+    python replay.py data/cassettes/recording-123.jsonl.gz
+    python replay.py cassette.jsonl.gz --save-baseline data/replay_baseline.json
+    python replay.py cassette.jsonl.gz --baseline data/replay_baseline.json --max-regression 0.2
+
+LLM / Notion / 웹훅 응답은 cassette에서 기록된 지연 시간(× --time-scale)대로 돌려주므로
+API 키·네트워크·비용 없이 같은 작업을 반복 실행할 수 있다.
+작업별·단계별 소요 시간을 baseline과 비교해 허용치 이상 느려지면 exit code 1.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+logger = logging.getLogger("Replay")
+
+STAGES = ("analysis", "notion", "email")
+
+
+def _prepare_environment(workdir: str):
+    """재생은 네트워크 없이 동작: 필수 설정이 없으면 자리표시 값, 로컬 인덱스는 임시 경로 사용"""
+    if not os.path.exists(".env"):
+        for name in ("DISCORD_BOT_TOKEN", "NOTION_API_KEY", "NOTION_DATABASE_ID", "GOOGLE_API_KEY", "OPENAI_API_KEY"):
+            os.environ.setdefault(name, "replay")
+    # 재생 결과가 실제 검색 / Action Item 인덱스에 섞이지 않도록
+    os.environ["SEARCH_INDEX_PATH"] = os.path.join(workdir, "meetings.db")
+    os.environ["EMAIL_DIGEST_PATH"] = os.path.join(workdir, "digest.db")
+    os.environ["CASSETTE_MODE"] = "off"
+    # 웹훅 호출도 cassette에서 재생하므로 URL은 형식만 있으면 됨
+    os.environ.setdefault("MAKE_WEBHOOK_URL", "http://cassette.invalid/webhook")
+
+
+def job_key(record: dict) -> str:
+    return hashlib.sha256(f"{record['filename']}\n{record['content']}".encode("utf-8")).hexdigest()[:16]
+
+
+async def replay_job(pipeline, record: dict, channel_id: Optional[str]) -> dict:
+    result = {"job": job_key(record), "file": record["filename"], "stages": {}}
+    started = time.monotonic()
+    try:
+        stage_started = time.monotonic()
+        analysis = await pipeline.analyze(record["content"], record["filename"], record.get("user_text"))
+        result["stages"]["analysis"] = round(time.monotonic() - stage_started, 3)
+
+        stage_started = time.monotonic()
+        saved_page = await pipeline.save(analysis, channel_id)
+        result["stages"]["notion"] = round(time.monotonic() - stage_started, 3)
+
+        stage_started = time.monotonic()
+        await pipeline.notify(analysis, saved_page.url, channel_id=channel_id)
+        result["stages"]["email"] = round(time.monotonic() - stage_started, 3)
+        result["status"] = "done"
+    except Exception as e:  # CassetteMiss → AnalysisError / NotionError로 감싸져 올라옴
+        result.update(status="failed", error=str(e)[:300])
+        logger.error(f"Replay failed: {record['filename']}: {e}")
+    result["total"] = round(time.monotonic() - started, 3)
+    return result
+
+
+def compare(results: List[dict], baseline: dict, max_regression: float) -> List[str]:
+    """baseline 대비 (1 + max_regression)배 넘게 느려진 작업/단계 목록"""
+    regressions = []
+    for result in results:
+        expected = baseline.get(result["job"])
+        if not expected:
+            continue
+        for stage in STAGES + ("total",):
+            actual = result["total"] if stage == "total" else result["stages"].get(stage)
+            reference = expected["total"] if stage == "total" else expected["stages"].get(stage)
+            # 아주 짧은 단계는 타이머 오차가 비율을 지배하므로 50ms 여유를 둔다
+            if actual is None or not reference or actual <= reference * (1 + max_regression) + 0.05:
+                continue
+            regressions.append(f"{result['file']} [{stage}]: {reference:.2f}s → {actual:.2f}s")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded meeting jobs offline as a performance regression test")
+    parser.add_argument("cassette", help="cassette file recorded with CASSETTE_MODE=record")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiply recorded latencies (0 = no waiting)")
+    parser.add_argument("--concurrency", type=int, default=1, help="jobs replayed at once")
+    parser.add_argument("--only", default=None, help="replay only inputs whose filename contains this text")
+    parser.add_argument("--channel-id", default=None, help="use this channel's CHANNEL_NOTION_MAP entry")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", default=None, help="write this run's timings as the new baseline")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> int:
+    args = parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="replay-")
+    _prepare_environment(workdir)
+
+    # 설정을 읽기 전에 환경을 준비해야 하므로 여기서 import
+    from utils.logger import setup_logging
+    from utils.cassette import Cassette, known_secrets, set_cassette
+    from services.pipeline import MeetingPipeline
+
+    setup_logging(use_queue=False)
+    cassette = Cassette(args.cassette, "replay", args.time_scale, known_secrets())
+    set_cassette(cassette)
+
+    records = [r for r in cassette.inputs() if not args.only or args.only in r["filename"]]
+    if not records:
+        logger.error(f"No recorded inputs in {args.cassette}")
+        return 2
+
+    pipeline = MeetingPipeline()
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    async def run(record):
+        async with semaphore:
+            return await replay_job(pipeline, record, args.channel_id)
+
+    started = time.monotonic()
+    try:
+        results = await asyncio.gather(*(run(record) for record in records))
+    finally:
+        await pipeline.close()
+
+    report = {
+        "jobs": len(results),
+        "failed": sum(1 for r in results if r["status"] != "done"),
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+        "time_scale": args.time_scale,
+        "cassette": cassette.snapshot(),
+        "results": results,
+    }
+
+    exit_code = 0 if report["failed"] == 0 else 1
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(results, baseline, args.max_regression)
+        if report["regressions"]:
+            exit_code = 1
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({r["job"]: r for r in results if r["status"] == "done"}, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    try:
+        exit_code = asyncio.run(main())
+    finally:
+        from utils.logger import stop_logging
+        stop_logging()
+    sys.exit(exit_code)
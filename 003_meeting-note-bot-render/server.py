@@ -1,7 +1,17 @@
 import asyncio
+import functools
+import hmac
 import logging
 import time
 from aiohttp import web, ClientSession
+from config import get_settings
+from utils.limiter import get_llm_limiter
+from utils.loop_monitor import get_loop_watchdog
+from utils.profiler import ProfilerBusyError, get_profiler
+from utils.scheduler import get_scheduler
+from utils.job_queue import get_job_queue
+from utils.admission import get_admission_controller
+from utils.job_registry import get_job_registry
 
 logger = logging.getLogger("Server")
 
@@ -11,6 +21,7 @@ bot_stats = {
     "meetings_processed": 0,
     "last_processed_at": None,
     "bot_ready": False,
+    "prompt_cache": None,
 }
 
 
@@ -18,13 +29,22 @@ async def handle_root(request):
     uptime = None
     if bot_stats["start_time"]:
         uptime = int(time.time() - bot_stats["start_time"])
+    settings = get_settings()
+    # 큐 집계는 여러 SQLite 쿼리 (worker가 쓰기 중이면 잠금 대기) → 이벤트 루프 밖에서
+    job_queue = await asyncio.to_thread(get_job_queue().snapshot) if settings.process_mode == "gateway" else None
     return web.json_response({
         "service": "meeting-note-bot",
+        "process_mode": settings.process_mode,
         "status": "running",
         "bot_ready": bot_stats["bot_ready"],
         "uptime_seconds": uptime,
         "meetings_processed": bot_stats["meetings_processed"],
         "last_processed_at": bot_stats["last_processed_at"],
+        "prompt_cache": bot_stats["prompt_cache"],
+        "llm_limiter": get_llm_limiter().snapshot(),
+        "scheduler": get_scheduler().snapshot(),
+        "admission": get_admission_controller().snapshot(),
+        "job_queue": job_queue,
     })
 
 
@@ -32,6 +52,113 @@ async def handle_health(request):
     return web.Response(text="OK", status=200)
 
 
+def require_debug_token(handler):
+    """
+    /debug/*, /jobs 인증: Authorization: Bearer <DEBUG_TOKEN>.
+    DEBUG_TOKEN이 설정되지 않으면 엔드포인트 자체를 숨긴다(404).
+    """
+    @functools.wraps(handler)
+    async def wrapper(request):
+        token = get_settings().debug_token
+        if not token:
+            raise web.HTTPNotFound()
+        provided = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(provided.encode(), token.encode()):
+            raise web.HTTPUnauthorized()
+        return await handler(request)
+    return wrapper
+
+
+@require_debug_token
+async def handle_debug_loop(request):
+    """이벤트 루프 지연 분포와 최근 stall 스택"""
+    return web.json_response(get_loop_watchdog().snapshot())
+
+
+@require_debug_token
+async def handle_debug_cpu(request):
+    """
+    GET /debug/profile/cpu?seconds=10&format=collapsed|pstats|text
+    - collapsed: 샘플링 프로파일 (flamegraph용 collapsed stack)
+    - pstats: cProfile 바이너리 덤프
+    - text: cProfile 누적시간 상위 함수
+    """
+    try:
+        seconds = float(request.query.get("seconds", "10"))
+    except ValueError:
+        raise web.HTTPBadRequest(text="seconds must be a number")
+    fmt = request.query.get("format", "collapsed")
+    profiler = get_profiler()
+
+    try:
+        if fmt == "collapsed":
+            body = await profiler.sample_cpu(seconds)
+            return web.Response(text=body, content_type="text/plain",
+                                headers={"Content-Disposition": "attachment; filename=cpu.collapsed"})
+        if fmt == "pstats":
+            profile = await profiler.profile_cpu(seconds)
+            return web.Response(body=profiler.pstats_dump(profile), content_type="application/octet-stream",
+                                headers={"Content-Disposition": "attachment; filename=cpu.pstats"})
+        if fmt == "text":
+            profile = await profiler.profile_cpu(seconds)
+            return web.Response(text=profiler.pstats_text(profile), content_type="text/plain")
+    except ProfilerBusyError as e:
+        raise web.HTTPConflict(text=str(e))
+    raise web.HTTPBadRequest(text="format must be one of: collapsed, pstats, text")
+
+
+@require_debug_token
+async def handle_debug_memory(request):
+    """GET /debug/memory?group_by=lineno|filename&limit=30 — tracemalloc 스냅샷 + 직전 대비 diff"""
+    try:
+        result = await get_profiler().memory_snapshot(
+            group_by=request.query.get("group_by", "lineno"),
+            limit=int(request.query.get("limit", "30")),
+        )
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    return web.json_response(result)
+
+
+@require_debug_token
+async def handle_debug_memory_stop(request):
+    """POST /debug/memory/stop — tracemalloc 중지 (유휴 비용 0으로 복귀)"""
+    # 진행 중인 스냅샷(스레드)이 끝나길 기다릴 수 있으므로 루프 밖에서
+    return web.json_response(await asyncio.to_thread(get_profiler().stop_memory))
+
+
+@require_debug_token
+async def handle_jobs(request):
+    """
+    GET /jobs — 대기/실행 중인 작업의 현재 단계와 단계별 소요 시간, 최근 끝난 작업.
+    gateway 모드에서는 작업이 worker 프로세스에 있으므로 큐(SQLite)에 기록된 상태를 함께 반환.
+    """
+    settings = get_settings()
+    result = {"process_mode": settings.process_mode, **get_job_registry().snapshot()}
+    if settings.process_mode == "gateway":
+        result["queue"] = await asyncio.to_thread(get_job_queue().list_jobs)
+    return web.json_response(result)
+
+
+@require_debug_token
+async def handle_job_cancel(request):
+    """
+    POST /jobs/{job_id}/cancel — 작업 취소. 실행 중이면 진행 중인 LLM / Notion 호출을 중단하고,
+    대기 중이면 시작 시점에 건너뛴다. 202: 취소 요청됨, 404: 없음, 409: 이미 끝남.
+    """
+    job_id = request.match_info["job_id"]
+    status = get_job_registry().cancel(job_id)
+    if status == "not_found" and get_settings().process_mode == "gateway":
+        # worker가 heartbeat에서 취소 요청을 확인 (최대 HEARTBEAT_INTERVAL 지연)
+        queued_status = await get_job_queue().request_cancel(job_id)
+        status = {"queued": "cancelled", "running": "cancelling", "finished": "finished"}.get(queued_status, "not_found")
+    if status == "not_found":
+        raise web.HTTPNotFound(text=f"job not found: {job_id}")
+    if status == "finished":
+        raise web.HTTPConflict(text=f"job already finished: {job_id}")
+    return web.json_response({"job_id": job_id, "status": status}, status=202)
+
+
 async def self_ping(url: str, interval: int):
     """Periodically ping own URL to prevent Render free plan sleep."""
     logger.info(f"Self-ping started: interval={interval}s, url={url}")
@@ -53,6 +180,12 @@ def create_app() -> web.Application:
     app = web.Application()
     app.router.add_get("/", handle_root)
     app.router.add_get("/health", handle_health)
+    app.router.add_get("/debug/loop", handle_debug_loop)
+    app.router.add_get("/debug/profile/cpu", handle_debug_cpu)
+    app.router.add_get("/debug/memory", handle_debug_memory)
+    app.router.add_post("/debug/memory/stop", handle_debug_memory_stop)
+    app.router.add_get("/jobs", handle_jobs)
+    app.router.add_post("/jobs/{job_id}/cancel", handle_job_cancel)
     return app
 
 
@@ -0,0 +1,244 @@
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from datetime import date, datetime
+from typing import List, Optional
+
+from config import get_settings
+from services.agent_service import MeetingAnalysis
+
+logger = logging.getLogger("ActionIndex")
+
+# 담당자 여러 명 표기 구분자 ("김철수, 이영희" / "김철수/이영희" / "A사 및 B사")
+ASSIGNEE_SEPARATORS = re.compile(r"\s*(?:,|/|&|·|및)\s*")
+HONORIFIC_SUFFIX = re.compile(r"님$")
+
+FULL_DATE = re.compile(r"(\d{4})\s*(?:[-./]|년)\s*(\d{1,2})\s*(?:[-./]|월)\s*(\d{1,2})")
+COMPACT_DATE = re.compile(r"(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)")
+SHORT_DATE = re.compile(r"(?<!\d)(\d{1,2})\s*(?:[./]|월)\s*(\d{1,2})(?!\d)")
+
+
+def normalize_assignee(name: str) -> str:
+    """담당자 비교용 키: 전각/반각 통일, '@'·공백·'님' 제거, 소문자"""
+    key = unicodedata.normalize("NFKC", name).strip().lstrip("@")
+    key = re.sub(r"\s+", "", key)
+    return HONORIFIC_SUFFIX.sub("", key).casefold()
+
+
+def _escape_like(text: str) -> str:
+    """LIKE 와일드카드(%, _)를 글자 그대로 비교 (ESCAPE '\\')"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def split_assignees(subject: str) -> List[str]:
+    names = [name.strip() for name in ASSIGNEE_SEPARATORS.split(subject or "")]
+    return [name for name in names if name] or ["미정"]
+
+
+def _safe_date(year: int, month: int, day: int) -> Optional[date]:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def parse_due_date(text: str, reference: date) -> Optional[date]:
+    """
+    LLM이 쓴 기한 문자열에서 날짜 추출. '미정', '다음 주' 등 해석할 수 없으면 None.
+    연도가 없는 'M/D', 'M월 D일'은 회의 날짜(reference) 기준으로 가장 가까운 미래 연도로 본다.
+    """
+    if not text:
+        return None
+    match = FULL_DATE.search(text) or COMPACT_DATE.search(text)
+    if match:
+        return _safe_date(*(int(part) for part in match.groups()))
+    match = SHORT_DATE.search(text)
+    if match:
+        month, day = int(match.group(1)), int(match.group(2))
+        parsed = _safe_date(reference.year, month, day)
+        if parsed and (reference - parsed).days > 180:
+            parsed = _safe_date(reference.year + 1, month, day)
+        return parsed
+    return None
+
+
+class ActionIndex:
+    """
+    회의록 Action Item 로컬 인덱스 (SQLite).
+    (database_id, 담당자 키, 완료 여부), (database_id, 완료 여부, 기한) 인덱스로
+    !actions / !overdue 를 Notion 호출 없이 바로 응답한다.
+    검색 인덱스와 같은 SQLite 파일(SEARCH_INDEX_PATH)에 별도 테이블로 저장.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or get_settings().search_index_path
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS action_items (
+                page_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                assignee_key TEXT NOT NULL,
+                assignee TEXT,
+                database_id TEXT,
+                channel_id TEXT,
+                notion_url TEXT,
+                meeting_title TEXT,
+                meeting_date TEXT,
+                action TEXT,
+                due_text TEXT,
+                due_date TEXT,
+                done INTEGER NOT NULL DEFAULT 0,
+                indexed_at TEXT,
+                synced_at TEXT,
+                PRIMARY KEY (page_id, position, assignee_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_actions_assignee ON action_items(database_id, assignee_key, done);
+            CREATE INDEX IF NOT EXISTS idx_actions_due ON action_items(database_id, done, due_date);
+        """)
+        self._conn.commit()
+        logger.info(f"Action index ready: {self.db_path}")
+
+    # --- Write ---
+
+    def _replace_page_sync(self, page_id: str, rows: List[tuple]):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM action_items WHERE page_id = ?", (page_id,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO action_items (page_id, position, assignee_key, assignee, database_id, channel_id, "
+                "notion_url, meeting_title, meeting_date, action, due_text, due_date, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    async def index_analysis(self, analysis: MeetingAnalysis, page_id: str, notion_url: str,
+                             database_id: str, channel_id: str = None):
+        """저장 직후 호출: 페이지의 Action Item 전체를 교체 (position = Notion to-do 순서)"""
+        meeting_day = parse_due_date(analysis.meeting_date, date.today()) or date.today()
+        now = datetime.now().isoformat()
+        rows = []
+        for position, item in enumerate(analysis.action_items):
+            due = parse_due_date(item.due_date, meeting_day)
+            for assignee in split_assignees(item.subject):
+                rows.append((
+                    page_id, position, normalize_assignee(assignee), assignee, database_id, channel_id,
+                    notion_url, analysis.meeting_title, meeting_day.isoformat(), item.action, item.due_date,
+                    due.isoformat() if due else None, now,
+                ))
+        await asyncio.to_thread(self._replace_page_sync, page_id, rows)
+        logger.info(f"Indexed {len(analysis.action_items)} action items: {analysis.meeting_title} ({page_id})")
+
+    def _set_done_sync(self, page_id: str, states: List[bool]):
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE action_items SET done = ?, synced_at = ? WHERE page_id = ? AND position = ?",
+                [(int(checked), now, page_id, position) for position, checked in enumerate(states)],
+            )
+
+    # --- Read ---
+
+    def _query(self, sql: str, params: tuple) -> List[dict]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _open_items_sync(self, database_id: Optional[str], assignee: Optional[str], limit: int) -> List[dict]:
+        where = ["done = 0"]
+        params = []
+        if database_id:
+            where.append("database_id = ?")
+            params.append(database_id)
+        if assignee:
+            # 글자 순서 일치: "김과장" → "김철수과장", "철수" → "김철수"
+            where.append("assignee_key LIKE ? ESCAPE '\\'")
+            params.append("%" + "%".join(_escape_like(char) for char in normalize_assignee(assignee)) + "%")
+        params.append(limit)
+        return self._query(
+            f"SELECT * FROM action_items WHERE {' AND '.join(where)} "
+            f"ORDER BY due_date IS NULL, due_date, meeting_date DESC LIMIT ?",
+            tuple(params),
+        )
+
+    async def open_items(self, assignee: str = None, database_id: str = None, limit: int = 20) -> List[dict]:
+        return await asyncio.to_thread(self._open_items_sync, database_id, assignee, limit)
+
+    async def overdue(self, database_id: str = None, today: date = None, limit: int = 20) -> List[dict]:
+        today = (today or date.today()).isoformat()
+        sql = "SELECT * FROM action_items WHERE done = 0 AND due_date < ?"
+        params = [today]
+        if database_id:
+            sql += " AND database_id = ?"
+            params.append(database_id)
+        sql += " ORDER BY due_date LIMIT ?"
+        params.append(limit)
+        return await asyncio.to_thread(self._query, sql, tuple(params))
+
+    async def assignee_counts(self, database_id: str = None, today: date = None) -> List[dict]:
+        """담당자별 미완료/기한 초과 건수"""
+        today = (today or date.today()).isoformat()
+        sql = (
+            "SELECT assignee_key, MIN(assignee) AS assignee, COUNT(*) AS open, "
+            "COALESCE(SUM(due_date < ?), 0) AS overdue FROM action_items WHERE done = 0"
+        )
+        params = [today]
+        if database_id:
+            sql += " AND database_id = ?"
+            params.append(database_id)
+        sql += " GROUP BY assignee_key ORDER BY open DESC"
+        return await asyncio.to_thread(self._query, sql, tuple(params))
+
+    # --- Sync ---
+
+    async def sync_from_notion(self, notion_service, client, database_id: str,
+                               progress_every: int = 20, on_progress=None) -> dict:
+        """
+        미완료 항목이 있는 페이지만 골라 Notion to-do 체크 상태를 읽어 반영.
+        페이지는 한 번에 하나씩 순차로 읽는다: NotionService의 throttle(요청마다 NOTION_READ_INTERVAL 대기)이
+        Notion rate limit(평균 초당 3회)에 맞춰져 있어 동시에 읽어도 빨라지지 않는다.
+        progress_every 페이지마다 on_progress로 진행 상황을 알린다.
+        """
+        pages = await asyncio.to_thread(
+            self._query,
+            "SELECT DISTINCT page_id FROM action_items WHERE done = 0 AND database_id = ?",
+            (database_id,),
+        )
+        page_ids = [row["page_id"] for row in pages]
+        synced, failed = 0, 0
+
+        for start in range(0, len(page_ids), progress_every):
+            for page_id in page_ids[start:start + progress_every]:
+                try:
+                    states = await notion_service.read_todo_states(client, page_id)
+                except Exception as e:
+                    logger.warning(f"To-do sync failed for page {page_id}: {e}")
+                    failed += 1
+                    continue
+                await asyncio.to_thread(self._set_done_sync, page_id, states)
+                synced += 1
+            if on_progress:
+                await on_progress(min(start + progress_every, len(page_ids)), len(page_ids))
+
+        logger.info(f"Action sync complete: {synced} pages synced, {failed} failed (database {database_id})")
+        return {"pages": len(page_ids), "synced": synced, "failed": failed}
+
+
+# Singleton
+_action_index: Optional[ActionIndex] = None
+
+
+def get_action_index() -> ActionIndex:
+    global _action_index
+    if _action_index is None:
+        _action_index = ActionIndex()
+    return _action_index
@@ -1,11 +1,26 @@
+import asyncio
+import contextvars
+import functools
+import json
 import logging
+import random
+import re
+import time
 from config import get_settings
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import List, Optional, Tuple, Type, get_args, get_origin
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, create_model
+from utils.cassette import get_cassette
+from utils.deadline import Deadline, deadline_stage
+from utils.json_repair import loads_lenient
+from utils.limiter import get_llm_limiter, is_overload_error
 
 logger = logging.getLogger("AgentService")
 
@@ -30,6 +45,17 @@ class ActionItem(BaseModel):
     risk: str = Field(description="리스크")
 
 # --- 이메일용 간결한 요약 모델 ---
+
+# from_analysis: executive_summary 앞 몇 줄을 요약으로, 핵심 포인트는 3~5개
+EMAIL_SUMMARY_LINES = 2
+EMAIL_MIN_POINTS = 3
+EMAIL_MAX_POINTS = 5
+_BULLET = re.compile(r"^\s*(?:[-*•·]|\d+[.)])\s*")
+
+
+def _strip_bullet(text: str) -> str:
+    return _BULLET.sub("", text).strip()
+
 class EmailActionItem(BaseModel):
     task: str = Field(description="할 일")
     assignee: str = Field(description="담당자")
@@ -42,6 +68,37 @@ class EmailSummary(BaseModel):
     decisions: List[str] = Field(description="주요 결정사항")
     next_actions: List[EmailActionItem] = Field(description="Next Action 항목")
 
+    @classmethod
+    def from_analysis(cls, analysis: "MeetingAnalysis", max_points: int = EMAIL_MAX_POINTS) -> "EmailSummary":
+        """
+        LLM 호출 없이 이미 만든 MeetingAnalysis에서 이메일 요약 구성.
+        executive_summary 앞 줄 → 요약, 이어지는 줄 → 핵심 포인트 (부족하면 논의 주제로 보충),
+        action_items → Next Action (담당자 / 할 일만)
+        """
+        lines = analysis.executive_summary
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+        lines = [line for line in (_strip_bullet(line) for line in lines) if line]
+
+        key_points = lines[EMAIL_SUMMARY_LINES:EMAIL_SUMMARY_LINES + max_points]
+        for topic in analysis.discussions:
+            if len(key_points) >= EMAIL_MIN_POINTS:
+                break
+            if topic.topic_title not in key_points:
+                key_points.append(topic.topic_title)
+
+        return cls(
+            meeting_title=analysis.meeting_title,
+            meeting_date=analysis.meeting_date,
+            executive_summary=" ".join(lines[:EMAIL_SUMMARY_LINES]) or analysis.meeting_purpose,
+            key_points=key_points,
+            decisions=[_strip_bullet(decision) for decision in analysis.decisions[:max_points]],
+            next_actions=[
+                EmailActionItem(task=item.action, assignee=item.subject or "미정")
+                for item in analysis.action_items
+            ],
+        )
+
     def to_email_body(self) -> str:
         """이메일 본문용 마크다운 형식 생성"""
         body = f"# {self.meeting_title}\n\n"
@@ -280,39 +337,36 @@ class MeetingAnalysis(BaseModel):
 """
         return html
 
-# --- Agent Service ---
+# --- Section Models (parallel mode) ---
 
-class AgentService:
-    def __init__(self):
-        settings = get_settings()
-        self.llm_provider = settings.llm_provider
+def _partial_model(model: Type[BaseModel], name: str, field_names: List[str]) -> Type[BaseModel]:
+    """원본 모델의 필드 정의(설명 포함)를 그대로 재사용하는 부분 모델 생성"""
+    fields = {
+        field_name: (model.model_fields[field_name].annotation, model.model_fields[field_name])
+        for field_name in field_names
+    }
+    return create_model(name, **fields)
 
-        if self.llm_provider == "google":
-            self.llm = ChatGoogleGenerativeAI(
-                model="gemini-2.5-flash",
-                google_api_key=settings.google_api_key,
-                temperature=0.1,
-            )
-        elif self.llm_provider == "openai":
-            self.llm = ChatOpenAI(
-                model="gpt-4-turbo",
-                api_key=settings.openai_api_key,
-                temperature=0.1,
-            )
-        else:
-            raise ValueError(f"Invalid LLM_PROVIDER: {self.llm_provider}")
+OverviewSection = _partial_model(MeetingAnalysis, "OverviewSection", ["meeting_title", "meeting_date", "attendees", "meeting_purpose", "executive_summary"])
+DiscussionSection = _partial_model(MeetingAnalysis, "DiscussionSection", ["discussions"])
+DecisionSection = _partial_model(MeetingAnalysis, "DecisionSection", ["decision_structure", "key_risks", "decisions"])
+ActionSection = _partial_model(MeetingAnalysis, "ActionSection", ["action_items"])
 
-        self.parser = PydanticOutputParser(pydantic_object=MeetingAnalysis)
-        self.email_parser = PydanticOutputParser(pydantic_object=EmailSummary)
+class TitleCheck(BaseModel):
+    meeting_title: str = MeetingAnalysis.model_fields["meeting_title"]
+
+# 제목 형식: YYYYMMDD_고객명_회의내용1줄요약 관련 회의
+TITLE_PATTERN = re.compile(r"^\d{8}_[^_\[\]]+_.+ 관련 회의$")
 
-    async def analyze_meeting(self, transcript: str, user_prompt: str = None) -> MeetingAnalysis:
-        logger.info(f"Starting LLM analysis... (user_prompt: {bool(user_prompt)})")
+# --- Prompts ---
 
-        system_prompt = """
+PROMPT_ROLE = """
         당신은 전략 컨설턴트 수준의 회의 기록 전문가입니다.
         아래 회의 내용을 기반으로, 임원 보고 및 사업 의사결정에 활용 가능한
         구조화된 고급 미팅노트를 작성하세요.
+"""
 
+PROMPT_PRINCIPLES = """
         ────────────────────────
         [작성 원칙]
         ────────────────────────
@@ -325,7 +379,9 @@ class AgentService:
         7. 감정적 표현, 군더더기 표현 제거
         8. 이모지(emoji)를 절대 사용하지 않는다
         9. 날짜, 수치, 고유명사는 원문 그대로 유지한다
+"""
 
+PROMPT_TITLE_RULES = """
         ────────────────────────
         [제목 작성 규칙 - 가장 중요]
         ────────────────────────
@@ -370,11 +426,15 @@ class AgentService:
           - 고객명 전혀 파악 불가(극히 드문 경우) → "20260114_고객사명미기재_STT 기능 검토 관련 회의"
 
         * 절대 금지: 원문에 없는 회사명 지어내기, "[고객사명미기재]" 대괄호 사용
+"""
 
+PROMPT_GUIDE_HEADER = """
         ────────────────────────
         [출력 구조 가이드]
         ────────────────────────
+"""
 
+PROMPT_GUIDE_OVERVIEW = """
         1. 회의 개요 (Meeting Overview):
            - meeting_title: 위 제목 규칙에 따라 작성
            - meeting_date: 원문에서 추출 (없으면 "미기재")
@@ -384,14 +444,18 @@ class AgentService:
         2. 핵심 요약 (Executive Summary):
            - 10~15줄 전략 요약 (List[str])
            - 이번 미팅이 사업에 미치는 의미, 승부 포인트, 주요 리스크, 향후 분기점 포함
+"""
 
+PROMPT_GUIDE_DISCUSSIONS = """
         3. 주요 논의 내용 (Discussion Summary):
            - 논점별로 분리 (발언 순서 아님, 논리적 재구성)
            - 각 논점마다: topic_title(논점 제목), content(서술형 요약)
            - content는 소제목(배경, 고객입장, 사업적의미 등) 없이 문단 형태로 서술
            - 팩트 기반으로 작성하고, 과도한 추론이나 해석은 배제
            - 배경/맥락, 논의 내용, 리스크 등을 자연스럽게 하나의 문단으로 녹여서 작성
+"""
 
+PROMPT_GUIDE_DECISIONS = """
         4. 의사결정 구조 및 평가 기준 (Decision Structure):
            - 있는 경우만 작성 (없으면 빈 리스트)
            - category(구분), subject(주체), influence(영향력), criteria(기준), comment(코멘트)
@@ -401,10 +465,14 @@ class AgentService:
 
         6. 결정사항 (Decisions):
            - 확정된 사항, 방향성 합의 내용, 미확정이나 유력한 방향
+"""
 
+PROMPT_GUIDE_ACTIONS = """
         7. Next Action:
            - subject(주체), action(액션), due_date(기한), purpose(목적), risk(리스크)
+"""
 
+PROMPT_INPUT = """
         ────────────────────────
         [입력 데이터]
         ────────────────────────
@@ -414,48 +482,114 @@ class AgentService:
         [사용자 추가 요청사항 / 파일명 힌트]
         ────────────────────────
         {user_request}
+"""
 
+PROMPT_TITLE_CHECKLIST = """
         ★★★ 고객명 최종 체크리스트 (출력 전 반드시 확인) ★★★
         1. user_request에 "[사용자 입력 텍스트:" 가 있는가? → 있으면 거기서 고객명 추출 (최우선)
         2. user_request에 "[파일명 힌트:" 가 있는가? → 파일명이 회사명이면 사용 (숫자만이면 패스)
         3. 회의 원문에서 고객 회사명이 언급되는가? → 있으면 추출
         4. 위 모두 해당 없으면 → "고객사명미기재" (이 경우는 극히 드물어야 함)
         → 제목에 고객명이 빠져있으면 다시 확인할 것!
+"""
 
+PROMPT_FORMAT = """
         ────────────────────────
         [출력 포맷]
         ────────────────────────
         {format_instructions}
-        """
+"""
 
-        # 사용자 추가 요청사항 처리
-        user_request_text = user_prompt if user_prompt else "없음"
+PROMPT_SECTION_SCOPE = """
+        ────────────────────────
+        [이번 요청의 작성 범위]
+        ────────────────────────
+        전체 미팅노트 중 아래 가이드에 해당하는 항목만 작성하세요.
+        나머지 항목은 별도 요청에서 작성되므로 출력하지 마세요.
+"""
 
-        prompt = PromptTemplate(
-            template=system_prompt,
-            input_variables=["transcript", "user_request"],
-            partial_variables={"format_instructions": self.parser.get_format_instructions()}
-        )
+PROMPT_REPAIR_SCOPE = """
+        ────────────────────────
+        [누락 항목 보완 요청]
+        ────────────────────────
+        이전 응답에서 일부 항목이 누락되었거나 형식이 잘못되었습니다.
+        아래 [이전 응답 중 문제 부분]을 출력 포맷에 맞게 고쳐 쓰세요.
+        출력 포맷에 있는 항목만 작성하고, 다른 항목은 출력하지 마세요.
+        문제 부분에 없는 내용은 지어내지 말고, 알 수 없으면 빈 값 또는 "미정"으로 작성하세요.
+"""
 
-        chain = prompt | self.llm | self.parser
+# 복구 요청은 원문 없이 문제 부분 + 누락 필드 스키마만 보낸다 (스키마는 필드 조합마다 달라 human 메시지로)
+REPAIR_SYSTEM_PROMPT = PROMPT_ROLE + PROMPT_PRINCIPLES + PROMPT_REPAIR_SCOPE
 
-        try:
-            result = await chain.ainvoke({"transcript": transcript, "user_request": user_request_text})
-            logger.info(f"Analysis complete. Title: {result.meeting_title}")
-            return result
-        except Exception as e:
-            logger.error(f"Error during LLM analysis: {e}")
-            raise e
+REPAIR_INPUT = """
+        ────────────────────────
+        [이전 응답 중 문제 부분]
+        ────────────────────────
+        {fragment}
+""" + PROMPT_FORMAT
+
+# 누락 필드가 응답에 아예 없을 때(출력 잘림) 보낼 응답 끝부분 길이
+REPAIR_TAIL_CHARS = 2000
+
+# 정적 지시문(system)을 앞에, 회의별로 바뀌는 입력(human)을 뒤에 둔다.
+# system 메시지가 매 요청 동일한 접두사가 되어 provider의 prefix cache에 적중한다.
+MEETING_SYSTEM_PROMPT = (
+    PROMPT_ROLE
+    + PROMPT_PRINCIPLES
+    + PROMPT_TITLE_RULES
+    + PROMPT_GUIDE_HEADER
+    + PROMPT_GUIDE_OVERVIEW
+    + PROMPT_GUIDE_DISCUSSIONS
+    + PROMPT_GUIDE_DECISIONS
+    + PROMPT_GUIDE_ACTIONS
+    + PROMPT_TITLE_CHECKLIST
+    + PROMPT_FORMAT
+)
+
+# 병렬 모드 섹션 정의: (이름, 출력 모델, 섹션 system 프롬프트)
+# 제목 규칙은 제목을 만드는 overview 섹션에만 포함한다.
+# 모든 섹션이 PROMPT_ROLE + PROMPT_PRINCIPLES 접두사를 공유한다.
+SECTION_SPECS = [
+    ("overview", OverviewSection,
+     PROMPT_ROLE + PROMPT_PRINCIPLES + PROMPT_SECTION_SCOPE + PROMPT_GUIDE_OVERVIEW
+     + PROMPT_TITLE_RULES + PROMPT_TITLE_CHECKLIST + PROMPT_FORMAT),
+    ("discussions", DiscussionSection,
+     PROMPT_ROLE + PROMPT_PRINCIPLES + PROMPT_SECTION_SCOPE + PROMPT_GUIDE_DISCUSSIONS + PROMPT_FORMAT),
+    ("decisions", DecisionSection,
+     PROMPT_ROLE + PROMPT_PRINCIPLES + PROMPT_SECTION_SCOPE + PROMPT_GUIDE_DECISIONS + PROMPT_FORMAT),
+    ("action_items", ActionSection,
+     PROMPT_ROLE + PROMPT_PRINCIPLES + PROMPT_SECTION_SCOPE + PROMPT_GUIDE_ACTIONS + PROMPT_FORMAT),
+]
+
+TITLE_CHECK_SYSTEM_PROMPT = (
+    PROMPT_TITLE_RULES
+    + """
+        ────────────────────────
+        [제목 점검]
+        ────────────────────────
+        주어진 초안 제목이 제목 작성 규칙을 지키지 않았습니다.
+        회의 요약과 사용자 요청을 참고해 규칙에 맞는 제목으로 다시 작성하세요.
+"""
+    + PROMPT_FORMAT
+)
 
-    async def analyze_for_email(self, transcript: str) -> EmailSummary:
-        """이메일용 간결한 요약 생성 (핵심 포인트 + Next Action 중심)"""
-        logger.info("Starting email summary analysis...")
+TITLE_CHECK_INPUT = """
+        초안 제목: {draft_title}
+        회의 일시: {meeting_date}
+        회의 목적: {meeting_purpose}
+        논의 주제: {topics}
 
-        email_prompt = """
+        [사용자 추가 요청사항 / 파일명 힌트]
+        {user_request}
+"""
+
+PROMPT_EMAIL_ROLE = """
         당신은 회의 내용을 간결하게 요약하는 비서입니다.
 
         목표: 이메일로 공유하기 적합한 **짧고 핵심적인 요약**을 생성합니다.
+"""
 
+PROMPT_EMAIL_PRINCIPLES = """
         ────────────────────────
         [작성 원칙]
         ────────────────────────
@@ -468,28 +602,403 @@ class AgentService:
         7. Next Action은 담당자와 할 일만 명시 (기한은 생략 가능)
         8. 불필요한 배경설명, 논의과정은 제외
         9. 받는 사람이 1분 안에 읽을 수 있도록 작성
+"""
+
+EMAIL_SYSTEM_PROMPT = PROMPT_EMAIL_ROLE + PROMPT_EMAIL_PRINCIPLES + PROMPT_FORMAT
 
+EMAIL_INPUT = """
         ────────────────────────
         [입력 데이터]
         ────────────────────────
         {transcript}
+"""
 
+# 회의 원문 대신 이미 작성된 미팅노트 요약만 입력으로 받아 초안을 다듬는다 (입력 토큰이 원문의 일부)
+EMAIL_REFINE_SYSTEM_PROMPT = (
+    PROMPT_EMAIL_ROLE
+    + PROMPT_EMAIL_PRINCIPLES
+    + """
         ────────────────────────
-        [출력 포맷]
+        [다듬기 요청]
         ────────────────────────
-        {format_instructions}
+        입력은 회의 원문이 아니라 이미 작성된 미팅노트의 요약과, 거기서 기계적으로 뽑은 이메일 초안입니다.
+        초안을 위 원칙에 맞게 다듬으세요. 입력에 없는 사실, 수치, 담당자를 추가하지 마세요.
+        meeting_title과 meeting_date는 초안 그대로 유지하세요.
+"""
+    + PROMPT_FORMAT
+)
+
+EMAIL_REFINE_INPUT = """
+        [이메일 초안]
+        {draft}
+
+        [미팅노트 핵심 요약]
+        {executive_summary}
+
+        [논의 주제]
+        {topics}
+"""
+
+# --- Prompt Cache Stats ---
+
+class PromptCacheStats:
+    """LLM 응답의 usage_metadata로 prefix cache 적중률을 집계"""
+
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, chain_name: str, message) -> None:
+        usage = getattr(message, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.cached_tokens += cached_tokens
+        if cached_tokens:
+            self.cache_hits += 1
+
+        logger.info(f"LLM usage [{chain_name}]: input={input_tokens}, cached={cached_tokens}, token_hit_rate={self.token_hit_rate:.1%}")
+
+    @property
+    def token_hit_rate(self) -> float:
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+            "token_hit_rate": round(self.token_hit_rate, 4),
+        }
+
+# --- Output Salvage ---
+
+def _salvage_fields(model: Type[BaseModel], data: dict) -> Tuple[dict, List[str]]:
+    """
+    파싱된 dict에서 필드 단위로 유효한 값만 살린다.
+    - 리스트 필드는 항목 단위로 검증해 잘못된 항목만 버림
+    - 값이 없거나 복구 불가한 필드는 기본값이 있으면 기본값, 없으면 누락으로 분류
+    Returns: (살린 값들, 누락된 필수 필드 이름들)
+    """
+    values = {}
+    missing = []
+
+    for name, field in model.model_fields.items():
+        adapter = TypeAdapter(field.annotation)
+        raw = data.get(name)
+        salvaged = None
+
+        if raw is not None:
+            try:
+                salvaged = adapter.validate_python(raw)
+            except ValidationError:
+                if isinstance(raw, list) and get_origin(field.annotation) is list:
+                    item_adapter = TypeAdapter(get_args(field.annotation)[0])
+                    items = []
+                    for item in raw:
+                        try:
+                            items.append(item_adapter.validate_python(item))
+                        except ValidationError:
+                            continue
+                    salvaged = items if items else None
+
+        if salvaged is not None:
+            values[name] = salvaged
+        elif not field.is_required():
+            values[name] = field.get_default(call_default_factory=True)
+        else:
+            missing.append(name)
+
+    return values, missing
+
+@functools.lru_cache(maxsize=64)
+def _repair_parser(model: Type[BaseModel], missing: Tuple[str, ...]) -> PydanticOutputParser:
+    """누락 필드 조합별 출력 모델/파서 (같은 조합은 재사용)"""
+    return PydanticOutputParser(pydantic_object=_partial_model(model, f"{model.__name__}Repair", list(missing)))
+
+
+def _invalid_fragment(text: str, data: dict, missing: List[str]) -> str:
+    """
+    복구 요청에 보낼 응답의 문제 부분: 값은 있으나 형식이 틀린 필드는 그 값만,
+    응답에서 파싱되지 않은 필드는 원문 응답의 해당 키 이후(없으면 끝부분 = 잘린 위치)
+    """
+    parts = []
+    for name in missing:
+        if data.get(name) is not None:
+            parts.append(f'"{name}": {json.dumps(data[name], ensure_ascii=False)}')
+            continue
+        start = text.find(f'"{name}"')
+        parts.append(text[start:start + REPAIR_TAIL_CHARS] if start >= 0 else f'"{name}": (응답에 없음)')
+    if any(data.get(name) is None and text.find(f'"{name}"') < 0 for name in missing):
+        parts.append(f"(응답 끝부분)\n{text[-REPAIR_TAIL_CHARS:]}")
+    return "\n\n".join(parts)
+
+# --- LLM call trace ---
+
+# 현재 작업에서 발생한 LLM 호출 기록 (병렬 섹션 task도 context를 복사해 같은 리스트에 추가)
+_llm_trace: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("llm_trace", default=None)
+
+
+@contextmanager
+def trace_llm_calls():
+    """with 블록 안의 LLM 호출(체인 이름, 입력, 원본 응답)을 리스트로 수집 (artifact 보관용)"""
+    calls = []
+    token = _llm_trace.set(calls)
+    try:
+        yield calls
+    finally:
+        _llm_trace.reset(token)
+
+# --- Agent Service ---
+
+def _compile_chain(llm, system_prompt: str, human_prompt: str, parser: Optional[PydanticOutputParser]):
+    """
+    system(정적) + human(가변) 프롬프트를 LLM에 연결. 파싱은 usage 집계 후 별도로 수행.
+    parser가 None이면 format_instructions를 호출 시 입력으로 받는다 (출력 스키마가 호출마다 다른 복구 체인).
+    """
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", human_prompt),
+    ])
+    if parser is not None:
+        prompt = prompt.partial(format_instructions=parser.get_format_instructions())
+    return prompt | llm
+
+class AgentService:
+    def __init__(self, llm: BaseChatModel = None):
+        settings = get_settings()
+        self.llm_provider = settings.llm_provider
+        self.analysis_mode = settings.analysis_mode
+
+        if llm is not None:
+            # 테스트/로컬 실행용 주입 (services.fake_llm 참고)
+            self.llm = llm
+        elif self.llm_provider == "google":
+            self.llm = ChatGoogleGenerativeAI(
+                model="gemini-2.5-flash",
+                google_api_key=settings.google_api_key,
+                temperature=0.1,
+            )
+        elif self.llm_provider == "openai":
+            self.llm = ChatOpenAI(
+                model="gpt-4-turbo",
+                api_key=settings.openai_api_key,
+                temperature=0.1,
+            )
+        else:
+            raise ValueError(f"Invalid LLM_PROVIDER: {self.llm_provider}")
+
+        if self.analysis_mode not in ("single", "parallel"):
+            raise ValueError(f"Invalid ANALYSIS_MODE: {self.analysis_mode}")
+
+        self.parser = PydanticOutputParser(pydantic_object=MeetingAnalysis)
+        self.email_parser = PydanticOutputParser(pydantic_object=EmailSummary)
+        self.title_parser = PydanticOutputParser(pydantic_object=TitleCheck)
+        self.cache_stats = PromptCacheStats()
+        self.limiter = get_llm_limiter()
+        self.max_retries = settings.llm_max_retries
+        self.cassette = get_cassette()
+
+        # 체인은 한 번만 컴파일해서 재사용
+        self.meeting_chain = _compile_chain(self.llm, MEETING_SYSTEM_PROMPT, PROMPT_INPUT, self.parser)
+        self.email_chain = _compile_chain(self.llm, EMAIL_SYSTEM_PROMPT, EMAIL_INPUT, self.email_parser)
+        self.email_refine_chain = _compile_chain(self.llm, EMAIL_REFINE_SYSTEM_PROMPT, EMAIL_REFINE_INPUT, self.email_parser)
+        self.title_chain = _compile_chain(self.llm, TITLE_CHECK_SYSTEM_PROMPT, TITLE_CHECK_INPUT, self.title_parser)
+        self.repair_chain = _compile_chain(self.llm, REPAIR_SYSTEM_PROMPT, REPAIR_INPUT, None)
+        self.section_chains = []
+        for name, model, system_prompt in SECTION_SPECS:
+            parser = PydanticOutputParser(pydantic_object=model)
+            self.section_chains.append((name, _compile_chain(self.llm, system_prompt, PROMPT_INPUT, parser), parser))
+
+    async def _invoke(self, chain_name: str, chain, parser: PydanticOutputParser, inputs: dict,
+                      repairable: bool = False):
+        """
+        체인 실행 → cache 사용량 집계 → 구조화 파싱.
+        repairable이면 파싱 실패 시 전체를 버리지 않고 살릴 수 있는 부분을 복구한다.
+        """
+        message = await self._call_llm(chain_name, chain, inputs)
+        self.cache_stats.record(chain_name, message)
+        trace = _llm_trace.get()
+        if trace is not None:
+            trace.append({
+                "chain": chain_name,
+                "inputs": inputs,
+                "content": str(message.content),
+                "usage": getattr(message, "usage_metadata", None),
+            })
+        try:
+            return parser.invoke(message)
+        except OutputParserException as e:
+            if not repairable:
+                raise
+            logger.warning(f"Output parsing failed [{chain_name}], attempting salvage: {str(e)[:200]}")
+            return await self._salvage(chain_name, parser.pydantic_object, str(message.content), e)
+
+    async def _call_llm(self, chain_name: str, chain, inputs: dict):
         """
+        적응형 동시성 제한 안에서 LLM 호출.
+        429/timeout 같은 과부하 오류는 한도가 줄어든 뒤 지수 백오프로 재시도한다.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.limiter.slot():
+                    # cassette record/replay 모드에서는 응답과 지연 시간을 기록/재생 (off면 그대로 호출)
+                    return await self.cassette.call(
+                        "llm", chain_name, {"inputs": inputs},
+                        lambda: chain.ainvoke(inputs),
+                        encode=message_to_dict,
+                        decode=lambda data: messages_from_dict([data])[0],
+                    )
+            except Exception as e:
+                if attempt >= self.max_retries or not is_overload_error(e):
+                    raise
+                backoff = (2 ** attempt) + random.uniform(0, 1)
+                logger.warning(f"LLM overload [{chain_name}], retry {attempt + 1}/{self.max_retries} in {backoff:.1f}s: {e}")
+                await asyncio.sleep(backoff)
+
+    async def _salvage(self, chain_name: str, model: Type[BaseModel], text: str,
+                       error: Exception) -> BaseModel:
+        """
+        깨진 출력 복구: 관대한 JSON 파싱 → 필드 단위 검증 →
+        그래도 빠진 필수 필드만 재요청 (원문 없이 응답의 문제 부분 + 해당 필드 스키마만 전송).
+        """
+        data = loads_lenient(text) or {}
+        values, missing = _salvage_fields(model, data)
+        logger.info(f"Salvaged [{chain_name}]: recovered={sorted(values)}, missing={missing}")
+
+        if missing:
+            repair_parser = _repair_parser(model, tuple(missing))
+            try:
+                repaired = await self._invoke(f"{chain_name}_repair", self.repair_chain, repair_parser, {
+                    "fragment": _invalid_fragment(text, data, missing),
+                    "format_instructions": repair_parser.get_format_instructions(),
+                })
+            except Exception as repair_error:
+                logger.error(f"Targeted repair failed [{chain_name}]: {repair_error}")
+                raise error
+            values.update(repaired.model_dump())
+            logger.info(f"Targeted repair complete [{chain_name}]: {missing}")
+
+        return model.model_validate(values)
+
+    async def analyze_meeting(self, transcript: str, user_prompt: str = None,
+                              deadline: Optional[Deadline] = None) -> MeetingAnalysis:
+        """deadline이 주어지면 'analysis' 단계 예산을 넘는 순간 진행 중인 LLM 호출을 모두 취소"""
+        logger.info(f"Starting LLM analysis... (user_prompt: {bool(user_prompt)}, mode: {self.analysis_mode})")
 
-        prompt = PromptTemplate(
-            template=email_prompt,
-            input_variables=["transcript"],
-            partial_variables={"format_instructions": self.email_parser.get_format_instructions()}
-        )
+        # 사용자 추가 요청사항 처리
+        user_request_text = user_prompt if user_prompt else "없음"
+
+        async with deadline_stage(deadline, "analysis"):
+            if self.analysis_mode == "parallel":
+                return await self._analyze_meeting_parallel(transcript, user_request_text)
+
+            try:
+                result = await self._invoke("meeting", self.meeting_chain, self.parser, {"transcript": transcript, "user_request": user_request_text}, repairable=True)
+                logger.info(f"Analysis complete. Title: {result.meeting_title}")
+                return result
+            except Exception as e:
+                logger.error(f"Error during LLM analysis: {e}")
+                raise e
+
+    async def _analyze_section(self, name: str, chain, parser: PydanticOutputParser,
+                               transcript: str, user_request: str) -> BaseModel:
+        """섹션 하나를 좁은 구조화 출력으로 생성"""
+        started = time.perf_counter()
+        result = await self._invoke(name, chain, parser, {"transcript": transcript, "user_request": user_request}, repairable=True)
+        logger.info(f"Section '{name}' complete in {time.perf_counter() - started:.1f}s")
+        return result
+
+    async def _analyze_meeting_parallel(self, transcript: str, user_request: str) -> MeetingAnalysis:
+        """
+        섹션별로 나눈 구조화 호출을 동시에 실행하고 하나의 MeetingAnalysis로 조립.
+        전체 지연시간은 섹션 합계가 아니라 가장 느린 섹션에 수렴한다.
+        """
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._analyze_section(name, chain, parser, transcript, user_request))
+            for name, chain, parser in self.section_chains
+        ]
+        try:
+            sections = await asyncio.gather(*tasks)
+        except Exception as e:
+            # 한 섹션이라도 실패하면 나머지 호출은 결과를 쓸 수 없으므로 취소
+            for task in tasks:
+                task.cancel()
+            logger.error(f"Error during parallel LLM analysis: {e}")
+            raise e
 
-        chain = prompt | self.llm | self.email_parser
+        merged = {}
+        for section in sections:
+            merged.update(section.model_dump())
+        result = MeetingAnalysis.model_validate(merged)
+        result.meeting_title = await self._reconcile_title(result, user_request)
+
+        logger.info(f"Parallel analysis complete in {time.perf_counter() - started:.1f}s. Title: {result.meeting_title}")
+        return result
+
+    async def _reconcile_title(self, analysis: MeetingAnalysis, user_request: str) -> str:
+        """
+        병렬 모드 제목 일관성 점검.
+        단순 형식 오류는 로컬에서 보정하고, 그래도 규칙을 벗어나면 요약 정보만으로 짧게 재요청한다.
+        """
+        title = analysis.meeting_title.strip().replace("[", "").replace("]", "")
+        if TITLE_PATTERN.match(title):
+            return title
+
+        logger.warning(f"Title failed consistency check, regenerating: {title}")
+        try:
+            checked = await self._invoke("title_check", self.title_chain, self.title_parser, {
+                "draft_title": title,
+                "meeting_date": analysis.meeting_date,
+                "meeting_purpose": analysis.meeting_purpose,
+                "topics": ", ".join(topic.topic_title for topic in analysis.discussions),
+                "user_request": user_request,
+            })
+            return checked.meeting_title.strip()
+        except Exception as e:
+            # 제목 보정 실패는 치명적이지 않으므로 초안 제목 유지
+            logger.warning(f"Title consistency pass failed, keeping draft title: {e}")
+            return title
+
+    async def summarize_for_email(self, analysis: MeetingAnalysis, refine: bool = False,
+                                  deadline: Optional[Deadline] = None) -> EmailSummary:
+        """
+        이미 만든 MeetingAnalysis로 이메일 요약 생성 (회의 원문을 다시 읽지 않음).
+        refine이면 분석 결과만 입력으로 짧은 LLM 호출 1회로 다듬고, 실패하면 결정적 요약을 그대로 사용.
+        """
+        draft = EmailSummary.from_analysis(analysis)
+        if not refine:
+            return draft
+
+        lines = analysis.executive_summary
+        try:
+            async with deadline_stage(deadline, "email"):
+                refined = await self._invoke("email_refine", self.email_refine_chain, self.email_parser, {
+                    "draft": draft.model_dump_json(indent=2),
+                    "executive_summary": lines if isinstance(lines, str) else "\n".join(lines),
+                    "topics": ", ".join(topic.topic_title for topic in analysis.discussions),
+                })
+        except Exception as e:
+            logger.warning(f"Email summary refine failed, using deterministic summary: {e}")
+            return draft
+        return refined.model_copy(update={"meeting_title": draft.meeting_title, "meeting_date": draft.meeting_date})
+
+    async def analyze_for_email(self, transcript: str, deadline: Optional[Deadline] = None) -> EmailSummary:
+        """
+        회의 원문 전체로 이메일용 요약을 따로 생성 (2-pass).
+        운영 경로는 summarize_for_email을 쓰고, 이 메서드는 email_compare.py의 품질 비교 기준으로 남겨 둔다.
+        """
+        logger.info("Starting email summary analysis...")
 
         try:
-            result = await chain.ainvoke({"transcript": transcript})
+            async with deadline_stage(deadline, "analysis"):
+                result = await self._invoke("email", self.email_chain, self.email_parser, {"transcript": transcript})
             logger.info(f"Email summary complete. Title: {result.meeting_title}")
             return result
         except Exception as e:
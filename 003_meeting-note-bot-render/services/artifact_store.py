@@ -0,0 +1,317 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+import zstandard
+
+from config import get_settings
+from services.agent_service import MeetingAnalysis
+
+logger = logging.getLogger("ArtifactStore")
+
+# 텍스트/JSON 위주라 압축률이 좋고, 수십 KB 단위에서는 level 10도 ms 수준
+ZSTD_LEVEL = 10
+
+# 작업 1건당 보관하는 산출물
+KIND_TRANSCRIPT = "transcript"
+KIND_PROMPT_INPUTS = "prompt_inputs"
+KIND_LLM_RESPONSE = "llm_response"
+KIND_ANALYSIS = "analysis"
+
+
+def normalize_page_id(page_id: str) -> str:
+    """Notion page ID는 대시 유무가 섞여 들어오므로 대시 없는 소문자로 통일"""
+    return page_id.replace("-", "").lower()
+
+
+class ArtifactStore:
+    """
+    처리한 회의록의 원문 / 프롬프트 입력 / LLM 원본 응답 / 검증된 분석 결과를 로컬에 보관.
+    - 내용은 sha256 기준 content-addressed blob(zstd 압축)으로 저장 → 같은 회의록을 다시 올려도 한 번만 저장
+    - 메타데이터(SQLite)로 Discord 메시지 ID / Notion page ID → 작업 → blob 조회
+    - 보관 기간(ARTIFACT_RETENTION_DAYS)과 전체 크기(ARTIFACT_MAX_MB) 기준으로 오래된 작업부터 삭제
+    - gateway 모드의 여러 worker가 같은 디렉터리를 쓰므로 blob 쓰기 / 메타데이터 기록 / 정리는 BEGIN IMMEDIATE 안에서 수행
+    이메일 재전송 / Markdown 재렌더링은 LLM이나 Notion 호출 없이 여기서 읽어 처리한다.
+    """
+
+    def __init__(self, directory: str = None, retention_days: int = None, max_bytes: int = None):
+        settings = get_settings()
+        self.directory = directory or settings.artifact_dir
+        self.retention_seconds = (retention_days if retention_days is not None else settings.artifact_retention_days) * 86400
+        self.max_bytes = max_bytes if max_bytes is not None else settings.artifact_max_mb * 1024 * 1024
+        self.blob_dir = os.path.join(self.directory, "blobs")
+        if not os.path.exists(self.blob_dir):
+            os.makedirs(self.blob_dir)
+
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(self.directory, "artifacts.db"), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                message_id TEXT,
+                channel_id TEXT,
+                page_id TEXT,
+                notion_url TEXT,
+                filename TEXT,
+                title TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_message ON jobs(message_id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_page ON jobs(page_id);
+            CREATE TABLE IF NOT EXISTS artifacts (
+                job_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                PRIMARY KEY (job_id, kind)
+            );
+            CREATE INDEX IF NOT EXISTS idx_artifacts_sha ON artifacts(sha256);
+            CREATE TABLE IF NOT EXISTS blobs (
+                sha256 TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL
+            );
+        """)
+        self._conn.commit()
+        logger.info(f"Artifact store ready: {self.directory}")
+
+    @contextmanager
+    def _transaction(self):
+        """
+        쓰기 트랜잭션 (BEGIN IMMEDIATE): 다른 프로세스의 보관/정리와도 직렬화된다.
+        blob 파일 쓰기/삭제도 이 안에서만 하므로, 한 프로세스가 방금 참조한 blob을 다른 프로세스가 지우지 못한다.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    # --- Blobs ---
+
+    def _blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], f"{sha256}.zst")
+
+    def _put_blob_locked(self, data: bytes) -> str:
+        """_transaction() 안에서 호출: 같은 내용이 이미 있으면 다시 압축하지 않음"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha256)
+        known = self._conn.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        if known is None or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = self._compressor.compress(data)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blobs (sha256, size, stored_size) VALUES (?, ?, ?)",
+                (sha256, len(data), len(compressed)),
+            )
+        return sha256
+
+    def _get_blob_sync(self, sha256: str) -> bytes:
+        with open(self._blob_path(sha256), "rb") as f:
+            return self._decompressor.decompress(f.read())
+
+    # --- Write ---
+
+    def _archive_sync(self, job_id: str, artifacts: dict, meta: dict):
+        with self._transaction():
+            self._archive_locked(job_id, artifacts, meta)
+            removed, orphans = self._evict_locked(keep_job_id=job_id)
+        self._log_eviction(removed, orphans)
+
+    def _archive_locked(self, job_id: str, artifacts: dict, meta: dict):
+        hashes = {}
+        for kind, value in artifacts.items():
+            data = value if isinstance(value, bytes) else (
+                value.encode("utf-8") if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+            )
+            hashes[kind] = self._put_blob_locked(data)
+
+        self._conn.execute(
+            "INSERT INTO jobs (job_id, message_id, channel_id, filename, title, created_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET message_id = excluded.message_id, channel_id = excluded.channel_id, "
+            "filename = excluded.filename, title = excluded.title",
+            (job_id, meta.get("message_id"), meta.get("channel_id"), meta.get("filename"), meta.get("title"), time.time()),
+        )
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO artifacts (job_id, kind, sha256) VALUES (?, ?, ?)",
+            [(job_id, kind, sha256) for kind, sha256 in hashes.items()],
+        )
+
+    async def archive_analysis(self, job_id: str, transcript: str, filename: str, user_text: Optional[str],
+                               llm_calls: List[dict], analysis: MeetingAnalysis,
+                               message_id: str = None, channel_id: str = None):
+        """분석 직후 호출: 원문 / 프롬프트 입력 / LLM 원본 응답 / 분석 결과 보관"""
+        transcript_sha256 = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+        # 프롬프트 입력의 원문은 transcript blob을 가리키는 해시로 대체 (중복 저장 방지)
+        prompt_inputs = {
+            "filename": filename,
+            "user_text": user_text,
+            "calls": [
+                {"chain": call["chain"], "inputs": {
+                    key: {"transcript_sha256": transcript_sha256} if value == transcript else value
+                    for key, value in call["inputs"].items()
+                }}
+                for call in llm_calls
+            ],
+        }
+        llm_responses = [{"chain": call["chain"], "content": call["content"], "usage": call["usage"]} for call in llm_calls]
+        await asyncio.to_thread(
+            self._archive_sync, job_id,
+            {
+                KIND_TRANSCRIPT: transcript,
+                KIND_PROMPT_INPUTS: prompt_inputs,
+                KIND_LLM_RESPONSE: llm_responses,
+                KIND_ANALYSIS: analysis.model_dump(),
+            },
+            {"message_id": message_id, "channel_id": channel_id, "filename": filename, "title": analysis.meeting_title},
+        )
+        logger.info(f"Archived job {job_id}: {analysis.meeting_title}")
+
+    def _link_page_sync(self, job_id: str, page_id: str, notion_url: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET page_id = ?, notion_url = ? WHERE job_id = ?",
+                (normalize_page_id(page_id), notion_url, job_id),
+            )
+
+    async def link_page(self, job_id: str, page_id: str, notion_url: str):
+        """Notion 저장 후 호출: page ID로도 찾을 수 있도록 연결"""
+        await asyncio.to_thread(self._link_page_sync, job_id, page_id, notion_url)
+
+    # --- Read ---
+
+    def _find_sync(self, message_id: Optional[str], page_id: Optional[str], channel_id: Optional[str]) -> Optional[dict]:
+        if page_id:
+            where, params = ["page_id = ?"], [normalize_page_id(page_id)]
+        elif message_id:
+            where, params = ["message_id = ?"], [str(message_id)]
+        else:
+            return None
+        if channel_id is not None:
+            where.append("channel_id = ?")
+            params.append(str(channel_id))
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT job_id, message_id, channel_id, page_id, notion_url, filename, title, created_at "
+                f"FROM jobs WHERE {' AND '.join(where)} ORDER BY created_at DESC LIMIT 1",
+                tuple(params),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("job_id", "message_id", "channel_id", "page_id", "notion_url", "filename", "title", "created_at")
+        return dict(zip(keys, row))
+
+    async def find(self, message_id: str = None, page_id: str = None, channel_id: str = None) -> Optional[dict]:
+        """Discord 메시지 ID 또는 Notion page ID로 작업 메타데이터 조회 (channel_id를 주면 그 채널에서 올린 작업만)"""
+        return await asyncio.to_thread(self._find_sync, message_id, page_id, channel_id)
+
+    def _read_sync(self, job_id: str, kind: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT sha256 FROM artifacts WHERE job_id = ? AND kind = ?", (job_id, kind)).fetchone()
+        if row is None:
+            return None
+        try:
+            return self._get_blob_sync(row[0])
+        except FileNotFoundError:
+            logger.warning(f"Missing blob for {job_id}/{kind}: {row[0]}")
+            return None
+
+    async def read(self, job_id: str, kind: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read_sync, job_id, kind)
+
+    async def load_analysis(self, job_id: str) -> Optional[MeetingAnalysis]:
+        data = await self.read(job_id, KIND_ANALYSIS)
+        return MeetingAnalysis.model_validate_json(data) if data else None
+
+    # --- Eviction ---
+
+    def _evict_locked(self, keep_job_id: Optional[str] = None) -> tuple:
+        """
+        _transaction() 안에서 호출: 보관 기간이 지난 작업 삭제 → 그래도 크기 한도를 넘으면 오래된 작업부터 삭제
+        (방금 보관한 keep_job_id는 제외) → 참조 없는 blob 정리. (삭제한 작업 수, 삭제한 blob 목록) 반환.
+        """
+        removed = 0
+        if self.retention_seconds > 0:
+            removed += self._conn.execute(
+                "DELETE FROM jobs WHERE created_at < ? AND job_id IS NOT ?",
+                (time.time() - self.retention_seconds, keep_job_id),
+            ).rowcount
+        while self.max_bytes > 0:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(stored_size), 0) FROM blobs WHERE sha256 IN "
+                "(SELECT sha256 FROM artifacts WHERE job_id IN (SELECT job_id FROM jobs))"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                break
+            oldest = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE job_id IS NOT ? ORDER BY created_at LIMIT 1", (keep_job_id,)
+            ).fetchone()
+            if oldest is None:
+                break
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", oldest)
+            removed += 1
+        self._conn.execute("DELETE FROM artifacts WHERE job_id NOT IN (SELECT job_id FROM jobs)")
+        orphans = [row[0] for row in self._conn.execute(
+            "SELECT sha256 FROM blobs WHERE sha256 NOT IN (SELECT sha256 FROM artifacts)"
+        )]
+        self._conn.executemany("DELETE FROM blobs WHERE sha256 = ?", [(sha256,) for sha256 in orphans])
+
+        # 파일 삭제도 트랜잭션 안에서: 커밋 후에 지우면 그 사이 다른 프로세스가 같은 blob을 다시 참조할 수 있음
+        for sha256 in orphans:
+            try:
+                os.remove(self._blob_path(sha256))
+            except FileNotFoundError:
+                pass
+        return removed, orphans
+
+    @staticmethod
+    def _log_eviction(removed: int, orphans: list):
+        if removed:
+            logger.info(f"Evicted {removed} archived jobs ({len(orphans)} blobs)")
+
+    def _evict_sync(self) -> int:
+        with self._transaction():
+            removed, orphans = self._evict_locked()
+        self._log_eviction(removed, orphans)
+        return removed
+
+    async def evict(self) -> int:
+        return await asyncio.to_thread(self._evict_sync)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            jobs = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            size, stored = self._conn.execute("SELECT COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+        return {
+            "jobs": jobs,
+            "raw_mb": round(size / 1024 / 1024, 2),
+            "stored_mb": round(stored / 1024 / 1024, 2),
+            "compression_ratio": round(size / stored, 2) if stored else 0.0,
+        }
+
+
+# Singleton
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
@@ -1,23 +1,104 @@
+import asyncio
+import base64
+import html
+import io
 import logging
+import os
+import re
+import uuid
+import zipfile
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List, Optional
 from config import get_settings
 import aiohttp
-from services.agent_service import MeetingAnalysis
+from services.agent_service import EmailSummary, MeetingAnalysis
+from utils.cassette import get_cassette
+from utils.deadline import Deadline, deadline_stage
+from utils.digest_outbox import get_digest_outbox
 
 logger = logging.getLogger("EmailService")
 
+DEFAULT_GROUP = "default"
+# 전송 시점이 된 digest 그룹 확인 주기 (초, EMAIL_DIGEST_WINDOW가 더 짧으면 그 값)
+DIGEST_POLL_SECONDS = 30
+
+
+@dataclass
+class DigestEntry:
+    title: str
+    date: str
+    summary: List[str]
+    notion_url: Optional[str]
+    md_content: str
+
+
+def _attachment_name(title: str, used: set) -> str:
+    base = re.sub(r'[\\/:*?"<>|]+', "_", title).strip() or "meeting"
+    name = f"{base}.md"
+    suffix = 2
+    while name in used:
+        name = f"{base}_{suffix}.md"
+        suffix += 1
+    used.add(name)
+    return name
+
+
+def build_digest_html(entries: List[DigestEntry]) -> str:
+    """여러 회의를 한 통의 메일로: 회의별 제목/일시/핵심 요약 + Notion 링크 (본문은 첨부 md)"""
+    digest = f"""
+<div style="font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; color: #333;">
+    <h1 style="color: #1a1a1a; border-bottom: 3px solid #2563eb; padding-bottom: 10px; margin-bottom: 20px;">회의록 요약 ({len(entries)}건)</h1>
+"""
+    for i, entry in enumerate(entries, 1):
+        digest += f'    <h2 style="color: #2563eb; margin-top: 25px;">{i}. {html.escape(entry.title)}</h2>\n'
+        digest += f'    <p style="color: #666; margin: 0 0 8px;">{html.escape(entry.date)}</p>\n'
+        digest += '    <ul style="background-color: #f8fafc; border-left: 4px solid #2563eb; padding: 15px 15px 15px 35px; margin-bottom: 10px;">\n'
+        for point in entry.summary:
+            digest += f'        <li style="margin: 5px 0;">{html.escape(point)}</li>\n'
+        digest += "    </ul>\n"
+        if entry.notion_url:
+            digest += f'    <p><a href="{html.escape(entry.notion_url)}" style="color: #2563eb;">Notion에서 보기</a></p>\n'
+    digest += '    <p style="color: #999; font-size: 0.85em; margin-top: 30px;">회의별 전체 회의록은 첨부된 압축 파일(md)에 포함되어 있습니다.</p>\n</div>\n'
+    return digest
+
+
+def build_digest_archive(entries: List[DigestEntry]) -> bytes:
+    """회의별 md를 하나의 zip(deflate)으로 압축 — 메일에 그대로 첨부 가능"""
+    buffer = io.BytesIO()
+    used = set()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for entry in entries:
+            archive.writestr(_attachment_name(entry.title, used), entry.md_content)
+    return buffer.getvalue()
+
 
 class EmailService:
     def __init__(self):
         settings = get_settings()
         self.webhook_url = settings.make_webhook_url
-        logger.info(f"EmailService initialized: webhook_url_set={bool(self.webhook_url)}")
+        self.digest_mode = settings.email_digest_mode
+        self.digest_window = settings.email_digest_window
+        self.digest_max_items = settings.email_digest_max_items
+        self.recipient_groups = settings.get_email_recipient_groups()
+        # 전송 전 digest 항목은 프로세스 메모리가 아니라 outbox(SQLite)에 보관
+        self.outbox = get_digest_outbox() if self.digest_mode else None
+        self._poller: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+        self.cassette = get_cassette()
+        logger.info(f"EmailService initialized: webhook_url_set={bool(self.webhook_url)}, digest_mode={self.digest_mode}")
         if not self.webhook_url:
             logger.warning("MAKE_WEBHOOK_URL is not set. Email service will not work.")
 
-    async def send_email(self, analysis: MeetingAnalysis, notion_url: str = None) -> tuple[bool, str]:
+    async def send_email(self, analysis: MeetingAnalysis, notion_url: str = None,
+                         deadline: Optional[Deadline] = None, channel_id: str = None,
+                         summary: Optional[EmailSummary] = None) -> tuple[bool, str]:
         """
         Send data to Make.com webhook for email delivery
         Returns: (success: bool, message: str)
+        summary가 없으면 analysis에서 LLM 호출 없이 구성 (EmailSummary.from_analysis).
+        deadline이 있으면 'email' 단계 예산을 넘는 즉시 요청을 취소하고 실패로 반환.
+        digest 모드에서는 수신 그룹 버퍼에 넣고 바로 반환 (전송은 window/건수 도달 시 묶어서).
         """
         logger.info(f"send_email called for: {analysis.meeting_title}")
 
@@ -26,32 +107,130 @@ class EmailService:
             logger.warning(msg)
             return False, msg
 
+        if self.digest_mode:
+            return await self._enqueue_digest(analysis, notion_url, channel_id)
+
         try:
+            summary = summary or EmailSummary.from_analysis(analysis)
             payload = {
                 "title": analysis.meeting_title,
                 "date": analysis.meeting_date,
                 "summary": analysis.executive_summary,
                 "email_body": analysis.to_html(),       # 이메일 본문용 HTML
                 "md_content": analysis.to_markdown(),   # MD 파일 첨부용
+                "email_summary": summary.to_email_body(),  # 1분 요약 (마크다운)
                 "notion_url": notion_url,               # Notion 페이지 링크
             }
 
             logger.info(f"Sending to Make.com webhook...")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.webhook_url, json=payload) as response:
-                    status = response.status
-                    logger.info(f"Make.com webhook response status: {status}")
-
-                    if status in [200, 201, 202]:
-                        logger.info("Webhook sent successfully to Make.com")
-                        return True, "Email triggered via Make.com"
-                    else:
-                        error_msg = f"Make.com returned status {status}"
-                        logger.error(error_msg)
-                        return False, error_msg
+            async with deadline_stage(deadline, "email"):
+                return await self._post(payload)
 
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Error sending to Make.com webhook: {error_msg}", exc_info=True)
             return False, error_msg
+
+    async def _post_status(self, payload: dict) -> int:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(self.webhook_url, json=payload) as response:
+                return response.status
+
+    async def _post(self, payload: dict) -> tuple[bool, str]:
+        # webhook URL 자체가 비밀 값이므로 cassette에는 payload만 기록
+        status = await self.cassette.call("webhook", "POST webhook", {"payload": payload}, lambda: self._post_status(payload))
+        logger.info(f"Make.com webhook response status: {status}")
+
+        if status in [200, 201, 202]:
+            logger.info("Webhook sent successfully to Make.com")
+            return True, "Email triggered via Make.com"
+        else:
+            error_msg = f"Make.com returned status {status}"
+            logger.error(error_msg)
+            return False, error_msg
+
+    # --- Digest mode ---
+
+    def start(self):
+        """digest 모드: 전송 시점이 된 그룹을 주기적으로 확인 (재시작 전에 쌓인 항목 포함). 여러 번 호출해도 1회만."""
+        if self.digest_mode and self._poller is None:
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self):
+        interval = min(DIGEST_POLL_SECONDS, self.digest_window)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                for group in await self.outbox.due_groups(self.digest_window, self.digest_max_items):
+                    await self.flush(group)
+            except Exception as e:
+                logger.error(f"Digest poll failed: {e}", exc_info=True)
+
+    async def _enqueue_digest(self, analysis: MeetingAnalysis, notion_url: Optional[str], channel_id: Optional[str]) -> tuple[bool, str]:
+        self.start()
+        group = self.recipient_groups.get(str(channel_id), str(channel_id) if channel_id else DEFAULT_GROUP)
+        pending = await self.outbox.add(group, asdict(DigestEntry(
+            title=analysis.meeting_title,
+            date=analysis.meeting_date,
+            summary=list(analysis.executive_summary),
+            notion_url=notion_url,
+            md_content=analysis.to_markdown(),
+        )))
+        logger.info(f"Queued for digest: {analysis.meeting_title} (group={group}, {pending}/{self.digest_max_items})")
+
+        queued = f"Queued for digest ({pending}/{self.digest_max_items})"
+        if pending >= self.digest_max_items:
+            # 호출한 작업(회의록 처리)이 웹훅 응답을 기다리지 않도록 전송은 별도 task로
+            task = asyncio.create_task(self.flush(group))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        return True, queued
+
+    async def flush(self, group: str) -> tuple[bool, str]:
+        """
+        그룹의 전송 대기 항목을 digest 1건으로 즉시 전송.
+        성공하면 outbox에서 삭제, 실패하면 남겨 두어 다음 window(또는 다음 부팅)에 재시도.
+        """
+        claimed = await self.outbox.claim(group, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        if not claimed:
+            return True, "Nothing to flush"
+        ids = [row_id for row_id, _ in claimed]
+        success, msg = await self._send_digest(group, [DigestEntry(**entry) for _, entry in claimed])
+        if success:
+            await self.outbox.complete(ids)
+        else:
+            await self.outbox.release(ids, delay=self.digest_window)
+        return success, msg
+
+    async def _send_digest(self, group: str, entries: List[DigestEntry]) -> tuple[bool, str]:
+        archive = build_digest_archive(entries)
+        payload = {
+            "type": "digest",
+            "group": group,
+            "count": len(entries),
+            "title": f"회의록 요약 {len(entries)}건 ({datetime.now().strftime('%Y-%m-%d')})",
+            "titles": [entry.title for entry in entries],
+            "email_body": build_digest_html(entries),
+            "attachment_name": f"meeting_notes_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
+            "attachment_base64": base64.b64encode(archive).decode("ascii"),
+        }
+        logger.info(f"Flushing digest: group={group}, meetings={len(entries)}, archive={len(archive) / 1024:.1f}KB")
+
+        try:
+            return await self._post(payload)
+        except Exception as e:
+            logger.error(f"Error sending digest to Make.com webhook: {e}", exc_info=True)
+            return False, str(e)
+
+    async def close(self):
+        """종료 시 호출: 대기 중인 모든 digest 즉시 전송 (실패한 그룹은 outbox에 남아 다음 부팅 때 전송)"""
+        if not self.digest_mode:
+            return
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        for group in await self.outbox.groups():
+            await self.flush(group)
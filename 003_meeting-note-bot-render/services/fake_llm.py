@@ -0,0 +1,55 @@
+import asyncio
+from typing import Callable, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+
+def _estimate_tokens(text: str) -> int:
+    # 한국어 기준 대략 2자당 1토큰
+    return max(1, len(text) // 2)
+
+
+class FakePrefixCachingChatModel(BaseChatModel):
+    """
+    로컬 테스트용 가짜 LLM.
+    provider의 implicit prefix cache처럼, 이전에 본 system 메시지를 다시 받으면
+    해당 토큰을 usage_metadata.input_token_details.cache_read로 보고한다.
+    """
+
+    responder: Callable[[List[BaseMessage]], str] = Field(default=lambda messages: "{}")
+    latency: float = 0.0
+    seen_prefixes: set = Field(default_factory=set)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-prefix-caching"
+
+    def _respond(self, messages: List[BaseMessage]) -> ChatResult:
+        prefix = "".join(m.content for m in messages if isinstance(m, SystemMessage))
+        total_tokens = sum(_estimate_tokens(str(m.content)) for m in messages)
+        cached_tokens = _estimate_tokens(prefix) if prefix and prefix in self.seen_prefixes else 0
+        if prefix:
+            self.seen_prefixes.add(prefix)
+
+        content = self.responder(messages)
+        output_tokens = _estimate_tokens(content)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": total_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": total_tokens + output_tokens,
+                "input_token_details": {"cache_read": cached_tokens},
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        return self._respond(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(messages)
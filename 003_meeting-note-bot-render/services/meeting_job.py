@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+
+import discord
+
+from utils.admission import AdmissionRejected, get_admission_controller
+from utils.deadline import Deadline
+from utils.job_registry import get_job_registry
+from utils.exceptions import AnalysisError, DeadlineExceeded, NotionError
+from services.agent_service import MeetingAnalysis
+from services.notion_service import SavedPage
+from services.pipeline import MeetingPipeline
+
+logger = logging.getLogger("MeetingJob")
+
+# 시간 초과 안내용 단계 이름
+STAGE_LABELS = {
+    "queued": "대기열",
+    "download": "파일 다운로드",
+    "analysis": "AI 분석",
+    "notion": "Notion 저장",
+    "email": "이메일 전송",
+}
+
+
+def extract_text_from_file(file_path: str) -> str:
+    """txt/md 파일에서 텍스트 추출"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class MeetingJob:
+    """
+    Discord 메시지 1건의 처리 흐름 (상태 메시지 갱신 + 단계별 checkpoint).
+    단일 프로세스 모드에서는 Cog가, gateway/worker 모드에서는 worker.py가 사용한다.
+    message/status_msg는 gateway 연결 없이 REST로 가져온 객체여도 된다.
+    """
+
+    def __init__(self, pipeline: MeetingPipeline, job_deadline_seconds: int):
+        self.pipeline = pipeline
+        self.job_deadline_seconds = job_deadline_seconds
+        self.admission = get_admission_controller()
+        self.registry = get_job_registry()
+
+        # Ensure temp directory exists
+        if not os.path.exists("temp"):
+            os.makedirs("temp")
+
+    async def run(self, message, attachment, status_msg, state: dict, store) -> bool:
+        """
+        메모리 예산을 예약한 뒤 파이프라인 실행, 끝나면(성공/실패/취소) 예산 반환.
+        예산이 부족하면 앞 작업이 끝날 때까지 대기하고, 한도를 넘는 파일은 다운로드 없이 거절한다.
+        파이프라인은 별도 task로 실행해 /jobs cancel이 이 작업만 취소할 수 있게 한다 (scheduler worker는 유지).
+        """
+        job_id = state["job_id"]
+        self.registry.register(job_id, state["channel_id"], state["filename"], state.get("size", 0))
+        outcome = "failed"
+
+        async def on_wait():
+            self.registry.enter_stage(job_id, "admission")
+            await status_msg.edit(content=f"⏳ 메모리 여유 대기 중: **{state['filename']}** (앞선 큰 파일 처리 후 시작)")
+
+        try:
+            if state.get("cancel_requested") or self.registry.cancel_requested(job_id):
+                outcome = "cancelled"
+                await self._report_cancelled(message, status_msg, state, store)
+                return False
+
+            async with self.admission.reserve(job_id, state.get("size", 0), on_wait=on_wait):
+                task = asyncio.create_task(self._run_stages(message, attachment, status_msg, state, store))
+                self.registry.attach(job_id, task)
+                try:
+                    succeeded = await task
+                except asyncio.CancelledError:
+                    # 이 task 자체가 취소된 경우(drain)는 그대로 전파, 파이프라인 task만 취소된 경우는 요청에 의한 취소
+                    if asyncio.current_task().cancelling() or not self.registry.cancel_requested(job_id):
+                        raise
+                    outcome = "cancelled"
+                    await self._report_cancelled(message, status_msg, state, store)
+                    return False
+            outcome = "done" if succeeded else "failed"
+            return succeeded
+        except AdmissionRejected as e:
+            store.remove(job_id)
+            await status_msg.edit(content=f"❌ 처리할 수 없는 파일: {e}")
+            await message.add_reaction("❌")
+            return False
+        except asyncio.CancelledError:
+            outcome = "interrupted"
+            raise
+        finally:
+            self.registry.finish(job_id, outcome)
+
+    async def _report_cancelled(self, message, status_msg, state: dict, store):
+        progress = state.get("notion_progress")
+        if progress and "saved_page" not in state:
+            # Notion 저장 중 취소: 쓰다 만 페이지를 보관 처리한 뒤 checkpoint 삭제 (정리 도중 drain이 와도 끝까지)
+            await asyncio.shield(self.pipeline.notion_service.discard_incomplete(str(state["channel_id"]), progress))
+        store.remove(state["job_id"])
+        logger.warning(f"Job cancelled by request: {state['job_id']} ({state['filename']})")
+        await status_msg.edit(content=f"🛑 관리자 요청으로 처리를 취소했습니다: **{state['filename']}**", embed=None)
+        await message.add_reaction("🛑")
+
+    async def _run_stages(self, message, attachment, status_msg, state: dict, store) -> bool:
+        """
+        파일 1건 처리 파이프라인: 다운로드 → AI 분석 → Notion 저장 → 이메일
+        각 단계가 끝날 때마다 결과를 store(checkpoint)에 기록하고, 재개 시 이미 끝난 단계는 건너뛴다.
+        Returns: 성공 여부 (실패도 사용자에게 안내를 마친 '끝난' 작업이며, 취소만 예외로 전파)
+        """
+        job_id = state["job_id"]
+        filename = state["filename"]
+        channel_id = str(message.channel.id)
+
+        # 작업 시작 시점부터 전체 예산 계산 (대기열 대기 시간은 제외)
+        deadline = Deadline(self.job_deadline_seconds)
+
+        try:
+            if "content" not in state and "analysis" not in state:
+                # Download file
+                self.registry.enter_stage(job_id, "download")
+                await status_msg.edit(content=f"📥 Downloading **{filename}**...")
+                file_path = os.path.join("temp", f"{job_id}_{filename}")
+                async with deadline.stage("download"):
+                    await attachment.save(file_path)
+                logger.info(f"File saved to {file_path}")
+
+                # Read content + user prompt (디스코드 채팅창에 입력한 텍스트)
+                state["content"] = extract_text_from_file(file_path)
+                state["user_prompt"] = message.content.strip() if message.content else None
+                state["stage"] = "download"
+                state["timings"] = self.registry.timings(job_id)
+                await store.save(job_id, state)
+                os.remove(file_path)
+
+            # 1. AI Analysis
+            if "analysis" in state:
+                analysis_result = MeetingAnalysis.model_validate(state["analysis"])
+            else:
+                content = state["content"]
+                user_prompt = state["user_prompt"]
+                self.registry.enter_stage(job_id, "analysis")
+                if user_prompt:
+                    logger.info(f"User text detected: '{user_prompt}' (will be used for title)")
+                    await status_msg.edit(content=f"🧠 Analyzing **{filename}** with custom instructions: \"{user_prompt}\"...")
+                else:
+                    await status_msg.edit(content=f"🧠 Analyzing **{filename}** with AI... (This may take a minute)")
+
+                analysis_result = await self.pipeline.analyze(
+                    content, filename, user_prompt, deadline=deadline,
+                    job_id=job_id, message_id=str(message.id), channel_id=channel_id,
+                )
+                state["analysis"] = analysis_result.model_dump()
+                # 원문은 분석 후 필요 없고 artifact store에 보관됨 → 이후 checkpoint(Notion 배치마다 저장)를 작게 유지
+                state.pop("content", None)
+                state["stage"] = "analysis"
+                state["timings"] = self.registry.timings(job_id)
+                await store.save(job_id, state)
+
+            # 2. Save to Notion (+ 검색 / Action Item 인덱스)
+            if "saved_page" in state:
+                saved_page = SavedPage(**state["saved_page"])
+            else:
+                self.registry.enter_stage(job_id, "notion")
+                await status_msg.edit(content=f"📝 Saving to Notion...")
+
+                async def save_progress(progress):
+                    # 페이지 생성 / 배치 추가마다 기록: 재개 시 같은 페이지에 이어서 추가 (중복 페이지 방지)
+                    state["notion_progress"] = progress
+                    await store.save(job_id, state)
+
+                saved_page = await self.pipeline.save(
+                    analysis_result, channel_id, deadline=deadline, job_id=job_id,
+                    progress=state.get("notion_progress"), on_progress=save_progress,
+                )
+                state.pop("notion_progress", None)
+                state["saved_page"] = saved_page._asdict()
+                state["stage"] = "notion"
+                state["timings"] = self.registry.timings(job_id)
+                await store.save(job_id, state)
+            notion_url = saved_page.url
+
+            # 3. Send Email (non-fatal)
+            if "email" in state:
+                # 전송 후 완료 처리 전에 중단된 작업: 다시 보내지 않음
+                make_success, make_msg = state["email"]
+            else:
+                self.registry.enter_stage(job_id, "email")
+                await status_msg.edit(content=f"📤 Sending email via Make.com...")
+                make_success, make_msg = await self.pipeline.notify(analysis_result, notion_url, deadline=deadline, channel_id=channel_id)
+                state["email"] = [make_success, make_msg]
+                state["stage"] = "email"
+                state["timings"] = self.registry.timings(job_id)
+                await store.save(job_id, state)
+
+            # Final Confirmation
+            embed = discord.Embed(
+                title="✅ Meeting Minutes Created!",
+                description=f"**{analysis_result.meeting_title}** has been processed.",
+                color=discord.Color.green()
+            )
+            embed.add_field(name="Summary", value=analysis_result.executive_summary[:1024] if isinstance(analysis_result.executive_summary, str) else "\n".join(analysis_result.executive_summary)[:1024], inline=False)
+            embed.add_field(name="Notion", value=f"[View Page]({notion_url})", inline=True)
+
+            if make_success and self.pipeline.email_service.digest_mode:
+                embed.add_field(name="Email", value=f"🕒 {make_msg}", inline=True)
+            elif make_success:
+                embed.add_field(name="Email", value="✅ Sent via Make.com", inline=True)
+            else:
+                embed.add_field(name="Email", value=f"❌ Failed: {make_msg[:50]}", inline=True)
+
+            store.remove(job_id)
+            await status_msg.edit(content="", embed=embed)
+            await message.add_reaction("✅")
+
+            return True
+
+        except asyncio.CancelledError:
+            # drain 중 취소면 checkpoint는 마지막 완료 단계 상태로 남겨 두고 다음 부팅 때 재개 (요청에 의한 취소는 run()에서 정리)
+            logger.warning(f"Job cancelled after stage '{state['stage']}': {filename}")
+            raise
+        except DeadlineExceeded as e:
+            store.remove(job_id)
+            logger.error(f"Deadline exceeded for {filename}: {e}")
+            await status_msg.edit(content=f"⏱️ 처리 시간 초과 ({STAGE_LABELS.get(e.stage, e.stage)} 단계, {e.budget:.0f}초 예산 소진)")
+            await message.add_reaction("❌")
+            return False
+        except AnalysisError as e:
+            store.remove(job_id)
+            logger.error(f"Analysis failed for {filename}: {e}", exc_info=True)
+            await status_msg.edit(content=f"❌ AI 분석 실패: {str(e)[:100]}")
+            await message.add_reaction("❌")
+            return False
+        except NotionError as e:
+            store.remove(job_id)
+            logger.error(f"Notion save failed for {filename}: {e}", exc_info=True)
+            await status_msg.edit(content=f"❌ Notion 저장 실패: {str(e)[:100]}")
+            await message.add_reaction("❌")
+            return False
+        except Exception as e:
+            store.remove(job_id)
+            logger.error(f"Unexpected error for {filename}: {e}", exc_info=True)
+            await status_msg.edit(content=f"❌ Error: {str(e)[:100]}")
+            await message.add_reaction("❌")
+            return False
@@ -1,17 +1,58 @@
+import asyncio
 import logging
+from typing import Awaitable, Callable, NamedTuple, Optional
 from config import get_settings
 from notion_client import AsyncClient
 from datetime import datetime
 from services.agent_service import MeetingAnalysis
+from utils.cassette import get_cassette, normalize_path
+from utils.deadline import Deadline, deadline_stage
 
 logger = logging.getLogger("NotionService")
 
+# 대량 읽기 시 요청 간 최소 간격 (초)
+NOTION_READ_INTERVAL = 0.35
+
+# 회의록 페이지 섹션 번호 → 검색 문서 필드 (create_page의 heading_2 순서와 동일)
+SECTION_FIELDS = {
+    "1.": "overview",
+    "2.": "summary",
+    "3.": "discussions",
+    "6.": "decisions",
+    "7.": "action_items",
+}
+
+
+class SavedPage(NamedTuple):
+    page_id: str
+    url: str
+    database_id: str
+
+
+def _plain_text(rich_text: list) -> str:
+    return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in rich_text)
+
+class RecordingAsyncClient(AsyncClient):
+    """모든 Notion API 호출이 지나가는 request()에서 cassette 기록/재생 (off 모드면 AsyncClient와 동일)"""
+
+    def __init__(self, cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    async def request(self, path, method, query=None, body=None, form_data=None, auth=None):
+        return await self.cassette.call(
+            "notion", f"{method.upper()} {normalize_path(path)}",
+            {"path": path, "query": query, "body": body},
+            lambda: AsyncClient.request(self, path, method, query=query, body=body, form_data=form_data, auth=auth),
+        )
+
 class NotionService:
     def __init__(self):
         settings = get_settings()
         self.default_api_key = settings.notion_api_key
         self.default_page_id = settings.notion_database_id
-        self.default_client = AsyncClient(auth=self.default_api_key)
+        self.cassette = get_cassette()
+        self.default_client = RecordingAsyncClient(self.cassette, auth=self.default_api_key)
         self.channel_map = settings.get_channel_notion_map()
         logger.info(f"Loaded channel mapping: {len(self.channel_map)} channels")
 
@@ -23,7 +64,7 @@ class NotionService:
             # 채널별 설정이 있는 경우: {"api_key": "...", "page_id": "..."}
             api_key = channel_config.get("api_key", self.default_api_key)
             page_id = channel_config.get("page_id", self.default_page_id)
-            client = AsyncClient(auth=api_key)
+            client = RecordingAsyncClient(self.cassette, auth=api_key)
             logger.info(f"Channel {channel_id} → Custom Notion config (page: {page_id})")
             return client, page_id
         else:
@@ -31,11 +72,27 @@ class NotionService:
             logger.info(f"Channel {channel_id} → Default Notion config")
             return self.default_client, self.default_page_id
 
-    async def create_page(self, analysis: MeetingAnalysis, channel_id: str = None) -> str:
+    async def create_page(self, analysis: MeetingAnalysis, channel_id: str = None,
+                          deadline: Optional[Deadline] = None) -> str:
         """
         Creates a new child page under the parent page with the meeting analysis.
         Returns the URL of the created page.
+        """
+        saved = await self.save_meeting(analysis, channel_id, deadline=deadline)
+        return saved.url
+
+    async def save_meeting(self, analysis: MeetingAnalysis, channel_id: str = None,
+                           deadline: Optional[Deadline] = None, progress: Optional[dict] = None,
+                           on_progress: Optional[Callable[[dict], Awaitable[None]]] = None) -> SavedPage:
+        """
+        회의록 페이지를 생성하고 (page_id, url, database_id)를 반환.
         channel_id가 있으면 해당 채널에 매핑된 Notion 설정(API키+페이지)으로 저장.
+        deadline이 있으면 페이지 생성 + 배치 추가 전체가 'notion' 단계 예산 안에서 실행된다.
+
+        블록이 100개를 넘으면 생성 후 배치로 나눠 추가하므로, 배치마다 진행 상황
+        ({page_id, url, batches})을 on_progress로 넘긴다. 중단(취소) 후 그 progress로 다시 호출하면
+        새 페이지를 만들지 않고 남은 배치부터 이어서 추가한다.
+        그 외 실패로 끝나면 반쯤 쓴 페이지는 보관(archive) 처리해 중복 / 미완성 페이지를 남기지 않는다.
         """
         notion_client, parent_page_id = self.get_notion_config_for_channel(channel_id) if channel_id else (self.default_client, self.default_page_id)
 
@@ -132,32 +189,142 @@ class NotionService:
             children.append({"object": "block", "type": "paragraph", "paragraph": {"rich_text": [{"text": {"content": "실행 항목 없음"}}]}})
 
 
+        # Notion API는 children 블록을 최대 100개까지만 허용
+        # 100개씩 나눠서 처리
+        MAX_BLOCKS = 100
+        batches = [children[i:i+MAX_BLOCKS] for i in range(0, len(children), MAX_BLOCKS)]
+        progress = dict(progress) if progress else {}
+        page_id = progress.get("page_id")
+
         try:
-            # Notion API는 children 블록을 최대 100개까지만 허용
-            # 100개씩 나눠서 처리
-            MAX_BLOCKS = 100
-            first_batch = children[:MAX_BLOCKS]
-            remaining_batches = [children[i:i+MAX_BLOCKS] for i in range(MAX_BLOCKS, len(children), MAX_BLOCKS)]
-
-            # 첫 번째 배치로 페이지 생성
-            response = await notion_client.pages.create(
-                parent={"database_id": parent_page_id},
-                properties=properties,
-                children=first_batch
-            )
-            page_id = response.get('id')
-            page_url = response.get('url')
-            logger.info(f"Notion page created: {page_url} (blocks: {len(first_batch)})")
-
-            # 나머지 배치들을 순차적으로 추가
-            for i, batch in enumerate(remaining_batches):
-                await notion_client.blocks.children.append(
-                    block_id=page_id,
-                    children=batch
-                )
-                logger.info(f"Appended batch {i+2}: {len(batch)} blocks")
-
-            return page_url
+            async with deadline_stage(deadline, "notion"):
+                if page_id:
+                    page_url = progress["url"]
+                    logger.info(f"Resuming Notion page {page_url}: {progress['batches']}/{len(batches)} batches already written")
+                else:
+                    # 첫 번째 배치로 페이지 생성
+                    response = await notion_client.pages.create(
+                        parent={"database_id": parent_page_id},
+                        properties=properties,
+                        children=batches[0]
+                    )
+                    page_id = response.get('id')
+                    page_url = response.get('url')
+                    progress = {"page_id": page_id, "url": page_url, "batches": 1}
+                    logger.info(f"Notion page created: {page_url} (blocks: {len(batches[0])})")
+                    if on_progress:
+                        await on_progress(dict(progress))
+
+                # 나머지 배치들을 순차적으로 추가
+                for i in range(progress["batches"], len(batches)):
+                    await notion_client.blocks.children.append(
+                        block_id=page_id,
+                        children=batches[i]
+                    )
+                    progress["batches"] = i + 1
+                    logger.info(f"Appended batch {i+1}: {len(batches[i])} blocks", extra={"sample_key": "notion.append"})
+                    if on_progress:
+                        await on_progress(dict(progress))
+
+            return SavedPage(page_id=page_id, url=page_url, database_id=parent_page_id)
         except Exception as e:
             logger.error(f"Error creating Notion page: {e}", exc_info=True)
+            if page_id:
+                await self._archive_incomplete(notion_client, page_id)
             raise e
+
+    async def discard_incomplete(self, channel_id: str, progress: dict):
+        """
+        요청에 의한 취소로 끝까지 쓰지 못한 페이지 보관 처리.
+        취소(CancelledError)는 save_meeting의 실패 정리를 거치지 않으므로 호출한 쪽(MeetingJob)에서 부른다.
+        progress: save_meeting의 on_progress로 받은 값
+        """
+        client, _ = self.get_notion_config_for_channel(channel_id)
+        await self._archive_incomplete(client, progress["page_id"])
+
+    async def _archive_incomplete(self, client: AsyncClient, page_id: str):
+        """실패로 끝난 작업의 미완성 페이지 보관 처리 (재업로드 시 중복 페이지 방지)"""
+        try:
+            await client.pages.update(page_id=page_id, archived=True)
+            logger.warning(f"Archived incomplete Notion page {page_id}")
+        except Exception as e:
+            logger.error(f"Failed to archive incomplete Notion page {page_id}: {e}")
+
+    # --- Read (backfill / sync) ---
+
+    async def _throttled(self, coro):
+        """백필 등 대량 읽기용: Notion rate limit(평균 초당 3회) 이하로 요청 간격 유지"""
+        result = await coro
+        await asyncio.sleep(NOTION_READ_INTERVAL)
+        return result
+
+    async def iter_database_pages(self, client: AsyncClient, database_id: str):
+        """
+        DB의 모든 페이지를 페이지네이션으로 순회.
+        신규 API(data_sources)와 구버전 databases.query를 모두 지원.
+        """
+        if hasattr(client, "data_sources"):
+            database = await self._throttled(client.databases.retrieve(database_id=database_id))
+            sources = [source["id"] for source in database.get("data_sources", [])]
+            query = lambda source_id, cursor: client.data_sources.query(data_source_id=source_id, start_cursor=cursor, page_size=100)
+        else:
+            sources = [database_id]
+            query = lambda source_id, cursor: client.databases.query(database_id=source_id, start_cursor=cursor, page_size=100)
+
+        for source_id in sources:
+            cursor = None
+            while True:
+                response = await self._throttled(query(source_id, cursor))
+                for page in response.get("results", []):
+                    yield page
+                if not response.get("has_more"):
+                    break
+                cursor = response.get("next_cursor")
+
+    async def _iter_blocks(self, client: AsyncClient, block_id: str):
+        cursor = None
+        while True:
+            response = await self._throttled(client.blocks.children.list(block_id=block_id, start_cursor=cursor, page_size=100))
+            for block in response.get("results", []):
+                yield block
+            if not response.get("has_more"):
+                break
+            cursor = response.get("next_cursor")
+
+    async def read_todo_states(self, client: AsyncClient, page_id: str) -> list:
+        """페이지의 to-do(Next Action) 체크 상태를 생성 순서대로 반환"""
+        return [
+            bool(block["to_do"].get("checked"))
+            async for block in self._iter_blocks(client, page_id)
+            if block.get("type") == "to_do"
+        ]
+
+    async def read_page_document(self, client: AsyncClient, page: dict) -> dict:
+        """
+        create_page가 만든 블록 구조를 섹션 제목("1. ", "2. " ...) 기준으로 다시 나눠
+        검색 인덱스용 문서(dict)로 변환.
+        """
+        title_property = page.get("properties", {}).get("이름", {}).get("title", [])
+        document = {"title": _plain_text(title_property), "meeting_date": "", "attendees": ""}
+        sections = {}
+        current = None
+
+        async for block in self._iter_blocks(client, page["id"]):
+            block_type = block.get("type")
+            text = _plain_text(block.get(block_type, {}).get("rich_text", []))
+            if block_type == "heading_2":
+                current = SECTION_FIELDS.get(text.split(" ", 1)[0])
+                continue
+            if not text or current is None:
+                continue
+            if current == "overview":
+                if text.startswith("회의 일시:"):
+                    document["meeting_date"] = text.split(":", 1)[1].strip()
+                elif text.startswith("참석자:"):
+                    document["attendees"] = text.split(":", 1)[1].strip()
+                continue
+            sections.setdefault(current, []).append(text)
+
+        for field, lines in sections.items():
+            document[field] = "\n".join(lines)
+        return document
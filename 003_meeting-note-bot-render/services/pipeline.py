@@ -0,0 +1,119 @@
+import logging
+import os
+from typing import Optional, Tuple
+
+from config import get_settings
+from utils.cassette import get_cassette
+from utils.deadline import Deadline
+from utils.exceptions import AnalysisError, DeadlineExceeded, NotionError
+from services.agent_service import AgentService, MeetingAnalysis, trace_llm_calls
+from services.artifact_store import get_artifact_store
+from services.email_service import EmailService
+from services.notion_service import NotionService, SavedPage
+from services.search_index import get_search_index
+from services.action_index import get_action_index
+
+logger = logging.getLogger("MeetingPipeline")
+
+# 지원 파일 확장자
+SUPPORTED_EXTENSIONS = ['.txt', '.md']
+
+
+def build_analysis_prompt(filename: str, user_text: Optional[str] = None) -> str:
+    """파일명 힌트 + (있으면) 사용자 입력 텍스트로 분석 지시문 구성"""
+    filename_hint = f"[파일명 힌트: {os.path.splitext(filename)[0]}]"
+    if not user_text:
+        return filename_hint
+    return f"{filename_hint}\n[사용자 입력 텍스트: {user_text}]\n사용자가 위 텍스트를 입력했습니다. 제목의 고객명과 회의주제에 반드시 반영하세요."
+
+
+class MeetingPipeline:
+    """
+    회의록 1건 처리 단계: AI 분석 → Notion 저장(+로컬 인덱스) → 이메일.
+    Discord Cog와 batch CLI가 같은 단계를 공유하며, 단계 사이 진행 표시는 호출 측이 담당한다.
+    """
+
+    def __init__(self, agent_service: AgentService = None, notion_service: NotionService = None,
+                 email_service: EmailService = None):
+        self.agent_service = agent_service or AgentService()
+        self.notion_service = notion_service or NotionService()
+        self.email_service = email_service or EmailService()
+        self.search_index = get_search_index()
+        self.action_index = get_action_index()
+        self.artifact_store = get_artifact_store()
+        self.cassette = get_cassette()
+        self.email_summary_refine = get_settings().email_summary_refine
+
+    async def analyze(self, content: str, filename: str, user_text: Optional[str] = None,
+                      deadline: Optional[Deadline] = None, job_id: Optional[str] = None,
+                      message_id: Optional[str] = None, channel_id: Optional[str] = None) -> MeetingAnalysis:
+        """job_id가 있으면 원문 / 프롬프트 입력 / LLM 원본 응답 / 분석 결과를 artifact store에 보관"""
+        # CASSETTE_MODE=record: replay.py가 같은 작업을 오프라인으로 다시 돌릴 수 있도록 입력 기록
+        await self.cassette.record_input(filename, content, user_text)
+        try:
+            with trace_llm_calls() as llm_calls:
+                analysis = await self.agent_service.analyze_meeting(content, build_analysis_prompt(filename, user_text), deadline=deadline)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            raise AnalysisError(f"AI analysis failed: {e}") from e
+
+        if job_id:
+            try:
+                await self.artifact_store.archive_analysis(
+                    job_id, content, filename, user_text, llm_calls, analysis,
+                    message_id=message_id, channel_id=channel_id,
+                )
+            except Exception as e:
+                logger.warning(f"Artifact archiving failed (non-fatal): {e}")
+        return analysis
+
+    async def save(self, analysis: MeetingAnalysis, channel_id: Optional[str] = None,
+                   deadline: Optional[Deadline] = None, job_id: Optional[str] = None,
+                   progress: Optional[dict] = None, on_progress=None) -> SavedPage:
+        """progress / on_progress: 블록 배치 추가 진행 상황 (중단된 페이지 쓰기 재개용, NotionService.save_meeting 참고)"""
+        try:
+            saved_page = await self.notion_service.save_meeting(
+                analysis, channel_id, deadline=deadline, progress=progress, on_progress=on_progress,
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            raise NotionError(f"Notion save failed: {e}") from e
+
+        # 검색 / Action Item 인덱스 추가 (non-fatal)
+        for index in (self.search_index, self.action_index):
+            try:
+                await index.index_analysis(analysis, saved_page.page_id, saved_page.url, saved_page.database_id, channel_id)
+            except Exception as e:
+                logger.warning(f"{type(index).__name__} indexing failed (non-fatal): {e}")
+        if job_id:
+            try:
+                await self.artifact_store.link_page(job_id, saved_page.page_id, saved_page.url)
+            except Exception as e:
+                logger.warning(f"Artifact page link failed (non-fatal): {e}")
+        return saved_page
+
+    async def notify(self, analysis: MeetingAnalysis, notion_url: Optional[str],
+                     deadline: Optional[Deadline] = None, channel_id: Optional[str] = None) -> Tuple[bool, str]:
+        """
+        이메일 전송 (non-fatal): (성공 여부, 메시지)
+        이메일 요약은 분석 결과에서 바로 만든다 (원문으로 LLM을 다시 호출하지 않음).
+        """
+        try:
+            # 전송하지 않거나 digest로 묶이는 경우 회의별 요약을 다듬을 필요 없음
+            refine = self.email_summary_refine and bool(self.email_service.webhook_url) and not self.email_service.digest_mode
+            summary = await self.agent_service.summarize_for_email(analysis, refine=refine, deadline=deadline)
+            return await self.email_service.send_email(analysis, notion_url, deadline=deadline, channel_id=channel_id,
+                                                       summary=summary)
+        except Exception as e:
+            logger.warning(f"Email failed (non-fatal): {e}")
+            return False, str(e)
+
+    def start(self):
+        """이벤트 루프 시작 후 호출: digest 모드면 이전 실행에서 남은 항목 포함 주기 전송 시작"""
+        self.email_service.start()
+
+    async def close(self):
+        """종료 시 호출: digest 모드에서 대기 중인 이메일 전송"""
+        await self.email_service.close()
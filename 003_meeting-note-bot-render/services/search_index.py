@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from config import get_settings
+from services.agent_service import MeetingAnalysis
+
+logger = logging.getLogger("SearchIndex")
+
+# 검색 대상 컬럼 (FTS5 컬럼 순서 = bm25 가중치 순서)
+INDEXED_COLUMNS = ["title", "meeting_date", "attendees", "summary", "discussions", "decisions", "action_items"]
+COLUMN_WEIGHTS = (10.0, 2.0, 3.0, 4.0, 1.0, 2.0, 2.0)
+
+# trigram 토크나이저는 3글자 미만 검색어를 MATCH로 찾을 수 없어 LIKE로 대체
+MIN_TRIGRAM_LENGTH = 3
+
+
+def analysis_to_document(analysis: MeetingAnalysis) -> dict:
+    """MeetingAnalysis → 검색 문서 (컬럼별 평문)"""
+    return {
+        "title": analysis.meeting_title,
+        "meeting_date": analysis.meeting_date,
+        "attendees": ", ".join(analysis.attendees),
+        "summary": "\n".join(analysis.executive_summary),
+        "discussions": "\n".join(f"{topic.topic_title}\n{topic.content}" for topic in analysis.discussions),
+        "decisions": "\n".join(analysis.decisions),
+        "action_items": "\n".join(f"{item.subject}: {item.action} ({item.due_date})" for item in analysis.action_items),
+    }
+
+
+class SearchIndex:
+    """
+    처리된 회의록의 로컬 전문 검색 인덱스 (SQLite FTS5).
+    한국어는 형태소 분리 없이도 부분 문자열로 찾을 수 있도록 trigram 토크나이저를 사용한다.
+    sqlite 호출은 짧지만 동기 I/O이므로 asyncio.to_thread로 이벤트 루프 밖에서 실행.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or get_settings().search_index_path
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS meetings (
+                page_id TEXT PRIMARY KEY,
+                database_id TEXT,
+                channel_id TEXT,
+                notion_url TEXT,
+                title TEXT,
+                meeting_date TEXT,
+                indexed_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_meetings_database ON meetings(database_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+                {", ".join(INDEXED_COLUMNS)}, page_id UNINDEXED, tokenize='trigram'
+            );
+        """)
+        self._conn.commit()
+        logger.info(f"Search index ready: {self.db_path}")
+
+    # --- Write ---
+
+    def _upsert_sync(self, page_id: str, database_id: str, channel_id: Optional[str], notion_url: str, document: dict):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meetings (page_id, database_id, channel_id, notion_url, title, meeting_date, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (page_id, database_id, channel_id, notion_url, document["title"], document["meeting_date"], datetime.now().isoformat()),
+            )
+            self._conn.execute("DELETE FROM meetings_fts WHERE page_id = ?", (page_id,))
+            self._conn.execute(
+                f"INSERT INTO meetings_fts ({', '.join(INDEXED_COLUMNS)}, page_id) VALUES ({', '.join('?' * (len(INDEXED_COLUMNS) + 1))})",
+                [document.get(column, "") for column in INDEXED_COLUMNS] + [page_id],
+            )
+
+    async def index_analysis(self, analysis: MeetingAnalysis, page_id: str, notion_url: str,
+                             database_id: str, channel_id: str = None):
+        """저장 직후 호출: 회의록 1건을 인덱스에 추가(같은 page_id면 갱신)"""
+        await asyncio.to_thread(self._upsert_sync, page_id, database_id, channel_id, notion_url, analysis_to_document(analysis))
+        logger.info(f"Indexed meeting: {analysis.meeting_title} ({page_id})")
+
+    async def index_document(self, document: dict, page_id: str, notion_url: str, database_id: str):
+        await asyncio.to_thread(self._upsert_sync, page_id, database_id, None, notion_url, document)
+
+    # --- Read ---
+
+    def _search_sync(self, query: str, database_id: Optional[str], limit: int) -> List[dict]:
+        terms = [term.replace('"', '') for term in query.split()]
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+
+        long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+        short_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+
+        where = []
+        params = []
+        if long_terms:
+            where.append("meetings_fts MATCH ?")
+            params.append(" AND ".join(f'"{term}"' for term in long_terms))
+        for term in short_terms:
+            where.append("(" + " OR ".join(f"f.{column} LIKE ?" for column in INDEXED_COLUMNS) + ")")
+            params.extend([f"%{term}%"] * len(INDEXED_COLUMNS))
+        if database_id:
+            where.append("m.database_id = ?")
+            params.append(database_id)
+
+        rank = f"bm25(meetings_fts, {', '.join(str(w) for w in COLUMN_WEIGHTS)})" if long_terms else "0"
+        sql = f"""
+            SELECT m.page_id, m.notion_url, m.title, m.meeting_date,
+                   snippet(meetings_fts, -1, '**', '**', '…', 12) AS snippet,
+                   {rank} AS score
+            FROM meetings_fts f JOIN meetings m ON m.page_id = f.page_id
+            WHERE {" AND ".join(where)}
+            ORDER BY score, m.meeting_date DESC
+            LIMIT ?
+        """
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {"page_id": r[0], "notion_url": r[1], "title": r[2], "meeting_date": r[3], "snippet": r[4], "score": r[5]}
+            for r in rows
+        ]
+
+    async def search(self, query: str, database_id: str = None, limit: int = 5) -> List[dict]:
+        started = time.perf_counter()
+        results = await asyncio.to_thread(self._search_sync, query, database_id, limit)
+        logger.info(f"Search '{query}': {len(results)} results in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return results
+
+    def count(self, database_id: str = None) -> int:
+        with self._lock:
+            if database_id:
+                return self._conn.execute("SELECT COUNT(*) FROM meetings WHERE database_id = ?", (database_id,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0]
+
+    # --- Backfill ---
+
+    async def backfill(self, notion_service, client, database_id: str, on_progress=None) -> int:
+        """
+        기존 Notion DB의 모든 회의록을 페이지네이션으로 읽어 인덱스를 재구성.
+        Notion rate limit(초당 약 3회)을 넘지 않도록 요청을 순차 실행한다.
+        """
+        indexed = 0
+        async for page in notion_service.iter_database_pages(client, database_id):
+            document = await notion_service.read_page_document(client, page)
+            await self.index_document(document, page["id"], page.get("url"), database_id)
+            indexed += 1
+            if on_progress and indexed % 10 == 0:
+                await on_progress(indexed)
+        logger.info(f"Backfill complete: {indexed} pages from database {database_id}")
+        return indexed
+
+
+# Singleton
+_search_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex()
+    return _search_index
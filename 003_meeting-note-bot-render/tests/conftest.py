@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+# Settings 필수 값: 테스트는 외부 API를 호출하지 않으므로 자리표시 값으로 충분
+for name in ("DISCORD_BOT_TOKEN", "NOTION_API_KEY", "NOTION_DATABASE_ID", "GOOGLE_API_KEY"):
+    os.environ.setdefault(name, "test")
+
+
+@pytest.fixture(autouse=True)
+def fresh_singletons(tmp_path, monkeypatch):
+    """테스트마다 이벤트 루프가 다르므로 asyncio 객체를 가진 singleton을 새로 만들고, 로컬 파일은 임시 경로 사용"""
+    import config
+    from utils import admission, cassette, digest_outbox, limiter
+
+    monkeypatch.setenv("SEARCH_INDEX_PATH", str(tmp_path / "meetings.db"))
+    monkeypatch.setenv("ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setenv("CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setenv("JOB_QUEUE_PATH", str(tmp_path / "jobs.db"))
+    monkeypatch.setenv("EMAIL_DIGEST_PATH", str(tmp_path / "digest.db"))
+    monkeypatch.setattr(config, "_settings", None)
+    monkeypatch.setattr(limiter, "_llm_limiter", None)
+    monkeypatch.setattr(admission, "_admission", None)
+    monkeypatch.setattr(cassette, "_cassette", None)
+    monkeypatch.setattr(digest_outbox, "_digest_outbox", None)
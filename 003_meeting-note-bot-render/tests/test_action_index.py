@@ -0,0 +1,33 @@
+import asyncio
+
+from services.action_index import ActionIndex
+from services.agent_service import ActionItem, MeetingAnalysis
+
+
+def _analysis(*subjects: str) -> MeetingAnalysis:
+    return MeetingAnalysis(
+        meeting_title="20260213_한전_AICC 킥오프 관련 회의", meeting_date="2026-02-13", attendees=[],
+        meeting_purpose="킥오프", executive_summary=[], discussions=[], key_risks=[], decisions=[],
+        action_items=[
+            ActionItem(subject=subject, action=f"{subject} 할 일", due_date="미정", purpose="-", risk="-")
+            for subject in subjects
+        ],
+    )
+
+
+def test_assignee_lookup_treats_like_wildcards_literally(tmp_path):
+    index = ActionIndex(str(tmp_path / "meetings.db"))
+
+    async def run():
+        await index.index_analysis(_analysis("dev_ops", "devXops", "김철수", "100%팀", "1000팀"), "page-1", "url", "db")
+        return (
+            await index.open_items("dev_ops"),
+            await index.open_items("100%"),
+            await index.open_items("철수"),
+        )
+
+    underscore, percent, subsequence = asyncio.run(run())
+
+    assert [item["assignee"] for item in underscore] == ["dev_ops"]
+    assert [item["assignee"] for item in percent] == ["100%팀"]
+    assert [item["assignee"] for item in subsequence] == ["김철수"]
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from utils.admission import AdmissionController, MEMORY_COPY_FACTOR
+
+MB = 1024 * 1024
+
+
+def _controller(budget_mb: int) -> AdmissionController:
+    return AdmissionController(budget_mb * MB, max_attachment_bytes=100 * MB, max_tokens=10 ** 9)
+
+
+def _size(memory_mb: int) -> int:
+    return memory_mb * MB // MEMORY_COPY_FACTOR
+
+
+def test_cancel_while_waiting_releases_queue_position():
+    async def scenario():
+        admission = _controller(10)
+        entered = asyncio.Event()
+        release = asyncio.Event()
+
+        async def hold(job_id, mb, on_wait=None):
+            async with admission.reserve(job_id, _size(mb), on_wait=on_wait):
+                entered.set()
+                await release.wait()
+
+        first = asyncio.create_task(hold("first", 8))
+        await entered.wait()
+        # 앞에서 대기하다 취소되는 작업 / 그 뒤에서 대기하는 작업
+        blocked = asyncio.create_task(hold("blocked", 8))
+        small = asyncio.create_task(hold("small", 1))
+        await asyncio.sleep(0)
+        assert admission.snapshot()["waiting"] == 2
+
+        blocked.cancel()
+        await asyncio.gather(blocked, return_exceptions=True)
+        # 취소된 대기자는 대기열에서 빠지고, 그 뒤의 작은 작업이 바로 예약됨
+        snapshot = admission.snapshot()
+        assert (snapshot["reserved_mb"], snapshot["waiting"]) == (9.0, 0)
+
+        release.set()
+        await asyncio.gather(first, small)
+        assert admission.snapshot()["reserved_mb"] == 0.0
+        assert admission.snapshot()["waiting"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_failing_on_wait_does_not_leak_reservation():
+    async def scenario():
+        admission = _controller(10)
+        release = asyncio.Event()
+
+        async def first():
+            async with admission.reserve("first", _size(8)):
+                await release.wait()
+
+        holder = asyncio.create_task(first())
+        await asyncio.sleep(0)
+
+        async def broken_notice():
+            raise RuntimeError("status message deleted")
+
+        try:
+            async with admission.reserve("second", _size(8), on_wait=broken_notice):
+                raise AssertionError("should not run")
+        except RuntimeError:
+            pass
+
+        release.set()
+        await holder
+        snapshot = admission.snapshot()
+        assert (snapshot["reserved_mb"], snapshot["waiting"]) == (0.0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_gateway_workers_split_memory_budget(monkeypatch):
+    import config
+
+    monkeypatch.setenv("MEMORY_BUDGET_MB", "200")
+    monkeypatch.setenv("PROCESS_MODE", "gateway")
+    monkeypatch.setenv("WORKER_PROCESSES", "4")
+    assert config.Settings().get_memory_budget_bytes() == 50 * MB
+
+    monkeypatch.setenv("PROCESS_MODE", "single")
+    assert config.Settings().get_memory_budget_bytes() == 200 * MB
+
+
+def test_worker_share_must_fit_largest_attachment(monkeypatch):
+    import config
+
+    monkeypatch.setenv("MEMORY_BUDGET_MB", "200")
+    monkeypatch.setenv("MAX_ATTACHMENT_MB", "5")
+    monkeypatch.setenv("PROCESS_MODE", "gateway")
+    monkeypatch.setenv("WORKER_PROCESSES", "32")
+    with pytest.raises(ValueError, match="WORKER_PROCESSES"):
+        config.Settings()
@@ -0,0 +1,178 @@
+import asyncio
+import json
+
+from services import agent_service
+from services.agent_service import AgentService
+from services.fake_llm import FakePrefixCachingChatModel
+
+ANALYSIS = {
+    "meeting_title": "20260213_한전_AICC 킥오프 관련 회의",
+    "meeting_date": "2026-02-13",
+    "attendees": ["김철수"],
+    "meeting_purpose": "AICC 킥오프",
+    "executive_summary": ["1차 구축 범위를 확정했다.", "3월 PoC 착수에 합의했다."],
+    "discussions": [{"topic_title": "구축 범위", "content": "상담 콜 자동화부터 시작한다."}],
+    "decision_structure": [],
+    "key_risks": ["예산 승인"],
+    "decisions": ["3월 PoC 착수"],
+    "action_items": [{"subject": "김철수", "action": "PoC 계획서 작성", "due_date": "2/20", "purpose": "착수", "risk": "없음"}],
+}
+
+
+def _fail_compile(*args, **kwargs):
+    raise AssertionError("chain compiled per call")
+
+
+def test_chains_compiled_once_and_system_prefix_cached(monkeypatch):
+    llm = FakePrefixCachingChatModel(responder=lambda messages: json.dumps(ANALYSIS, ensure_ascii=False))
+    agent = AgentService(llm=llm)
+    meeting_chain = agent.meeting_chain
+
+    monkeypatch.setattr(agent_service, "_compile_chain", _fail_compile)
+
+    async def run():
+        first = await agent.analyze_meeting("첫 번째 회의 원문", "[파일명 힌트: 한전]")
+        second = await agent.analyze_meeting("두 번째 회의 원문 (다른 내용)", "[파일명 힌트: 한전]")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert agent.meeting_chain is meeting_chain
+    assert first.meeting_title == second.meeting_title == ANALYSIS["meeting_title"]
+
+    # 첫 호출은 system 접두사를 처음 보므로 miss, 두 번째 호출은 같은 접두사라 hit
+    stats = agent.cache_stats.snapshot()
+    assert stats["calls"] == 2
+    assert stats["cache_hits"] == 1
+    assert 0 < stats["cached_tokens"] < stats["input_tokens"]
+    assert 0 < stats["token_hit_rate"] < 1
+
+
+def test_salvage_repairs_only_missing_fields_without_transcript(monkeypatch):
+    transcript = "원문에만 있는 문장 TRANSCRIPT-MARKER"
+    broken = dict(ANALYSIS, decisions="3월 PoC 착수")  # list 자리에 문자열
+    del broken["action_items"]
+    truncated = json.dumps(broken, ensure_ascii=False)[:-1] + ', "action_items": [{"subject": "김철수", "action": "PoC 계'
+    repair_requests = []
+
+    def responder(messages):
+        if "누락 항목 보완 요청" in messages[0].content:
+            repair_requests.append(messages[-1].content)
+            return json.dumps({key: ANALYSIS[key] for key in ("decisions", "action_items")}, ensure_ascii=False)
+        return truncated
+
+    agent = AgentService(llm=FakePrefixCachingChatModel(responder=responder))
+    repair_chain = agent.repair_chain
+    monkeypatch.setattr(agent_service, "_compile_chain", _fail_compile)
+
+    result = asyncio.run(agent.analyze_meeting(transcript, "[파일명 힌트: 한전]"))
+
+    assert result.decisions == ANALYSIS["decisions"]
+    assert result.action_items[0].action == "PoC 계획서 작성"
+    assert result.attendees == ANALYSIS["attendees"]  # 유효한 필드는 첫 응답 그대로
+    assert agent.repair_chain is repair_chain
+    assert len(repair_requests) == 1
+    request = repair_requests[0]
+    assert "TRANSCRIPT-MARKER" not in request
+    assert '"action_items": [{"subject": "김철수"' in request
+    assert "action_items" in request and "meeting_purpose" not in request.split("[출력 포맷]")[1]
+
+
+SECTION_GUIDES = {
+    "overview": agent_service.PROMPT_GUIDE_OVERVIEW,
+    "discussions": agent_service.PROMPT_GUIDE_DISCUSSIONS,
+    "decisions": agent_service.PROMPT_GUIDE_DECISIONS,
+    "action_items": agent_service.PROMPT_GUIDE_ACTIONS,
+}
+SECTION_FIELDS = {
+    "overview": ["meeting_title", "meeting_date", "attendees", "meeting_purpose", "executive_summary"],
+    "discussions": ["discussions"],
+    "decisions": ["decision_structure", "key_risks", "decisions"],
+    "action_items": ["action_items"],
+}
+CHECKED_TITLE = "20260213_한전_AICC 구축 범위 확정 관련 회의"
+
+
+def _section_of(messages) -> str:
+    system = messages[0].content
+    if "[제목 점검]" in system:
+        return "title_check"
+    return next(name for name, guide in SECTION_GUIDES.items() if guide in system)
+
+
+def _parallel_agent(monkeypatch, llm) -> AgentService:
+    monkeypatch.setenv("ANALYSIS_MODE", "parallel")
+    return AgentService(llm=llm)
+
+
+def _section_responder(calls, draft_title, title_response=None):
+    def responder(messages):
+        section = _section_of(messages)
+        calls.append(section)
+        if section == "title_check":
+            return title_response
+        values = {key: ANALYSIS[key] for key in SECTION_FIELDS[section]}
+        if section == "overview":
+            values["meeting_title"] = draft_title
+        return json.dumps(values, ensure_ascii=False)
+    return responder
+
+
+def test_parallel_sections_merged_and_title_regenerated(monkeypatch):
+    calls = []
+    responder = _section_responder(calls, "AICC 킥오프", json.dumps({"meeting_title": CHECKED_TITLE}, ensure_ascii=False))
+    agent = _parallel_agent(monkeypatch, FakePrefixCachingChatModel(responder=responder))
+
+    result = asyncio.run(agent.analyze_meeting("회의 원문", "[파일명 힌트: 한전]"))
+
+    assert sorted(calls[:4]) == sorted(SECTION_GUIDES) and calls[4:] == ["title_check"]
+    assert result.meeting_title == CHECKED_TITLE
+    assert result.discussions[0].topic_title == "구축 범위"
+    assert result.decisions == ANALYSIS["decisions"]
+    assert result.action_items[0].action == "PoC 계획서 작성"
+
+
+def test_parallel_title_check_failure_keeps_draft_title(monkeypatch):
+    calls = []
+    responder = _section_responder(calls, "[AICC 킥오프]", "제목을 만들 수 없습니다")
+    agent = _parallel_agent(monkeypatch, FakePrefixCachingChatModel(responder=responder))
+
+    result = asyncio.run(agent.analyze_meeting("회의 원문", "[파일명 힌트: 한전]"))
+
+    assert calls[-1] == "title_check"
+    assert result.meeting_title == "AICC 킥오프"  # 대괄호만 로컬 보정된 초안
+
+
+def test_parallel_section_failure_cancels_other_sections(monkeypatch):
+    started, cancelled, completed = [], [], []
+
+    class FailingSectionModel(FakePrefixCachingChatModel):
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            section = _section_of(messages)
+            if section == "discussions":
+                raise RuntimeError("section failed")
+            started.append(section)
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(section)
+                raise
+            completed.append(section)
+            return self._respond(messages)
+
+    agent = _parallel_agent(monkeypatch, FailingSectionModel())
+
+    async def run():
+        try:
+            await agent.analyze_meeting("회의 원문", "[파일명 힌트: 한전]")
+        except RuntimeError as e:
+            assert str(e) == "section failed"
+        else:
+            raise AssertionError("analysis should fail")
+        # 남은 섹션이 계속 돌고 있다면 이 시간 안에 끝남
+        await asyncio.sleep(1.5)
+
+    asyncio.run(run())
+    # 이미 LLM을 호출 중이던 섹션은 취소되고, 동시성 슬롯을 기다리던 섹션은 호출 전에 취소됨
+    assert started and sorted(cancelled) == sorted(started)
+    assert completed == []
@@ -0,0 +1,28 @@
+import os
+
+from services.artifact_store import ArtifactStore
+
+
+def test_size_eviction_keeps_the_job_being_archived(tmp_path):
+    store = ArtifactStore(str(tmp_path), retention_days=0, max_bytes=1)
+    store._archive_sync("old", {"transcript": os.urandom(2048)}, {"title": "old"})
+    store._archive_sync("new", {"transcript": os.urandom(4096)}, {"title": "new"})
+
+    # 한도를 넘어도 방금 보관한 작업은 남고, 이전 작업과 그 blob만 정리
+    assert store._read_sync("new", "transcript") is not None
+    assert store._read_sync("old", "transcript") is None
+    assert store.snapshot()["jobs"] == 1
+
+
+def test_blob_evicted_by_another_process_is_written_again(tmp_path):
+    # gateway worker 두 개가 같은 디렉터리를 쓰는 상황: 한쪽이 정리한 blob을 다른 쪽이 다시 참조
+    first = ArtifactStore(str(tmp_path), retention_days=0, max_bytes=0)
+    second = ArtifactStore(str(tmp_path), retention_days=0, max_bytes=0)
+    first._archive_sync("a", {"transcript": "같은 회의록"}, {})
+    with first._transaction():
+        first._conn.execute("DELETE FROM jobs WHERE job_id = 'a'")
+    first._evict_sync()
+
+    second._archive_sync("b", {"transcript": "같은 회의록"}, {})
+    first._evict_sync()
+    assert second._read_sync("b", "transcript") == "같은 회의록".encode("utf-8")
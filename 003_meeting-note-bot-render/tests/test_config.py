@@ -0,0 +1,15 @@
+import config
+from utils.scheduler import FairScheduler
+
+
+def test_bad_channel_weights_are_skipped(monkeypatch):
+    monkeypatch.setenv("CHANNEL_WEIGHTS", '{"123": "high", "456": 2, "789": -1, "999": null}')
+    weights = config.Settings().get_channel_weights()
+    assert weights == {"456": 2.0}
+    # 잘못된 값이 있어도 스케줄러는 그대로 생성됨
+    assert FairScheduler(weights=weights).weights == {"456": 2.0}
+
+
+def test_channel_weights_must_be_an_object(monkeypatch):
+    monkeypatch.setenv("CHANNEL_WEIGHTS", "[1, 2]")
+    assert config.Settings().get_channel_weights() == {}
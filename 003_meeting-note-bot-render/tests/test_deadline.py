@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from utils.deadline import Deadline
+from utils.exceptions import DeadlineExceeded
+
+
+def test_stage_budget_overrun_becomes_deadline_exceeded():
+    async def run():
+        async with Deadline(10, {"notion": 0.01}).stage("notion"):
+            await asyncio.sleep(1)
+
+    with pytest.raises(DeadlineExceeded) as info:
+        asyncio.run(run())
+    assert info.value.stage == "notion"
+
+
+def test_transport_timeout_inside_stage_is_not_a_budget_overrun():
+    async def run():
+        async with Deadline(10).stage("notion"):
+            raise TimeoutError("socket read timed out")
+
+    with pytest.raises(TimeoutError, match="socket read timed out"):
+        asyncio.run(run())
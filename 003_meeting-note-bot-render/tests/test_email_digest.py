@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from services.agent_service import MeetingAnalysis
+from services.email_service import EmailService
+
+
+def _analysis(title: str) -> MeetingAnalysis:
+    return MeetingAnalysis(
+        meeting_title=title, meeting_date="2026-02-13", attendees=["김철수"], meeting_purpose="킥오프",
+        executive_summary=["요약"], discussions=[], key_risks=[], decisions=[], action_items=[],
+    )
+
+
+@pytest.fixture
+def digest_env(monkeypatch):
+    monkeypatch.setenv("MAKE_WEBHOOK_URL", "http://webhook.invalid")
+    monkeypatch.setenv("EMAIL_DIGEST_MODE", "true")
+    monkeypatch.setenv("EMAIL_DIGEST_MAX_ITEMS", "100")
+
+
+def _service(responses: list, sent: list) -> EmailService:
+    service = EmailService()
+
+    async def post(payload):
+        sent.append(payload)
+        return responses.pop(0)
+
+    service._post = post
+    return service
+
+
+def test_failed_flush_keeps_items_until_sent(digest_env):
+    async def scenario():
+        sent = []
+        service = _service([(False, "Make.com returned status 500"), (True, "ok")], sent)
+        await service.send_email(_analysis("회의 A"), channel_id="1")
+
+        assert (await service.flush("1"))[0] is False
+        assert service.outbox.snapshot()["1"]["pending"] == 1
+
+        # 실패한 항목은 window 동안 다시 보내지 않음 → 재시도 시점으로 당겨서 확인
+        await asyncio.to_thread(service.outbox._execute, "UPDATE digest_items SET available_at = 0")
+        assert (await service.flush("1"))[0] is True
+        assert service.outbox.snapshot() == {}
+        assert [payload["titles"] for payload in sent] == [["회의 A"], ["회의 A"]]
+
+    asyncio.run(scenario())
+
+
+def test_items_from_separate_services_share_one_digest(digest_env):
+    async def scenario():
+        sent = []
+        first, second = _service([], sent), _service([(True, "ok")], sent)
+        await first.send_email(_analysis("회의 A"), channel_id="1")
+        await second.send_email(_analysis("회의 B"), channel_id="1")
+
+        await second.close()
+        await first.close()
+        assert len(sent) == 1
+        assert sent[0]["titles"] == ["회의 A", "회의 B"]
+
+    asyncio.run(scenario())
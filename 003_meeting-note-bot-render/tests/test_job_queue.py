@@ -0,0 +1,47 @@
+import asyncio
+
+from utils import job_queue
+from utils.job_queue import JobQueue
+
+
+def _state(job_id: str) -> dict:
+    return {"job_id": job_id, "channel_id": 1, "filename": f"{job_id}.txt", "stage": None}
+
+
+def _expire_heartbeats(queue: JobQueue):
+    queue._execute("UPDATE jobs SET heartbeat_at = 0 WHERE status = 'running'")
+
+
+def test_stale_reclaim_stops_after_max_attempts(tmp_path):
+    async def scenario():
+        queue = JobQueue(str(tmp_path / "jobs.db"))
+        await queue.enqueue(_state("crashy"))
+
+        # 작업을 꺼낸 워커가 매번 죽음 → 한도까지만 다시 꺼내지고 그 뒤에는 failed
+        for _ in range(job_queue.MAX_ATTEMPTS):
+            assert await queue.claim("w") is not None
+            _expire_heartbeats(queue)
+        assert await queue.claim("w") is None
+
+        recent = queue.list_jobs()["recent"]
+        assert [(job["job_id"], job["status"]) for job in recent] == [("crashy", "failed")]
+        assert recent[0]["error"] == "worker stopped responding"
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_keep_only_summary_state(tmp_path):
+    async def scenario():
+        queue = JobQueue(str(tmp_path / "jobs.db"))
+        state = {**_state("big"), "transcript": "가" * 10000, "stage": "notion", "timings": {"analyze": 1.5}}
+        await queue.enqueue(state)
+        row_id, claimed = await queue.claim("w")
+        assert claimed["transcript"] == state["transcript"]
+
+        await queue.complete(row_id)
+        stored = queue._execute("SELECT state FROM jobs WHERE id = ?", (row_id,))[0][0]
+        assert "transcript" not in stored
+        job = queue.list_jobs()["recent"][0]
+        assert (job["filename"], job["last_completed_stage"], job["timings"]) == ("big.txt", "notion", {"analyze": 1.5})
+
+    asyncio.run(scenario())
@@ -0,0 +1,11 @@
+import json
+import logging
+
+from utils.logger import JsonFormatter
+
+
+def test_json_formatter_accepts_non_str_keys_in_extra_data():
+    record = logging.LogRecord("Test", logging.INFO, __file__, 1, "queued", None, None)
+    record.extra_data = {1234567890: {"pending": 2}, "big": 2 ** 70}
+    data = json.loads(JsonFormatter().format(record))
+    assert data["extra"] == {"1234567890": {"pending": 2}, "big": 2 ** 70}
@@ -0,0 +1,128 @@
+import asyncio
+import copy
+from types import SimpleNamespace
+
+from services.agent_service import MeetingAnalysis
+from services.meeting_job import MeetingJob
+from services.notion_service import SavedPage
+
+ANALYSIS = MeetingAnalysis(
+    meeting_title="주간 회의", meeting_date="2026-02-13", attendees=["김철수"], meeting_purpose="진행 점검",
+    executive_summary=["요약"], discussions=[], key_risks=[], decisions=[], action_items=[],
+)
+
+
+class FakePipeline:
+    """analyze / save / notify 호출 기록. save는 배치 2개를 쓴 것처럼 on_progress를 부름."""
+
+    def __init__(self):
+        self.calls = []
+        self.email_service = SimpleNamespace(digest_mode=False)
+
+    async def analyze(self, content, filename, user_text, **kwargs):
+        self.calls.append("analyze")
+        return ANALYSIS
+
+    async def save(self, analysis, channel_id, progress=None, on_progress=None, **kwargs):
+        self.calls.append("save")
+        await on_progress({"page_id": "page-1", "url": "https://notion.so/page-1", "batches": 1})
+        await on_progress({"page_id": "page-1", "url": "https://notion.so/page-1", "batches": 2})
+        return SavedPage("page-1", "https://notion.so/page-1", "db")
+
+    async def notify(self, analysis, notion_url, **kwargs):
+        self.calls.append("notify")
+        return True, "Email triggered via Make.com"
+
+
+class RecordingStore:
+    def __init__(self):
+        self.saved = []
+        self.removed = []
+
+    async def save(self, job_id, state):
+        self.saved.append(copy.deepcopy(state))
+
+    def remove(self, job_id):
+        self.removed.append(job_id)
+
+
+class FakeMessage:
+    def __init__(self):
+        self.id = 1
+        self.content = ""
+        self.channel = SimpleNamespace(id=100)
+        self.reactions = []
+        self.edits = []
+
+    async def add_reaction(self, emoji):
+        self.reactions.append(emoji)
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+
+
+def _state(**extra) -> dict:
+    return {"job_id": "job-1", "channel_id": 100, "filename": "meeting.txt", "stage": "queued", "size": 10, **extra}
+
+
+def _run(pipeline, state, store):
+    job = MeetingJob(pipeline, job_deadline_seconds=60)
+    message = FakeMessage()
+    return asyncio.run(job.run(message, None, message, state, store))
+
+
+def test_transcript_dropped_from_checkpoints_after_analysis():
+    pipeline, store = FakePipeline(), RecordingStore()
+    assert _run(pipeline, _state(content="원문 " * 1000, user_prompt=None), store)
+
+    after_analysis = [saved for saved in store.saved if "analysis" in saved]
+    assert after_analysis and all("content" not in saved for saved in after_analysis)
+    # Notion 배치마다 저장되는 checkpoint도 원문 없이
+    assert [saved["notion_progress"]["batches"] for saved in store.saved if "notion_progress" in saved] == [1, 2]
+
+
+def test_resume_after_analysis_does_not_need_transcript():
+    pipeline, store = FakePipeline(), RecordingStore()
+    assert _run(pipeline, _state(stage="analysis", analysis=ANALYSIS.model_dump(), user_prompt=None), store)
+    assert pipeline.calls == ["save", "notify"]
+
+
+def test_resume_after_email_does_not_send_again():
+    pipeline, store = FakePipeline(), RecordingStore()
+    assert _run(pipeline, _state(content="원문", user_prompt=None), store)
+    assert store.saved[-1]["stage"] == "email"
+
+    # notify 이후 완료 처리 전에 중단 → 마지막 checkpoint로 재개
+    resumed = FakePipeline()
+    assert _run(resumed, store.saved[-1], RecordingStore())
+    assert resumed.calls == []
+
+
+def test_requested_cancel_during_notion_archives_partial_page():
+    class StuckNotionPipeline(FakePipeline):
+        def __init__(self):
+            super().__init__()
+            self.discarded = []
+            self.notion_service = SimpleNamespace(discard_incomplete=self._discard)
+
+        async def _discard(self, channel_id, progress):
+            self.discarded.append((channel_id, progress["page_id"]))
+
+        async def save(self, analysis, channel_id, progress=None, on_progress=None, **kwargs):
+            await on_progress({"page_id": "page-1", "url": "https://notion.so/page-1", "batches": 1})
+            await asyncio.sleep(30)  # 두 번째 배치 추가 중 취소 요청
+
+    async def scenario():
+        pipeline, store = StuckNotionPipeline(), RecordingStore()
+        job = MeetingJob(pipeline, job_deadline_seconds=60)
+        message = FakeMessage()
+        state = _state(stage="analysis", analysis=ANALYSIS.model_dump(), user_prompt=None)
+        running = asyncio.create_task(job.run(message, None, message, state, store))
+        while not store.saved:
+            await asyncio.sleep(0.01)
+        job.registry.cancel("job-1")
+        assert await running is False
+        assert pipeline.discarded == [("100", "page-1")]
+        assert store.removed == ["job-1"]
+
+    asyncio.run(scenario())
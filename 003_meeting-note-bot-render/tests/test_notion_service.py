@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from services.agent_service import MeetingAnalysis
+from services.notion_service import NotionService
+
+
+def _analysis(lines: int) -> MeetingAnalysis:
+    return MeetingAnalysis(
+        meeting_title="20260213_한전_AICC 킥오프 관련 회의", meeting_date="2026-02-13", attendees=["김철수"],
+        meeting_purpose="킥오프", executive_summary=[f"요약 {i}" for i in range(lines)], discussions=[],
+        key_risks=[], decisions=[], action_items=[],
+    )
+
+
+class FakeNotion:
+    """pages.create / blocks.children.append / pages.update 호출 기록, fail_on_append번째 추가에서 예외"""
+
+    def __init__(self, fail_on_append=None, exc=RuntimeError("notion 502")):
+        self.created, self.appended, self.archived = 0, [], []
+        self.fail_on_append = fail_on_append
+        self.exc = exc
+        self.pages = self
+        self.blocks = self
+        self.children = self
+
+    async def create(self, parent, properties, children):
+        self.created += 1
+        return {"id": "page-1", "url": "https://notion.so/page-1"}
+
+    async def append(self, block_id, children):
+        if len(self.appended) + 1 == self.fail_on_append:
+            self.fail_on_append = None
+            raise self.exc
+        self.appended.append(len(children))
+
+    async def update(self, page_id, archived):
+        self.archived.append(page_id)
+
+
+def _service(client) -> NotionService:
+    service = NotionService()
+    service.default_client = client
+    service.default_page_id = "db"
+    return service
+
+
+def test_interrupted_page_write_resumes_on_same_page():
+    client = FakeNotion(fail_on_append=2, exc=asyncio.CancelledError())
+    service = _service(client)
+    analysis = _analysis(250)  # 3개 배치
+    saved = []
+
+    async def on_progress(progress):
+        saved.append(progress)
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(service.save_meeting(analysis, on_progress=on_progress))
+    assert saved[-1] == {"page_id": "page-1", "url": "https://notion.so/page-1", "batches": 2}
+
+    page = asyncio.run(service.save_meeting(analysis, progress=saved[-1], on_progress=on_progress))
+
+    assert page.page_id == "page-1"
+    assert client.created == 1
+    assert len(client.appended) == 2
+    assert saved[-1]["batches"] == 3
+    assert client.archived == []
+
+
+def test_failed_page_write_archives_incomplete_page():
+    client = FakeNotion(fail_on_append=1)
+    service = _service(client)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.save_meeting(_analysis(250)))
+
+    assert client.archived == ["page-1"]
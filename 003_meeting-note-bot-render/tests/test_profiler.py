@@ -0,0 +1,27 @@
+import asyncio
+import threading
+
+from utils.profiler import Profiler
+
+
+def test_memory_snapshot_runs_off_the_event_loop():
+    async def scenario():
+        profiler = Profiler()
+        loop_thread = threading.get_ident()
+        threads = []
+        original = profiler._memory_snapshot_locked
+
+        def record(*args):
+            threads.append(threading.get_ident())
+            return original(*args)
+
+        profiler._memory_snapshot_locked = record
+        try:
+            assert (await profiler.memory_snapshot())["started"]
+            result = await profiler.memory_snapshot(limit=5)
+            assert "diff_since_last" in result and len(result["top"]) <= 5
+        finally:
+            await asyncio.to_thread(profiler.stop_memory)
+        assert threads and loop_thread not in threads
+
+    asyncio.run(scenario())
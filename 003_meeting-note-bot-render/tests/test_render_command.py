@@ -0,0 +1,51 @@
+import asyncio
+from types import SimpleNamespace
+
+from cogs.meeting_bot import MeetingBotCog
+from services.agent_service import MeetingAnalysis
+from services.artifact_store import ArtifactStore, KIND_ANALYSIS
+
+PAGE_ID = "0123456789abcdef0123456789abcdef"
+
+
+class FakeContext:
+    def __init__(self, channel_id: int):
+        self.channel = SimpleNamespace(id=channel_id)
+        self.message = SimpleNamespace(reference=None)
+        self.replies = []
+
+    async def reply(self, content, file=None):
+        self.replies.append((content, file))
+
+
+def _cog(tmp_path) -> MeetingBotCog:
+    store = ArtifactStore(str(tmp_path / "artifacts"), retention_days=0, max_bytes=0)
+    analysis = MeetingAnalysis(
+        meeting_title="인사팀 보상 회의", meeting_date="2026-02-13", attendees=["김철수"], meeting_purpose="보상",
+        executive_summary=["요약"], discussions=[], key_risks=[], decisions=[], action_items=[],
+    )
+    store._archive_sync("job-1", {KIND_ANALYSIS: analysis.model_dump()},
+                        {"message_id": "555", "channel_id": "100", "title": analysis.meeting_title})
+    store._link_page_sync("job-1", PAGE_ID, f"https://notion.so/{PAGE_ID}")
+
+    cog = MeetingBotCog.__new__(MeetingBotCog)
+    cog.artifact_store = store
+    return cog
+
+
+def _render(cog, ctx, target):
+    asyncio.run(MeetingBotCog.render.callback(cog, ctx, target=target))
+    return ctx.replies[-1]
+
+
+def test_render_refuses_job_archived_from_another_channel(tmp_path):
+    cog = _cog(tmp_path)
+    for target in ("555", f"https://www.notion.so/team/{PAGE_ID}"):
+        content, file = _render(cog, FakeContext(channel_id=200), target)
+        assert file is None and content.startswith("❌")
+
+
+def test_render_in_upload_channel(tmp_path):
+    cog = _cog(tmp_path)
+    content, file = _render(cog, FakeContext(channel_id=100), "555")
+    assert file is not None and "인사팀 보상 회의" in content
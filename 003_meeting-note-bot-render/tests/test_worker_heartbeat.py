@@ -0,0 +1,55 @@
+import asyncio
+import sqlite3
+
+import worker
+from worker import Worker
+
+
+class LockedQueue:
+    """heartbeat가 계속 "database is locked"로 실패하는 큐"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def heartbeat(self, row_id):
+        raise sqlite3.OperationalError("database is locked")
+
+    def __getattr__(self, name):
+        async def record(*args, **kwargs):
+            self.calls.append(name)
+        return record
+
+
+class SlowJob:
+    def __init__(self):
+        self.cancelled = False
+
+    async def run(self, message, attachment, status_msg, state, store):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return True
+
+
+def test_lost_heartbeat_stops_job_without_touching_queue_row(monkeypatch):
+    monkeypatch.setattr(worker, "HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(worker, "HEARTBEAT_GIVE_UP_SECONDS", 0.05)
+
+    async def scenario():
+        w = Worker.__new__(Worker)
+        w.name = "test"
+        w.queue = LockedQueue()
+        w.job = SlowJob()
+
+        async def load_messages(state):
+            return None, None, None
+
+        w._load_messages = load_messages
+        # 작업이 멈추고 _run_one은 예외 없이 끝남 (worker loop 유지), 행은 다른 worker가 stale로 회수
+        await asyncio.wait_for(w._run_one(1, {"job_id": "j", "stage": None}), timeout=5)
+        assert w.job.cancelled
+        assert w.queue.calls == []
+
+    asyncio.run(scenario())
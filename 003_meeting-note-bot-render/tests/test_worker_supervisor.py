@@ -0,0 +1,36 @@
+import asyncio
+
+import main
+
+
+def test_supervisor_restarts_crashed_worker(tmp_path, monkeypatch):
+    # 처음 두 번은 비정상 종료, 세 번째는 계속 실행되는 worker
+    counter = tmp_path / "starts"
+    script = tmp_path / "worker.py"
+    script.write_text(
+        "import pathlib, sys, time\n"
+        f"path = pathlib.Path({str(counter)!r})\n"
+        "starts = int(path.read_text()) + 1 if path.exists() else 1\n"
+        "path.write_text(str(starts))\n"
+        "if starts < 3:\n"
+        "    sys.exit(1)\n"
+        "time.sleep(30)\n"
+    )
+    monkeypatch.setattr(main, "WORKER_PATH", str(script))
+    monkeypatch.setattr(main, "WORKER_RESTART_MIN_SECONDS", 0.05)
+
+    async def scenario():
+        supervisor = main.WorkerSupervisor(1)
+        supervisor.start()
+        for _ in range(100):
+            if counter.exists() and counter.read_text() == "3":
+                break
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.2)
+        assert supervisor.restarts == 2
+        assert supervisor.processes[0].returncode is None
+
+        await supervisor.stop(timeout=5)
+        assert supervisor.processes[0].returncode is not None
+
+    asyncio.run(scenario())
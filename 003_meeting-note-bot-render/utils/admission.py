@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import resource
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from config import get_settings
+
+logger = logging.getLogger("Admission")
+
+# transcript 1바이트가 처리 중 차지하는 메모리 추정 배수:
+# 저장 파일 읽기 + str(한글은 UCS-2/4) + 렌더링된 프롬프트 + LLM 클라이언트의 요청 본문/메시지 복사본
+MEMORY_COPY_FACTOR = 8
+# UTF-8 한국어 회의록 기준 대략적인 토큰당 바이트 수 (한글 1자 = 3바이트 ≈ 1토큰)
+BYTES_PER_TOKEN = 3
+RSS_SAMPLE_INTERVAL = 0.5
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int:
+    """현재 프로세스 RSS (bytes). /proc이 없으면 최대 RSS로 대체."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class AdmissionRejected(Exception):
+    """예산을 넘어 처리할 수 없는 첨부파일 (사용자에게 그대로 안내할 메시지)"""
+    pass
+
+
+class AdmissionController:
+    """
+    다운로드 전 첨부파일 크기로 메모리/토큰 사용량을 추정해 작업 수용 여부를 결정.
+    - check(): 크기/토큰 한도 또는 전체 예산을 넘으면 AdmissionRejected (대기해도 처리 불가)
+    - reserve(): 전체 메모리 예산 안에서 예약, 여유가 없으면 도착 순서대로 대기(defer), 끝나면 반환
+    작업 중 프로세스 RSS를 샘플링해 작업 기간의 최대 증가량을 기록하므로 MEMORY_COPY_FACTOR 보정에 쓸 수 있다.
+    (프로세스 단위 값이라 동시에 실행된 다른 작업의 사용량도 포함됨 → 단독 실행 때의 값으로 보정)
+    """
+
+    def __init__(self, memory_budget_bytes: int, max_attachment_bytes: int, max_tokens: int):
+        self.memory_budget = memory_budget_bytes
+        self.max_attachment_bytes = max_attachment_bytes
+        self.max_tokens = max_tokens
+        self._reserved = 0
+        self._waiters = deque()  # (cost, future) 도착 순서
+        self._rejected = 0
+        self._deferred = 0
+        self._peak_rss = 0
+        self._recent = deque(maxlen=20)
+
+    @staticmethod
+    def estimate(size: int) -> tuple:
+        """(예상 메모리 bytes, 예상 토큰 수)"""
+        return size * MEMORY_COPY_FACTOR, size // BYTES_PER_TOKEN
+
+    def check(self, size: int):
+        memory, tokens = self.estimate(size)
+        if size > self.max_attachment_bytes:
+            reason = f"파일이 너무 큽니다 ({size / 1024 / 1024:.1f}MB, 최대 {self.max_attachment_bytes / 1024 / 1024:.1f}MB)"
+        elif tokens > self.max_tokens:
+            reason = f"회의록이 너무 깁니다 (약 {tokens:,} 토큰, 최대 {self.max_tokens:,} 토큰)"
+        elif memory > self.memory_budget:
+            reason = f"처리에 필요한 메모리(약 {memory / 1024 / 1024:.0f}MB)가 예산({self.memory_budget / 1024 / 1024:.0f}MB)을 넘습니다"
+        else:
+            return
+        self._rejected += 1
+        logger.warning(f"Admission rejected: size={size}, tokens~{tokens}, memory~{memory}: {reason}")
+        raise AdmissionRejected(reason)
+
+    def _grant_waiters(self):
+        # 선두 대기자부터 순서대로: 큰 작업이 작은 작업들에 계속 밀리지 않도록 head-of-line에서 멈춘다
+        while self._waiters:
+            cost, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if self._reserved + cost > self.memory_budget:
+                return
+            self._waiters.popleft()
+            self._reserved += cost
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def reserve(self, job_id: str, size: int, on_wait=None):
+        """
+        예산 예약 후 작업 실행, 종료(성공/실패/취소) 시 반환.
+        on_wait: 대기가 필요할 때 한 번 호출되는 코루틴 함수 (상태 메시지 안내용)
+        """
+        self.check(size)
+        cost, _ = self.estimate(size)
+
+        if self._waiters or self._reserved + cost > self.memory_budget:
+            self._deferred += 1
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((cost, future))
+            logger.info(f"Admission deferred: job={job_id}, cost={cost}, reserved={self._reserved}/{self.memory_budget}")
+            try:
+                if on_wait is not None:
+                    await on_wait()
+                await future
+            except BaseException:
+                # 대기 안내 실패 / 대기 중 취소: 이미 예약됐으면 반환, 아니면 대기열에서 빠지고 뒤 대기자를 진행
+                if future.done() and not future.cancelled():
+                    self._reserved -= cost
+                else:
+                    future.cancel()
+                self._grant_waiters()
+                raise
+        else:
+            self._reserved += cost
+
+        start_rss = current_rss()
+        peak = {"rss": start_rss}
+
+        async def sample():
+            while True:
+                await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+                peak["rss"] = max(peak["rss"], current_rss())
+
+        sampler = asyncio.create_task(sample())
+        try:
+            yield
+        finally:
+            sampler.cancel()
+            peak["rss"] = max(peak["rss"], current_rss())
+            self._peak_rss = max(self._peak_rss, peak["rss"])
+            self._recent.append({
+                "job_id": job_id,
+                "size_kb": round(size / 1024, 1),
+                "estimated_mb": round(cost / 1024 / 1024, 1),
+                "process_rss_delta_mb": round((peak["rss"] - start_rss) / 1024 / 1024, 1),
+            })
+            self._reserved -= cost
+            self._grant_waiters()
+
+    def snapshot(self) -> dict:
+        return {
+            "memory_budget_mb": round(self.memory_budget / 1024 / 1024, 1),
+            "reserved_mb": round(self._reserved / 1024 / 1024, 1),
+            "waiting": sum(1 for _, future in self._waiters if not future.done()),
+            "rejected": self._rejected,
+            "deferred": self._deferred,
+            "rss_mb": round(current_rss() / 1024 / 1024, 1),
+            "peak_rss_mb": round(self._peak_rss / 1024 / 1024, 1),
+            "recent_jobs": list(self._recent),
+        }
+
+
+# Singleton
+_admission: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    global _admission
+    if _admission is None:
+        settings = get_settings()
+        _admission = AdmissionController(
+            memory_budget_bytes=settings.get_memory_budget_bytes(),
+            max_attachment_bytes=int(settings.max_attachment_mb * 1024 * 1024),
+            max_tokens=settings.max_transcript_tokens,
+        )
+    return _admission
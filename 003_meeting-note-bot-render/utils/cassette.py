@@ -0,0 +1,239 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, List, Optional
+
+from config import get_settings
+
+logger = logging.getLogger("Cassette")
+
+CASSETTE_VERSION = 1
+REDACTED = "[REDACTED]"
+# 요청 안의 긴 문자열(회의록 원문 등)은 해시로 대체해 cassette를 작게 유지 (원문은 input 레코드에 1회만 저장)
+COMPACT_STRING_CHARS = 512
+_SECRET_KEY = re.compile(r"(^|_)(api_key|token|secret|password|authorization|auth)$", re.IGNORECASE)
+_ID_IN_PATH = re.compile(r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}", re.IGNORECASE)
+
+
+class CassetteMiss(Exception):
+    """replay 중 기록에 없는 요청 (코드 변경으로 호출 순서/내용이 달라진 경우)"""
+    pass
+
+
+class ReplayedError(Exception):
+    """기록 당시 발생한 예외를 재현. 원래 타입 이름을 메시지에 포함해 is_overload_error 판별도 동일하게 동작"""
+    pass
+
+
+def normalize_path(path: str) -> str:
+    """Notion API 경로의 ID를 지워 같은 종류의 요청끼리 묶는다 (blocks/<id>/children → blocks/:id/children)"""
+    return _ID_IN_PATH.sub(":id", path)
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    외부 호출(LLM 체인, Notion API, Make.com 웹훅)의 요청/응답/지연 시간을 gzip JSONL 파일로 기록하고 재생.
+    - record: 실제 호출을 수행하면서 결과와 지연 시간을 기록 (비밀 값은 기록 전에 제거)
+    - replay: 네트워크 없이 기록된 응답을 돌려주며, 기록된 지연 시간 × time_scale만큼 기다린다
+    - off: 그대로 통과
+    재생 시 요청 내용이 같은 기록을 우선 사용하고, 없으면 같은 종류(kind + op)의 다음 기록으로 대체한다.
+    """
+
+    def __init__(self, path: str, mode: str = "off", time_scale: float = 1.0, secrets: List[str] = ()):
+        if mode not in ("off", "record", "replay"):
+            raise ValueError(f"Invalid CASSETTE_MODE: {mode}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = time_scale
+        # 긴 값부터 치환해야 URL 안의 토큰 같은 부분 문자열이 먼저 지워지지 않음
+        self._secrets = sorted({s for s in secrets if s and len(s) >= 8}, key=len, reverse=True)
+        self._write_lock = threading.Lock()
+        self._started = time.monotonic()
+        self._inputs: List[dict] = []
+        self._by_key = defaultdict(deque)
+        self._by_op = defaultdict(deque)
+        self.stats = {"recorded": 0, "replayed": 0, "fallbacks": 0, "misses": 0}
+
+        if mode == "record":
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._append_sync({"type": "header", "version": CASSETTE_VERSION, "created_at": datetime.now().isoformat()})
+            logger.info(f"Recording external calls to {self.path}")
+        elif mode == "replay":
+            self._load()
+            logger.info(f"Replaying {sum(len(q) for q in self._by_op.values())} interactions from {self.path} (time_scale={time_scale})")
+
+    # --- Redaction / keys ---
+
+    def redact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: REDACTED if isinstance(k, str) and _SECRET_KEY.search(k) else self.redact(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.redact(v) for v in value]
+        if isinstance(value, str):
+            for secret in self._secrets:
+                value = value.replace(secret, REDACTED)
+        return value
+
+    def _compact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: self._compact(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._compact(v) for v in value]
+        if isinstance(value, str) and len(value) > COMPACT_STRING_CHARS:
+            return {"sha256": _digest(value), "chars": len(value)}
+        return value
+
+    # --- File I/O ---
+
+    def _append_sync(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._write_lock:
+            # 레코드마다 gzip member를 이어 붙임 (gzip.open으로 한 번에 읽힘)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(line)
+
+    async def _append_async(self, record: dict):
+        await asyncio.to_thread(self._append_sync, record)
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 중 강제 종료로 잘린 줄
+                if record.get("type") == "input":
+                    self._inputs.append(record)
+                elif record.get("type") == "interaction":
+                    record["used"] = False
+                    self._by_key[record["key"]].append(record)
+                    self._by_op[(record["kind"], record["op"])].append(record)
+
+    def inputs(self) -> List[dict]:
+        """기록된 작업 입력 (replay 실행기가 같은 작업을 다시 돌릴 때 사용)"""
+        return list(self._inputs)
+
+    # --- Record / replay ---
+
+    async def record_input(self, filename: str, content: str, user_text: Optional[str] = None):
+        """작업 입력(회의록 원문) 기록: replay 시 같은 입력으로 파이프라인을 다시 실행하기 위함"""
+        if self.mode != "record":
+            return
+        await self._append_async(self.redact({
+            "type": "input",
+            "offset": round(time.monotonic() - self._started, 3),
+            "filename": filename,
+            "user_text": user_text,
+            "content": content,
+        }))
+
+    def _take(self, kind: str, op: str, key: str) -> Optional[dict]:
+        for queue, fallback in ((self._by_key[key], False), (self._by_op[(kind, op)], True)):
+            while queue and queue[0]["used"]:
+                queue.popleft()
+            if queue:
+                interaction = queue.popleft()
+                interaction["used"] = True
+                if fallback:
+                    self.stats["fallbacks"] += 1
+                return interaction
+        return None
+
+    async def call(self, kind: str, op: str, request: dict, func: Callable[[], Awaitable[Any]],
+                   encode: Callable[[Any], Any] = None, decode: Callable[[Any], Any] = None) -> Any:
+        """
+        외부 호출 1건을 감싼다.
+        kind: llm | notion | webhook, op: 같은 종류의 요청을 묶는 이름 (체인 이름, "POST pages" 등)
+        func: 실제 호출을 수행하는 인자 없는 코루틴 함수 (record/off 모드에서만 실행)
+        encode/decode: 응답 ↔ JSON 변환 (기본: 그대로)
+        """
+        if self.mode == "off":
+            return await func()
+
+        compact_request = self._compact(self.redact(request))
+        key = _digest(json.dumps([kind, op, compact_request], ensure_ascii=False, sort_keys=True, default=str))
+
+        if self.mode == "replay":
+            interaction = self._take(kind, op, key)
+            if interaction is None:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"No recorded {kind} interaction for {op}")
+            self.stats["replayed"] += 1
+            if interaction["latency"] and self.time_scale:
+                await asyncio.sleep(interaction["latency"] * self.time_scale)
+            if "error" in interaction:
+                raise ReplayedError(f"{interaction['error']['type']}: {interaction['error']['message']}")
+            response = interaction["response"]
+            return decode(response) if decode else response
+
+        started = time.monotonic()
+        record = {
+            "type": "interaction",
+            "kind": kind,
+            "op": op,
+            "key": key,
+            "offset": round(started - self._started, 3),
+            "request": compact_request,
+        }
+        try:
+            result = await func()
+        except Exception as e:
+            record["latency"] = round(time.monotonic() - started, 3)
+            record["error"] = {"type": type(e).__name__, "message": self.redact(str(e))[:1000]}
+            await self._append_async(record)
+            self.stats["recorded"] += 1
+            raise
+        record["latency"] = round(time.monotonic() - started, 3)
+        record["response"] = self.redact(encode(result) if encode else result)
+        await self._append_async(record)
+        self.stats["recorded"] += 1
+        return result
+
+    def snapshot(self) -> dict:
+        return {"mode": self.mode, "path": self.path, "time_scale": self.time_scale, **self.stats}
+
+
+# Singleton
+_cassette: Optional[Cassette] = None
+
+
+def known_secrets() -> List[str]:
+    settings = get_settings()
+    secrets = [
+        settings.discord_bot_token, settings.notion_api_key, settings.google_api_key,
+        settings.openai_api_key, settings.make_webhook_url, settings.debug_token,
+    ]
+    for config in settings.get_channel_notion_map().values():
+        if isinstance(config, dict):
+            secrets.append(config.get("api_key"))
+    return [s for s in secrets if s]
+
+
+def get_cassette() -> Cassette:
+    global _cassette
+    if _cassette is None:
+        settings = get_settings()
+        # 여러 프로세스(gateway worker)가 같은 파일에 쓰지 않도록 경로에 {pid}를 넣을 수 있음
+        path = settings.cassette_path.format(pid=os.getpid())
+        _cassette = Cassette(path, settings.cassette_mode, settings.cassette_time_scale, known_secrets())
+    return _cassette
+
+
+def set_cassette(cassette: Cassette) -> None:
+    """replay 실행기 등에서 서비스 생성 전에 cassette를 직접 지정"""
+    global _cassette
+    _cassette = cassette
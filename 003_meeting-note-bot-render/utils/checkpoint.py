@@ -0,0 +1,64 @@
+import asyncio
+import json
+import logging
+import os
+from typing import List, Optional
+
+from config import get_settings
+
+logger = logging.getLogger("Checkpoint")
+
+
+class CheckpointStore:
+    """
+    처리 중인 작업의 단계별 상태를 job_id별 JSON 파일로 보관.
+    작업이 끝나면(성공/영구 실패) 삭제되므로, 부팅 시 남아 있는 파일 = 이어서 처리할 작업.
+    쓰기는 임시 파일 + os.replace로 원자적으로 수행 (쓰는 도중 종료돼도 이전 상태 유지).
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or get_settings().checkpoint_dir
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.json")
+
+    def _save_sync(self, job_id: str, state: dict):
+        path = self._path(job_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def save(self, job_id: str, state: dict):
+        await asyncio.to_thread(self._save_sync, job_id, state)
+
+    def remove(self, job_id: str):
+        try:
+            os.remove(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def load_all(self) -> List[dict]:
+        states = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), encoding="utf-8") as f:
+                    states.append(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping unreadable checkpoint {name}: {e}")
+        return states
+
+
+# Singleton
+_checkpoint_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        _checkpoint_store = CheckpointStore()
+    return _checkpoint_store
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from utils.exceptions import DeadlineExceeded
+
+# 단계별 예산 (작업 전체 예산 대비 비율). 각 단계는 min(비율 × 전체, 남은 시간)만큼 쓸 수 있다.
+# 합이 1을 넘는 것은 의도적: 앞 단계가 빨리 끝나면 뒷 단계가 여유분을 쓸 수 있음.
+DEFAULT_STAGE_BUDGETS = {
+    "download": 0.1,
+    "analysis": 0.75,
+    "notion": 0.3,
+    "email": 0.1,
+}
+
+
+class Deadline:
+    """작업 1건의 종료 시각과 단계별 시간 예산"""
+
+    def __init__(self, total_seconds: float, stage_budgets: Optional[Dict[str, float]] = None):
+        self.total_seconds = total_seconds
+        self.stage_budgets = stage_budgets or DEFAULT_STAGE_BUDGETS
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + total_seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def budget(self, stage: str) -> float:
+        fraction = self.stage_budgets.get(stage, 1.0)
+        return min(self.total_seconds * fraction, self.remaining())
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        """
+        단계 예산 안에서 실행. 초과 시 내부 await(LLM/Notion/HTTP 호출)을 취소하고
+        DeadlineExceeded(stage)로 변환한다.
+        내부 호출 자체의 TimeoutError(소켓 timeout 등)는 예산 초과가 아니므로 그대로 전파.
+        """
+        budget = self.budget(name)
+        if budget <= 0:
+            raise DeadlineExceeded(name, 0)
+        cm = asyncio.timeout(budget)
+        try:
+            async with cm:
+                yield budget
+        except TimeoutError as e:
+            if not cm.expired():
+                raise
+            raise DeadlineExceeded(name, budget) from e
+
+
+@asynccontextmanager
+async def deadline_stage(deadline: Optional[Deadline], name: str):
+    """deadline이 없으면 제한 없이 실행 (CLI/테스트 등 기존 호출부 호환)"""
+    if deadline is None:
+        yield None
+        return
+    async with deadline.stage(name) as budget:
+        yield budget
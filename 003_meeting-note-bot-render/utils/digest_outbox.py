@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from config import get_settings
+
+logger = logging.getLogger("DigestOutbox")
+
+# 전송 중(claim) 표시가 이 시간 넘게 남아 있으면 그 프로세스가 죽은 것으로 보고 다른 프로세스가 다시 전송
+CLAIM_TIMEOUT_SECONDS = 300
+
+
+class DigestOutbox:
+    """
+    digest 모드에서 아직 전송하지 않은 회의 항목 (SQLite, 프로세스 간 공유).
+    - 항목은 웹훅 전송이 성공한 뒤에만 삭제 → 재시작 / 크래시 중에도 유실 없음
+    - gateway 모드의 여러 worker가 같은 파일에 쌓으므로 그룹별 digest가 프로세스와 무관하게 합쳐진다
+    - 전송할 프로세스는 BEGIN IMMEDIATE로 그룹 항목을 claim해 한 곳에서만 보낸다
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or get_settings().email_digest_path
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS digest_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                group_name TEXT NOT NULL,
+                entry TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                available_at REAL NOT NULL DEFAULT 0,
+                claimed_by TEXT,
+                claimed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_digest_group ON digest_items(group_name, enqueued_at);
+        """)
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # 전송 대기 중이거나, 전송하던 프로세스가 죽어 claim이 만료된 항목 (params: now, now - CLAIM_TIMEOUT)
+    _CLAIMABLE = "available_at <= ? AND (claimed_by IS NULL OR claimed_at < ?)"
+
+    def _add_sync(self, group: str, entry: dict) -> int:
+        now = time.time()
+        self._execute(
+            "INSERT INTO digest_items (group_name, entry, enqueued_at) VALUES (?, ?, ?)",
+            (group, json.dumps(entry, ensure_ascii=False), now),
+        )
+        return self._execute(
+            f"SELECT COUNT(*) FROM digest_items WHERE group_name = ? AND {self._CLAIMABLE}",
+            (group, now, now - CLAIM_TIMEOUT_SECONDS),
+        )[0][0]
+
+    async def add(self, group: str, entry: dict) -> int:
+        """항목 저장. 그룹에 쌓인 (전송 대기) 항목 수를 반환."""
+        return await asyncio.to_thread(self._add_sync, group, entry)
+
+    def _due_groups_sync(self, window: float, max_items: int) -> List[str]:
+        now = time.time()
+        rows = self._execute(
+            f"SELECT group_name FROM digest_items WHERE {self._CLAIMABLE} "
+            "GROUP BY group_name HAVING COUNT(*) >= ? OR MIN(enqueued_at) <= ?",
+            (now, now - CLAIM_TIMEOUT_SECONDS, max_items, now - window),
+        )
+        return [row[0] for row in rows]
+
+    async def due_groups(self, window: float, max_items: int) -> List[str]:
+        """첫 항목 이후 window가 지났거나 max_items 이상 쌓인 그룹"""
+        return await asyncio.to_thread(self._due_groups_sync, window, max_items)
+
+    async def groups(self) -> List[str]:
+        return await self.due_groups(0, 0)
+
+    def _claim_sync(self, group: str, token: str) -> List[Tuple[int, dict]]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    f"UPDATE digest_items SET claimed_by = ?, claimed_at = ? WHERE group_name = ? AND {self._CLAIMABLE}",
+                    (token, now, group, now, now - CLAIM_TIMEOUT_SECONDS),
+                )
+                rows = self._conn.execute(
+                    "SELECT id, entry FROM digest_items WHERE claimed_by = ? ORDER BY id", (token,),
+                ).fetchall()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(row_id, json.loads(entry)) for row_id, entry in rows]
+
+    async def claim(self, group: str, token: str) -> List[Tuple[int, dict]]:
+        """그룹의 전송 대기 항목을 이 전송(token) 몫으로 표시하고 반환"""
+        return await asyncio.to_thread(self._claim_sync, group, token)
+
+    async def complete(self, ids: List[int]):
+        """전송 성공: 삭제"""
+        await asyncio.to_thread(
+            self._execute, f"DELETE FROM digest_items WHERE id IN ({','.join('?' * len(ids))})", tuple(ids),
+        )
+
+    async def release(self, ids: List[int], delay: float = 0):
+        """전송 실패: claim을 풀고 delay초 뒤에 다시 보낼 수 있게 함"""
+        await asyncio.to_thread(
+            self._execute,
+            f"UPDATE digest_items SET claimed_by = NULL, claimed_at = NULL, available_at = ? "
+            f"WHERE id IN ({','.join('?' * len(ids))})",
+            (time.time() + delay, *ids),
+        )
+
+    def snapshot(self) -> dict:
+        rows = self._execute("SELECT group_name, COUNT(*), MIN(enqueued_at) FROM digest_items GROUP BY group_name")
+        now = time.time()
+        return {
+            group: {"pending": count, "oldest_seconds": round(now - oldest, 1)}
+            for group, count, oldest in rows
+        }
+
+
+# Singleton
+_digest_outbox: Optional[DigestOutbox] = None
+
+
+def get_digest_outbox() -> DigestOutbox:
+    global _digest_outbox
+    if _digest_outbox is None:
+        _digest_outbox = DigestOutbox()
+    return _digest_outbox
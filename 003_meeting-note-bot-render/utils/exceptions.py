@@ -21,3 +21,12 @@ class EmailError(MeetingBotError):
 class ConfigError(MeetingBotError):
     """Configuration validation failed."""
     pass
+
+
+class DeadlineExceeded(MeetingBotError):
+    """A pipeline stage ran out of its time budget."""
+
+    def __init__(self, stage: str, budget: float):
+        self.stage = stage
+        self.budget = budget
+        super().__init__(f"Stage '{stage}' exceeded its {budget:.0f}s budget")
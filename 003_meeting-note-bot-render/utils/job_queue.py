@@ -0,0 +1,276 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config import get_settings
+
+logger = logging.getLogger("JobQueue")
+
+# heartbeat가 이 시간 이상 끊긴 running 작업은 워커가 죽은 것으로 보고 대기열로 되돌림
+STALE_AFTER_SECONDS = 90
+MAX_ATTEMPTS = 3
+# 끝난 작업(done/failed/cancelled)은 /jobs 표시에 쓰는 값만 남기고 state(원문·분석 결과 포함)를 비움
+SUMMARY_STATE = (
+    "json_object('filename', json_extract(state, '$.filename'), 'stage', json_extract(state, '$.stage'), "
+    "'timings', json(json_extract(state, '$.timings')))"
+)
+
+
+class JobQueue:
+    """
+    gateway ↔ worker 프로세스 간 로컬 작업 큐 (SQLite, 외부 서비스 없음).
+    - gateway: enqueue만 수행
+    - worker: claim → (단계마다 update_state) → complete / fail / release
+    작업 상태(state)는 checkpoint와 같은 dict이므로, 워커가 죽어도 다른 워커가 마지막 완료 단계부터 이어서 처리.
+    여러 프로세스가 같은 파일을 쓰므로 WAL + BEGIN IMMEDIATE로 claim을 직렬화한다.
+    """
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or get_settings().job_queue_path
+        directory = os.path.dirname(self.db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT UNIQUE NOT NULL,
+                channel_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                worker TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                enqueued_at REAL NOT NULL,
+                available_at REAL NOT NULL DEFAULT 0,
+                started_at REAL,
+                heartbeat_at REAL,
+                finished_at REAL,
+                cancel_requested INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, channel_id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs(status, finished_at);
+        """)
+        try:
+            # 이전 버전에서 만든 큐 파일
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- Gateway ---
+
+    def _enqueue_sync(self, state: dict):
+        self._execute(
+            "INSERT OR IGNORE INTO jobs (job_id, channel_id, state, enqueued_at) VALUES (?, ?, ?, ?)",
+            (state["job_id"], str(state["channel_id"]), json.dumps(state, ensure_ascii=False), time.time()),
+        )
+
+    async def enqueue(self, state: dict) -> int:
+        """작업 등록. 같은 채널에서 앞에 대기 중인 작업 수를 반환."""
+        await asyncio.to_thread(self._enqueue_sync, state)
+        rows = await asyncio.to_thread(
+            self._execute,
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND channel_id = ? AND job_id != ?",
+            (str(state["channel_id"]), state["job_id"]),
+        )
+        return rows[0][0]
+
+    # --- Worker ---
+
+    def _claim_sync(self, worker: str) -> Optional[tuple]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 죽은 워커의 작업 회수 (재시도 한도를 다 쓴 작업은 release와 같이 failed: 워커를 죽이는 작업의 무한 재시도 방지)
+                self._conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                    "finished_at = CASE WHEN attempts >= ? THEN ? END, "
+                    "error = CASE WHEN attempts >= ? THEN 'worker stopped responding' ELSE error END, "
+                    f"state = CASE WHEN attempts >= ? THEN {SUMMARY_STATE} ELSE state END, "
+                    "worker = NULL WHERE status = 'running' AND heartbeat_at < ?",
+                    (MAX_ATTEMPTS, MAX_ATTEMPTS, now, MAX_ATTEMPTS, MAX_ATTEMPTS, now - STALE_AFTER_SECONDS),
+                )
+                # 채널 공정성: 실행 중인 작업이 적은 채널 우선, 같으면 먼저 들어온 작업
+                row = self._conn.execute("""
+                    SELECT j.id, j.state, j.cancel_requested FROM jobs j
+                    WHERE j.status = 'queued' AND j.available_at <= ?
+                    ORDER BY (SELECT COUNT(*) FROM jobs r WHERE r.status = 'running' AND r.channel_id = j.channel_id), j.id
+                    LIMIT 1
+                """, (now,)).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                        "started_at = ?, heartbeat_at = ? WHERE id = ?",
+                        (worker, now, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row
+
+    async def claim(self, worker: str) -> Optional[tuple]:
+        """
+        가장 먼저 처리할 작업을 running으로 바꾸고 (id, state)를 반환. 없으면 None.
+        대기 중에 취소 요청된 작업은 state["cancel_requested"]로 알려 MeetingJob이 안내 후 건너뛰게 한다.
+        """
+        row = await asyncio.to_thread(self._claim_sync, worker)
+        if row is None:
+            return None
+        state = json.loads(row[1])
+        if row[2]:
+            state["cancel_requested"] = True
+        return row[0], state
+
+    async def heartbeat(self, row_id: int) -> bool:
+        """heartbeat 갱신. 취소 요청 여부를 반환."""
+        rows = await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? RETURNING cancel_requested",
+            (time.time(), row_id),
+        )
+        return bool(rows and rows[0][0])
+
+    # --- Introspection / cancel (gateway) ---
+
+    def _request_cancel_sync(self, job_id: str) -> Optional[str]:
+        rows = self._execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? AND status IN ('queued', 'running') RETURNING status",
+            (job_id,),
+        )
+        if rows:
+            return rows[0][0]
+        exists = self._execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,))
+        return "finished" if exists else None
+
+    async def request_cancel(self, job_id: str) -> Optional[str]:
+        """
+        취소 요청 표시. worker가 heartbeat에서 확인해 실행 중인 작업을 취소하고,
+        대기 중인 작업은 꺼낼 때 안내 후 건너뛴다.
+        Returns: queued | running | finished | None(없음)
+        """
+        return await asyncio.to_thread(self._request_cancel_sync, job_id)
+
+    def list_jobs(self, recent: int = 20) -> dict:
+        """대기/실행 중인 작업 + 최근 끝난 작업 (단계별 소요 시간은 checkpoint로 저장된 state["timings"])"""
+        now = time.time()
+        columns = "job_id, channel_id, status, worker, attempts, cancel_requested, enqueued_at, started_at, finished_at, error, " \
+                  "json_extract(state, '$.filename'), json_extract(state, '$.stage'), json_extract(state, '$.timings')"
+
+        def to_dict(row):
+            (job_id, channel_id, status, worker, attempts, cancel_requested, enqueued_at, started_at,
+             finished_at, error, filename, stage, timings) = row
+            return {
+                "job_id": job_id,
+                "channel_id": channel_id,
+                "filename": filename,
+                "status": status,
+                "worker": worker,
+                "attempts": attempts,
+                "last_completed_stage": stage,
+                "timings": json.loads(timings) if timings else {},
+                "cancel_requested": bool(cancel_requested),
+                "waited": round((started_at or now) - enqueued_at, 3),
+                "elapsed": round((finished_at or now) - started_at, 3) if started_at else None,
+                "error": error,
+            }
+
+        active = self._execute(f"SELECT {columns} FROM jobs WHERE status IN ('queued', 'running') ORDER BY id")
+        finished = self._execute(
+            f"SELECT {columns} FROM jobs WHERE status NOT IN ('queued', 'running') ORDER BY finished_at DESC LIMIT ?",
+            (recent,),
+        )
+        return {"active": [to_dict(row) for row in active], "recent": [to_dict(row) for row in finished]}
+
+    def _update_state_sync(self, row_id: int, state: dict):
+        # state에는 원문과 분석 결과가 들어 있으므로 직렬화도 스레드에서
+        self._execute(
+            "UPDATE jobs SET state = ?, heartbeat_at = ? WHERE id = ?",
+            (json.dumps(state, ensure_ascii=False), time.time(), row_id),
+        )
+
+    async def update_state(self, row_id: int, state: dict):
+        # 얕은 복사: 직렬화 중에 루프 쪽에서 state 키가 추가돼도 (예: cancel_requested) 안전
+        await asyncio.to_thread(self._update_state_sync, row_id, dict(state))
+
+    def _finish_sync(self, row_id: int, status: str, error: Optional[str]):
+        self._execute(
+            f"UPDATE jobs SET status = ?, error = ?, finished_at = ?, worker = NULL, state = {SUMMARY_STATE} WHERE id = ?",
+            (status, error, time.time(), row_id),
+        )
+
+    async def complete(self, row_id: int):
+        await asyncio.to_thread(self._finish_sync, row_id, "done", None)
+
+    async def fail(self, row_id: int, error: str):
+        await asyncio.to_thread(self._finish_sync, row_id, "failed", error[:500])
+
+    async def cancelled(self, row_id: int):
+        await asyncio.to_thread(self._finish_sync, row_id, "cancelled", "cancelled by request")
+
+    async def release(self, row_id: int, delay: float = 0):
+        """
+        중단된 작업을 대기열로 되돌림 (재시도 한도 초과 시 failed).
+        delay초 동안은 다시 꺼내지 않는다 (일시 장애 시 즉시 재시도 반복 방지).
+        """
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "finished_at = CASE WHEN attempts >= ? THEN ? END, "
+            f"state = CASE WHEN attempts >= ? THEN {SUMMARY_STATE} ELSE state END, "
+            "worker = NULL, available_at = ? WHERE id = ?",
+            (MAX_ATTEMPTS, MAX_ATTEMPTS, time.time(), MAX_ATTEMPTS, time.time() + delay, row_id),
+        )
+
+    def snapshot(self) -> dict:
+        rows = self._execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        counts = {status: count for status, count in rows}
+        workers = self._execute("SELECT COUNT(DISTINCT worker) FROM jobs WHERE status = 'running'")[0][0]
+        oldest = self._execute("SELECT MIN(enqueued_at) FROM jobs WHERE status = 'queued'")[0][0]
+        return {
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "busy_workers": workers,
+            "oldest_wait_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+        }
+
+
+class QueueCheckpoint:
+    """JobQueue 행을 CheckpointStore 인터페이스(save/remove)로 감싸 MeetingJob이 그대로 쓰도록 함"""
+
+    def __init__(self, queue: JobQueue, row_id: int):
+        self.queue = queue
+        self.row_id = row_id
+
+    async def save(self, job_id: str, state: dict):
+        await self.queue.update_state(self.row_id, state)
+
+    def remove(self, job_id: str):
+        # 완료/실패 기록은 워커가 complete()/fail()로 남긴다
+        pass
+
+
+# Singleton
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue()
+    return _job_queue
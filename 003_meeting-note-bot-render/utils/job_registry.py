@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, Optional
+
+logger = logging.getLogger("JobRegistry")
+
+RECENT_LIMIT = 50
+
+
+class _JobRecord:
+    __slots__ = ("job_id", "channel_id", "filename", "size", "status", "stage", "created_at",
+                 "stage_started", "started", "timings", "task", "cancel_requested", "finished_at")
+
+    def __init__(self, job_id: str, channel_id: str, filename: str, size: int):
+        now = time.monotonic()
+        self.job_id = job_id
+        self.channel_id = channel_id
+        self.filename = filename
+        self.size = size
+        self.status = "queued"
+        self.stage = "queued"
+        self.created_at = time.time()
+        self.stage_started = now
+        self.started = now
+        self.timings: Dict[str, float] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.cancel_requested = False
+        self.finished_at: Optional[float] = None
+
+    def close_stage(self, now: float):
+        self.timings[self.stage] = round(self.timings.get(self.stage, 0.0) + now - self.stage_started, 3)
+        self.stage_started = now
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "job_id": self.job_id,
+            "channel_id": self.channel_id,
+            "filename": self.filename,
+            "size": self.size,
+            "status": self.status,
+            "stage": self.stage,
+            "stage_elapsed": round(now - self.stage_started, 3) if self.finished_at is None else None,
+            "elapsed": round((self.finished_at or now) - self.started, 3),
+            "timings": dict(self.timings),
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+        }
+
+
+class JobRegistry:
+    """
+    이 프로세스에서 대기/실행 중인 작업과 최근 끝난 작업의 단계별 소요 시간.
+    단계 전환 시 dict 필드만 바꾸므로 snapshot()은 작업 수에 비례하는 dict 생성뿐 (1초 간격 polling 가능).
+    cancel()은 실행 중인 작업 task를 취소해 진행 중인 LLM / Notion await을 중단시키고,
+    아직 시작 전인 작업은 표시만 해 두어 시작 시점에 건너뛰게 한다.
+    """
+
+    def __init__(self, recent_limit: int = RECENT_LIMIT):
+        self._active: Dict[str, _JobRecord] = {}
+        self._recent = deque(maxlen=recent_limit)
+
+    def register(self, job_id: str, channel_id: str, filename: str, size: int = 0):
+        """대기열 등록 시점 (이미 등록된 작업이면 그대로 둠)"""
+        if job_id not in self._active:
+            self._active[job_id] = _JobRecord(job_id, str(channel_id), filename, size or 0)
+
+    def enter_stage(self, job_id: str, stage: str):
+        record = self._active.get(job_id)
+        if record is None or record.stage == stage:
+            return
+        record.close_stage(time.monotonic())
+        record.stage = stage
+
+    def attach(self, job_id: str, task: asyncio.Task):
+        """실행 시작: 취소 대상 task 연결"""
+        record = self._active.get(job_id)
+        if record is not None:
+            record.task = task
+            record.status = "running"
+
+    def timings(self, job_id: str) -> Dict[str, float]:
+        """완료된 단계 + 진행 중인 단계의 현재까지 소요 시간 (checkpoint 저장 시 함께 기록)"""
+        record = self._active.get(job_id)
+        if record is None:
+            return {}
+        timings = dict(record.timings)
+        timings[record.stage] = round(timings.get(record.stage, 0.0) + time.monotonic() - record.stage_started, 3)
+        return timings
+
+    def cancel_requested(self, job_id: str) -> bool:
+        record = self._active.get(job_id)
+        return record is not None and record.cancel_requested
+
+    def finish(self, job_id: str, status: str):
+        """done / failed / cancelled / interrupted(종료 중 중단, checkpoint로 재개)"""
+        record = self._active.pop(job_id, None)
+        if record is None:
+            return
+        now = time.monotonic()
+        record.close_stage(now)
+        record.status = status
+        record.finished_at = now
+        record.task = None
+        self._recent.append(record)
+
+    def cancel(self, job_id: str) -> str:
+        """Returns: cancelling(실행 중 task 취소) | cancelled(시작 전, 시작 시 건너뜀) | finished | not_found"""
+        record = self._active.get(job_id)
+        if record is None:
+            return "finished" if any(r.job_id == job_id for r in self._recent) else "not_found"
+        record.cancel_requested = True
+        if record.task is not None and not record.task.done():
+            logger.warning(f"Cancelling job {job_id} at stage '{record.stage}'")
+            record.task.cancel()
+            return "cancelling"
+        logger.warning(f"Job {job_id} marked cancelled before start")
+        return "cancelled"
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "active": [record.to_dict(now) for record in self._active.values()],
+            "recent": [record.to_dict(now) for record in reversed(self._recent)],
+        }
+
+
+# Singleton
+_job_registry: Optional[JobRegistry] = None
+
+
+def get_job_registry() -> JobRegistry:
+    global _job_registry
+    if _job_registry is None:
+        _job_registry = JobRegistry()
+    return _job_registry
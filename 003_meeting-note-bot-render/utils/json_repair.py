@@ -0,0 +1,83 @@
+import json
+import re
+from typing import Optional
+
+_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+# 잘린 JSON 복구 시 시도할 최대 절단 지점 수
+MAX_REPAIR_CANDIDATES = 50
+
+
+def _strip_wrapping(text: str) -> str:
+    """코드 펜스와 JSON 앞의 설명 문장을 제거"""
+    match = _FENCE_PATTERN.search(text)
+    if match:
+        text = match.group(1)
+    start = text.find("{")
+    return text[start:] if start >= 0 else ""
+
+
+def _truncation_candidates(text: str):
+    """
+    완결된 값이 끝나는 지점마다 (절단 위치, 닫아야 할 괄호들)을 기록.
+    뒤쪽 지점부터 시도하면 가장 많은 내용을 살릴 수 있다.
+    """
+    candidates = []
+    stack = []
+    in_string = False
+    escaped = False
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if not stack:
+                break
+            stack.pop()
+            candidates.append((i + 1, "".join(reversed(stack))))
+            if not stack:
+                break
+        elif ch == ",":
+            candidates.append((i, "".join(reversed(stack))))
+
+    return candidates
+
+
+def loads_lenient(text: str) -> Optional[dict]:
+    """
+    LLM 출력에서 JSON 객체를 최대한 복구.
+    - 코드 펜스 / 앞뒤 설명 문장 무시
+    - JSON 뒤에 붙은 잔여 텍스트 무시
+    - 출력이 중간에 잘린 경우 마지막으로 완결된 값까지 살리고 괄호를 닫음
+    복구할 수 없으면 None.
+    """
+    body = _strip_wrapping(text or "")
+    if not body:
+        return None
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(body)
+        return value if isinstance(value, dict) else None
+    except json.JSONDecodeError:
+        pass
+
+    candidates = _truncation_candidates(body)
+    for end, closers in reversed(candidates[-MAX_REPAIR_CANDIDATES:]):
+        try:
+            value = json.loads(body[:end] + closers)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from config import get_settings
+
+logger = logging.getLogger("Limiter")
+
+# provider 과부하(429/503/timeout)로 판단할 예외 이름/메시지 조각
+OVERLOAD_MARKERS = ("429", "503", "RateLimit", "ResourceExhausted", "TooManyRequests", "quota", "Timeout", "timed out")
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """LLM provider가 과부하/한도 초과로 거절한 경우인지 판별"""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    text = f"{type(exc).__name__} {exc}"
+    return any(marker in text for marker in OVERLOAD_MARKERS)
+
+
+class AdaptiveLimiter:
+    """
+    LLM 호출용 AIMD 동시성 제한 + circuit breaker.
+    - 성공: 한도를 1/limit씩 가산 증가 (한도만큼 성공하면 +1)
+    - 429/timeout: 한도를 곱셈 감소
+    - 연속 실패가 임계치를 넘으면 breaker open → 새 호출은 대기열에서 cooldown까지 대기
+    - cooldown 후 half-open: 1건만 시험 호출, 성공 시 close
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, initial_limit: int = 2, min_limit: int = 1, max_limit: int = 8,
+                 decrease_factor: float = 0.5, breaker_threshold: int = 5, breaker_cooldown: float = 60):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._waiting = 0
+        self._consecutive_failures = 0
+        self._state = self.CLOSED
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._condition = asyncio.Condition()
+
+        self.total_successes = 0
+        self.total_failures = 0
+        self.total_overloads = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.breaker_cooldown:
+            return self.HALF_OPEN
+        return self._state
+
+    def _can_start(self) -> bool:
+        state = self.state
+        if state == self.OPEN:
+            return False
+        if state == self.HALF_OPEN:
+            return not self._probe_in_flight and self._in_flight == 0
+        return self._in_flight < self.limit
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            self._waiting += 1
+            try:
+                while not self._can_start():
+                    timeout = None
+                    if self._state == self.OPEN:
+                        timeout = max(0.0, self.breaker_cooldown - (time.monotonic() - self._opened_at))
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting -= 1
+
+            if self.state == self.HALF_OPEN:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = True
+                logger.info("LLM circuit breaker half-open: sending probe request")
+            self._in_flight += 1
+
+    async def release(self, success: bool, overload: bool = False, cancelled: bool = False) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            probe = self._probe_in_flight
+            self._probe_in_flight = False
+
+            if cancelled:
+                # 취소는 provider 상태와 무관하므로 한도/breaker에 반영하지 않음
+                pass
+            elif success:
+                self.total_successes += 1
+                self._consecutive_failures = 0
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                if self._state != self.CLOSED:
+                    logger.info("LLM circuit breaker closed")
+                self._state = self.CLOSED
+            else:
+                self.total_failures += 1
+                self._consecutive_failures += 1
+                if overload:
+                    self.total_overloads += 1
+                    self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                    logger.warning(f"LLM overload detected, concurrency limit → {self.limit}")
+                if probe or self._consecutive_failures >= self.breaker_threshold:
+                    self._state = self.OPEN
+                    self._opened_at = time.monotonic()
+                    logger.error(f"LLM circuit breaker open for {self.breaker_cooldown}s "
+                                 f"(consecutive_failures={self._consecutive_failures})")
+
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        """async with limiter.slot(): ... — 예외 종류에 따라 성공/과부하/실패를 기록"""
+        await self.acquire()
+        try:
+            yield
+        except asyncio.CancelledError:
+            await asyncio.shield(self.release(success=False, cancelled=True))
+            raise
+        except Exception as e:
+            await self.release(success=False, overload=is_overload_error(e))
+            raise
+        else:
+            await self.release(success=True)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "breaker_state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "total_successes": self.total_successes,
+            "total_failures": self.total_failures,
+            "total_overloads": self.total_overloads,
+        }
+
+
+# Singleton
+_llm_limiter: Optional[AdaptiveLimiter] = None
+
+
+def get_llm_limiter() -> AdaptiveLimiter:
+    global _llm_limiter
+    if _llm_limiter is None:
+        settings = get_settings()
+        _llm_limiter = AdaptiveLimiter(
+            initial_limit=settings.llm_initial_concurrency,
+            min_limit=1,
+            max_limit=settings.llm_max_concurrency,
+            breaker_threshold=settings.llm_breaker_threshold,
+            breaker_cooldown=settings.llm_breaker_cooldown,
+        )
+    return _llm_limiter
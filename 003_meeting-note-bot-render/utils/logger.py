@@ -1,39 +1,151 @@
+import atexit
 import logging
 import json
+import queue
 import sys
+import time
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json 사용
+    orjson = None
+
+_listener: Optional[QueueListener] = None
+
+
+def _dumps(data: dict) -> str:
+    if orjson is not None:
+        try:
+            # extra_data에 {channel_id(int): ...} 같은 비문자열 키가 올 수 있음 (표준 json처럼 문자열로 변환)
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # orjson이 처리하지 못하는 값 (64비트 초과 정수 등)은 표준 json으로
+    return json.dumps(data, ensure_ascii=False, default=str)
 
 
 class JsonFormatter(logging.Formatter):
     """JSON log formatter for Render dashboard compatibility."""
 
+    def __init__(self):
+        super().__init__()
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        # 초 단위 ISO 접두사는 같은 초의 레코드끼리 재사용
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        micros = int((created - second) * 1_000_000)
+        return f"{self._cached_prefix}.{micros:06d}+00:00"
+
     def format(self, record):
         log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         if record.exc_info and record.exc_info[0]:
-            log_data["exception"] = self.formatException(record.exc_info)
+            # 같은 레코드를 여러 handler가 포맷해도 traceback 문자열은 한 번만 생성
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            log_data["exception"] = record.exc_text
         if hasattr(record, "extra_data"):
             log_data["extra"] = record.extra_data
-        return json.dumps(log_data, ensure_ascii=False)
+        return _dumps(log_data)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    반복되는 INFO 로그 샘플링.
+    extra={"sample_key": "..."}가 붙은 레코드만 대상이며, key별로 interval마다 burst건만 통과시킨다.
+    버려진 건수는 다음에 통과하는 레코드의 메시지에 덧붙인다.
+    """
+
+    def __init__(self, interval: float = 10.0, burst: int = 1):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows = {}  # key -> [window_start, passed, suppressed]
+
+    def filter(self, record):
+        key = getattr(record, "sample_key", None)
+        if key is None or record.levelno > logging.INFO:
+            return True
+
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.interval:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.getMessage()} (+{suppressed} similar suppressed)"
+                record.args = None
+            return True
 
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """
+    기본 QueueHandler.prepare()는 호출 스레드(이벤트 루프)에서 포맷까지 수행한다.
+    여기서는 메시지 인자 병합만 하고 JSON 직렬화/traceback 포맷은 listener 스레드로 넘긴다.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(level: str = "INFO", use_queue: bool = True):
+    """
+    Configure root logger with JSON formatter.
+    use_queue=True면 이벤트 루프에서는 큐에 넣기만 하고, 포맷/stdout 쓰기는 백그라운드 스레드에서 처리.
+    """
+    global _listener
 
-def setup_logging(level: str = "INFO"):
-    """Configure root logger with JSON formatter."""
     root = logging.getLogger()
     root.setLevel(getattr(logging, level.upper(), logging.INFO))
 
     # Clear existing handlers
+    stop_logging()
     root.handlers.clear()
 
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(JsonFormatter())
-    root.addHandler(handler)
+
+    if use_queue:
+        queue_handler = _DeferredFormatQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(SamplingFilter())
+        root.addHandler(queue_handler)
+        _listener = QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler.addFilter(SamplingFilter())
+        root.addHandler(handler)
 
     # Suppress noisy libraries
     logging.getLogger("discord").setLevel(logging.WARNING)
     logging.getLogger("aiohttp").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
+
+
+def stop_logging():
+    """백그라운드 writer 스레드를 멈추고 남은 로그를 모두 flush"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import get_settings
+
+logger = logging.getLogger("LoopMonitor")
+
+
+def _percentile(sorted_values: list, pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LoopWatchdog:
+    """
+    이벤트 루프 지연(lag) 감시.
+    - heartbeat 코루틴: interval마다 깨어나며 실제 지연을 측정해 기록
+    - sampler 스레드: heartbeat가 threshold 이상 멈추면 루프 스레드의 현재 스택을 캡처
+      (루프를 막고 있는 코드가 바로 그 스택)
+    """
+
+    def __init__(self, interval: float = 0.1, stall_threshold: float = 0.25,
+                 max_samples: int = 3000, max_stalls: int = 20):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._samples = deque(maxlen=max_samples)
+        self._stalls = deque(maxlen=max_stalls)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._pending_stall: Optional[dict] = None
+        self._stall_count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """이벤트 루프 안에서 호출"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._sample, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"Loop watchdog started: interval={self.interval}s, stall_threshold={self.stall_threshold}s")
+
+    def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._samples.append(lag)
+            self._last_beat = now
+
+            stall = self._pending_stall
+            if stall is not None:
+                # 캡처된 stall이 끝남: 최종 지속 시간 기록
+                stall["duration_ms"] = round(lag * 1000, 1)
+                self._pending_stall = None
+                logger.warning(f"Event loop stalled for {stall['duration_ms']}ms", extra={"extra_data": {"stack": stall["stack"][-3:]}})
+
+    def _sample(self):
+        while not self._stopped.wait(self.stall_threshold / 2):
+            blocked_for = time.monotonic() - self._last_beat - self.interval
+            if blocked_for < self.stall_threshold or self._pending_stall is not None:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stall = {
+                "detected_at": datetime.now(timezone.utc).isoformat(),
+                "blocked_ms_at_capture": round(blocked_for * 1000, 1),
+                "duration_ms": None,
+                "stack": [line.rstrip() for line in traceback.format_stack(frame)],
+            }
+            self._pending_stall = stall
+            self._stalls.append(stall)
+            self._stall_count += 1
+
+    def snapshot(self) -> dict:
+        lags = sorted(self._samples)
+
+        def to_ms(value):
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "stall_threshold_ms": self.stall_threshold * 1000,
+            "samples": len(lags),
+            "lag_ms": {
+                "p50": to_ms(_percentile(lags, 50)),
+                "p90": to_ms(_percentile(lags, 90)),
+                "p99": to_ms(_percentile(lags, 99)),
+                "max": to_ms(lags[-1] if lags else None),
+            },
+            "stall_count": self._stall_count,
+            "recent_stalls": list(self._stalls),
+        }
+
+
+# Singleton
+_watchdog: Optional[LoopWatchdog] = None
+
+
+def get_loop_watchdog() -> LoopWatchdog:
+    global _watchdog
+    if _watchdog is None:
+        settings = get_settings()
+        _watchdog = LoopWatchdog(stall_threshold=settings.loop_stall_threshold_ms / 1000)
+    return _watchdog
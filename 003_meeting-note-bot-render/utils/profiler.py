@@ -0,0 +1,177 @@
+import asyncio
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger("Profiler")
+
+MAX_PROFILE_SECONDS = 120
+
+
+class ProfilerBusyError(Exception):
+    """다른 CPU 프로파일이 이미 실행 중"""
+    pass
+
+
+def _collapse(frame) -> str:
+    """프레임 체인을 flamegraph collapsed 형식(root;...;leaf)으로 변환"""
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class Profiler:
+    """
+    요청 시에만 동작하는 CPU/메모리 프로파일러.
+    유휴 상태에서는 스레드/트레이스 훅이 전혀 없으므로 운영 환경에 상시 포함해도 비용이 없다.
+    """
+
+    def __init__(self):
+        self._cpu_lock = asyncio.Lock()
+        # 메모리 스냅샷은 스레드에서 만들므로 동시 요청이 _last_snapshot을 덮어쓰지 않게
+        self._memory_lock = threading.Lock()
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    # --- CPU ---
+
+    async def sample_cpu(self, seconds: float, interval: float = 0.005) -> str:
+        """
+        별도 스레드에서 이벤트 루프 스레드의 스택을 주기적으로 샘플링.
+        Returns: collapsed stack 텍스트 (flamegraph.pl / speedscope 입력)
+        """
+        seconds = min(max(seconds, 1), MAX_PROFILE_SECONDS)
+        if self._cpu_lock.locked():
+            raise ProfilerBusyError("CPU profile already running")
+
+        async with self._cpu_lock:
+            target = threading.get_ident()
+            counts = Counter()
+            stop = threading.Event()
+
+            def sampler():
+                while not stop.wait(interval):
+                    frame = sys._current_frames().get(target)
+                    if frame is not None:
+                        counts[_collapse(frame)] += 1
+
+            thread = threading.Thread(target=sampler, name="cpu-sampler", daemon=True)
+            logger.info(f"CPU sampling started for {seconds}s")
+            thread.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                thread.join()
+
+            return "\n".join(f"{stack} {count}" for stack, count in counts.most_common()) + "\n"
+
+    async def profile_cpu(self, seconds: float) -> cProfile.Profile:
+        """이벤트 루프 스레드에서 seconds 동안 cProfile 실행 (모든 코루틴/콜백 포함)"""
+        seconds = min(max(seconds, 1), MAX_PROFILE_SECONDS)
+        if self._cpu_lock.locked():
+            raise ProfilerBusyError("CPU profile already running")
+
+        async with self._cpu_lock:
+            profile = cProfile.Profile()
+            logger.info(f"cProfile started for {seconds}s")
+            profile.enable()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profile.disable()
+            return profile
+
+    @staticmethod
+    def pstats_dump(profile: cProfile.Profile) -> bytes:
+        """pstats 바이너리 (python -m pstats / snakeviz 로 열기)"""
+        profile.create_stats()
+        return marshal.dumps(profile.stats)
+
+    @staticmethod
+    def pstats_text(profile: cProfile.Profile, limit: int = 50) -> str:
+        buffer = io.StringIO()
+        pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(limit)
+        return buffer.getvalue()
+
+    # --- Memory ---
+
+    async def memory_snapshot(self, group_by: str = "lineno", limit: int = 30, frames: int = 1) -> dict:
+        """
+        tracemalloc 스냅샷 + 직전 스냅샷 대비 diff.
+        추적 중이 아니면 추적을 시작만 하고, 다음 호출부터 결과를 반환한다.
+        추적 중인 할당이 많으면 스냅샷/비교에 수 초가 걸리므로 이벤트 루프 밖(스레드)에서 실행.
+        """
+        if group_by not in ("lineno", "filename", "traceback"):
+            raise ValueError(f"Invalid group_by: {group_by}")
+        return await asyncio.to_thread(self._memory_snapshot_sync, group_by, limit, frames)
+
+    def _memory_snapshot_sync(self, group_by: str, limit: int, frames: int) -> dict:
+        with self._memory_lock:
+            return self._memory_snapshot_locked(group_by, limit, frames)
+
+    def _memory_snapshot_locked(self, group_by: str, limit: int, frames: int) -> dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._last_snapshot = tracemalloc.take_snapshot()
+            logger.info("tracemalloc started")
+            return {"tracing": True, "started": True, "message": "tracemalloc started; call again for a snapshot"}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+
+        top = [
+            {"location": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+            for stat in snapshot.statistics(group_by)[:limit]
+        ]
+        diff = []
+        if self._last_snapshot is not None:
+            diff = [
+                {
+                    "location": str(stat.traceback),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(self._last_snapshot, group_by)[:limit]
+            ]
+        self._last_snapshot = snapshot
+
+        return {
+            "tracing": True,
+            "traced_current_kb": round(current / 1024, 1),
+            "traced_peak_kb": round(peak / 1024, 1),
+            "top": top,
+            "diff_since_last": diff,
+        }
+
+    def stop_memory(self) -> dict:
+        with self._memory_lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+                logger.info("tracemalloc stopped")
+            self._last_snapshot = None
+        return {"tracing": False}
+
+
+# Singleton
+_profiler: Optional[Profiler] = None
+
+
+def get_profiler() -> Profiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
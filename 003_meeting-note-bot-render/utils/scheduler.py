@@ -0,0 +1,222 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import get_settings
+
+logger = logging.getLogger("Scheduler")
+
+# DRR 한 라운드에 채널이 받는 기본 처리량 (bytes 단위, weight 배수)
+DEFAULT_QUANTUM = 64 * 1024
+
+
+class _Job:
+    __slots__ = ("channel_id", "cost", "run", "label", "enqueued_at")
+
+    def __init__(self, channel_id: str, cost: int, run: Callable[[], Awaitable], label: str):
+        self.channel_id = channel_id
+        self.cost = cost
+        self.run = run
+        self.label = label
+        self.enqueued_at = time.monotonic()
+
+
+class _ChannelQueue:
+    """채널별 대기열. shortest_first면 작은 transcript부터 꺼낸다."""
+
+    def __init__(self, shortest_first: bool):
+        self.shortest_first = shortest_first
+        self._fifo = deque()
+        self._heap = []
+        self._seq = itertools.count()
+
+        self.deficit = 0
+        self.enqueued = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def __len__(self):
+        return len(self._heap) if self.shortest_first else len(self._fifo)
+
+    def push(self, job: _Job):
+        self.enqueued += 1
+        if self.shortest_first:
+            heapq.heappush(self._heap, (job.cost, next(self._seq), job))
+        else:
+            self._fifo.append(job)
+
+    def peek(self) -> _Job:
+        return self._heap[0][2] if self.shortest_first else self._fifo[0]
+
+    def pop(self) -> _Job:
+        return heapq.heappop(self._heap)[2] if self.shortest_first else self._fifo.popleft()
+
+    def oldest_wait(self, now: float) -> float:
+        jobs = [entry[2] for entry in self._heap] if self.shortest_first else self._fifo
+        return max((now - job.enqueued_at for job in jobs), default=0.0)
+
+
+class FairScheduler:
+    """
+    채널별 가중 공정 스케줄러 (Deficit Round Robin).
+    - 채널마다 대기열을 따로 두고, 라운드마다 weight × quantum 만큼의 처리량(바이트)을 배분
+    - 한 채널이 대량 업로드해도 다른 채널의 작업이 라운드마다 끼어들 수 있음
+    - 워커 수만큼만 동시에 파이프라인(LLM + Notion)을 실행
+    """
+
+    def __init__(self, workers: int = 2, weights: Optional[Dict[str, float]] = None,
+                 quantum: int = DEFAULT_QUANTUM, shortest_first: bool = False):
+        self.workers = workers
+        # weight가 0 이하이면 해당 채널이 영원히 선택되지 않으므로 무시
+        self.weights = {str(k): float(v) for k, v in (weights or {}).items() if float(v) > 0}
+        self.quantum = quantum
+        self.shortest_first = shortest_first
+
+        self._queues: Dict[str, _ChannelQueue] = {}
+        self._active = deque()  # 대기 작업이 있는 채널 (라운드 순서)
+        self._condition = asyncio.Condition()
+        self._worker_tasks = []
+        self._running = 0
+        self._draining = False
+
+    def _weight(self, channel_id: str) -> float:
+        return self.weights.get(channel_id, 1.0)
+
+    def start(self):
+        if self._worker_tasks:
+            return
+        self._worker_tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Fair scheduler started: workers={self.workers}, weights={self.weights}, shortest_first={self.shortest_first}")
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    async def drain(self, timeout: float) -> dict:
+        """
+        종료 전 호출: 대기열의 새 작업은 더 꺼내지 않고, 실행 중인 작업은 timeout까지 기다린 뒤 취소.
+        대기열에 남은 작업은 실행되지 않은 채로 버려진다 (호출 측 checkpoint로 재개).
+        """
+        async with self._condition:
+            self._draining = True
+            running = self._running
+            self._condition.notify_all()
+        logger.info(f"Draining scheduler: running={running}, queued={sum(len(q) for q in self._queues.values())}, grace={timeout}s")
+
+        if self._worker_tasks:
+            await asyncio.wait(self._worker_tasks, timeout=timeout)
+        cancelled = self._running
+        await self.stop()
+        return {"finished": running - cancelled, "cancelled": cancelled}
+
+    async def submit(self, channel_id: str, cost: int, run: Callable[[], Awaitable], label: str = "") -> int:
+        """작업 등록. 해당 채널 대기열에서의 순번(0부터)을 반환."""
+        channel_id = str(channel_id)
+        job = _Job(channel_id, max(1, int(cost or 0)), run, label)
+        async with self._condition:
+            queue = self._queues.get(channel_id)
+            if queue is None:
+                queue = self._queues[channel_id] = _ChannelQueue(self.shortest_first)
+            position = len(queue)
+            queue.push(job)
+            if position == 0:
+                self._active.append(channel_id)
+            self._condition.notify()
+        logger.info(f"Job queued: channel={channel_id}, label={label}, cost={job.cost}, position={position}")
+        return position
+
+    def _next_job(self) -> Optional[_Job]:
+        """DRR: 선두 작업 비용만큼 deficit이 쌓인 채널의 작업을 꺼낸다."""
+        while self._active:
+            channel_id = self._active[0]
+            queue = self._queues[channel_id]
+            job = queue.peek()
+            if queue.deficit < job.cost:
+                queue.deficit += self.quantum * self._weight(channel_id)
+                self._active.rotate(-1)
+                continue
+
+            queue.deficit -= job.cost
+            queue.pop()
+            if len(queue) == 0:
+                queue.deficit = 0
+                self._active.popleft()
+            return job
+        return None
+
+    async def _worker(self, index: int):
+        while True:
+            async with self._condition:
+                job = None if self._draining else self._next_job()
+                while job is None:
+                    if self._draining:
+                        return
+                    await self._condition.wait()
+                    job = None if self._draining else self._next_job()
+                self._running += 1
+
+            queue = self._queues[job.channel_id]
+            wait = time.monotonic() - job.enqueued_at
+            queue.started += 1
+            queue.total_wait += wait
+            queue.max_wait = max(queue.max_wait, wait)
+            logger.info(f"Job started: worker={index}, channel={job.channel_id}, label={job.label}, waited={wait:.1f}s")
+
+            try:
+                await job.run()
+                queue.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                queue.failed += 1
+                logger.error(f"Job failed: channel={job.channel_id}, label={job.label}: {e}", exc_info=True)
+            finally:
+                self._running -= 1
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        channels = {}
+        for channel_id, queue in self._queues.items():
+            channels[channel_id] = {
+                "weight": self._weight(channel_id),
+                "queue_depth": len(queue),
+                "enqueued": queue.enqueued,
+                "completed": queue.completed,
+                "failed": queue.failed,
+                "avg_wait_seconds": round(queue.total_wait / queue.started, 2) if queue.started else None,
+                "max_wait_seconds": round(queue.max_wait, 2),
+                "oldest_wait_seconds": round(queue.oldest_wait(now), 2),
+            }
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "draining": self._draining,
+            "queued": sum(len(q) for q in self._queues.values()),
+            "shortest_first": self.shortest_first,
+            "channels": channels,
+        }
+
+
+# Singleton
+_scheduler: Optional[FairScheduler] = None
+
+
+def get_scheduler() -> FairScheduler:
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = FairScheduler(
+            workers=settings.pipeline_workers,
+            weights=settings.get_channel_weights(),
+            shortest_first=settings.scheduler_shortest_first,
+        )
+    return _scheduler
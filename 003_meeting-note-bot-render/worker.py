@@ -0,0 +1,167 @@
+"""
+회의록 처리 worker 프로세스 (PROCESS_MODE=gateway 전용).
+
+    python worker.py
+
+gateway(main.py)가 SQLite 큐(JOB_QUEUE_PATH)에 넣은 작업을 꺼내 분석 → Notion → 이메일을 수행하고,
+결과는 Discord gateway 연결 없이 REST API로 상태 메시지/리액션에 반영한다.
+worker 수를 늘리면(프로세스 단위) CPU 코어 수만큼 처리량이 늘어난다.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+import discord
+
+from config import get_settings
+from utils.logger import setup_logging, stop_logging
+from utils.job_queue import STALE_AFTER_SECONDS, QueueCheckpoint, get_job_queue
+from utils.job_registry import get_job_registry
+from services.meeting_job import MeetingJob
+from services.pipeline import MeetingPipeline
+
+logger = logging.getLogger("Worker")
+
+HEARTBEAT_INTERVAL = 5  # gateway의 /jobs cancel 요청도 이 주기로 확인
+# heartbeat가 이 시간 동안 계속 실패하면 작업을 멈춤: 다른 worker가 stale로 회수해 중복 실행(LLM·Notion·이메일)하기 전에
+HEARTBEAT_GIVE_UP_SECONDS = STALE_AFTER_SECONDS / 2
+RETRY_DELAY_SECONDS = 30
+
+
+class Worker:
+    def __init__(self, client: discord.Client, concurrency: int, poll_interval: float = 1.0):
+        settings = get_settings()
+        self.client = client
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.grace_seconds = settings.shutdown_grace_seconds
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.queue = get_job_queue()
+        self.pipeline = MeetingPipeline()
+        self.job = MeetingJob(self.pipeline, settings.job_deadline_seconds)
+        self.registry = get_job_registry()
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        self._stopping.set()
+
+    async def _load_messages(self, state: dict):
+        """REST로 원본 메시지(첨부 URL 갱신 포함)와 상태 메시지 핸들 조회"""
+        channel = self.client.get_partial_messageable(state["channel_id"])
+        message = await channel.fetch_message(state["message_id"])
+        attachment = next((a for a in message.attachments if a.id == state["attachment_id"]), None)
+        status_msg = channel.get_partial_message(state["status_message_id"])
+        return message, attachment, status_msg
+
+    async def _heartbeat(self, row_id: int, state: dict, job_task: asyncio.Task):
+        loop = asyncio.get_running_loop()
+        last_ok = loop.time()
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            try:
+                cancel_requested = await self.queue.heartbeat(row_id)
+            except Exception as e:
+                # "database is locked" 등 일시 오류는 다음 주기에 재시도
+                failing = loop.time() - last_ok
+                logger.warning(f"Heartbeat failed for job {state['job_id']} ({failing:.0f}s): {e}")
+                if failing >= HEARTBEAT_GIVE_UP_SECONDS:
+                    logger.error(f"Heartbeat lost for job {state['job_id']}, stopping it before another worker reclaims it")
+                    job_task.cancel()
+                    return
+                continue
+            last_ok = loop.time()
+            if cancel_requested and not state.get("cancel_requested"):
+                state["cancel_requested"] = True
+                self.registry.cancel(state["job_id"])
+
+    async def _run_one(self, row_id: int, state: dict):
+        logger.info(f"Job claimed: worker={self.name}, job={state['job_id']}, stage={state['stage']}")
+        heartbeat = None
+        try:
+            try:
+                message, attachment, status_msg = await self._load_messages(state)
+            except discord.HTTPException as e:
+                logger.warning(f"Dropping job {state['job_id']}: original message unavailable ({e})")
+                await self.queue.fail(row_id, f"message unavailable: {e}")
+                return
+
+            job_task = asyncio.create_task(
+                self.job.run(message, attachment, status_msg, state, QueueCheckpoint(self.queue, row_id))
+            )
+            heartbeat = asyncio.create_task(self._heartbeat(row_id, state, job_task))
+            try:
+                succeeded = await job_task
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    raise
+                # heartbeat를 잃어 스스로 멈춘 작업: 다른 worker가 회수해 이어서 처리하므로 행은 건드리지 않음
+                logger.warning(f"Job {state['job_id']} abandoned after lost heartbeat")
+                return
+            if succeeded:
+                await self.queue.complete(row_id)
+            elif state.get("cancel_requested"):
+                await self.queue.cancelled(row_id)
+            else:
+                await self.queue.fail(row_id, "pipeline failed (see status message)")
+        except asyncio.CancelledError:
+            # 종료 중 취소: 마지막 완료 단계가 저장된 상태로 대기열에 되돌려 다른 worker가 이어서 처리
+            await asyncio.shield(self.queue.release(row_id))
+            raise
+        except Exception as e:
+            # Discord REST 장애 등: 잠시 뒤 재시도하도록 대기열로 반환 (재시도 한도까지)
+            logger.error(f"Job {state['job_id']} errored, releasing: {e}", exc_info=True)
+            await self.queue.release(row_id, delay=RETRY_DELAY_SECONDS)
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+
+    async def _loop(self, index: int):
+        while not self._stopping.is_set():
+            claimed = await self.queue.claim(self.name)
+            if claimed is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run_one(*claimed)
+
+    async def run(self):
+        logger.info(f"Worker started: name={self.name}, concurrency={self.concurrency}")
+        self.pipeline.start()
+        loops = [asyncio.create_task(self._loop(i)) for i in range(self.concurrency)]
+
+        await self._stopping.wait()
+        # drain: 새 작업은 꺼내지 않고, 실행 중인 작업은 grace 동안 기다린 뒤 취소(→ 대기열로 반환)
+        _, pending = await asyncio.wait(loops, timeout=self.grace_seconds)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*loops, return_exceptions=True)
+        await self.pipeline.close()
+        logger.info(f"Worker stopped: name={self.name}, interrupted={len(pending)}")
+
+
+async def main():
+    setup_logging()
+    settings = get_settings()
+
+    # gateway(WebSocket) 없이 REST 전용 클라이언트: 로그인만 하면 메시지 조회/수정/리액션 가능
+    client = discord.Client(intents=discord.Intents.none())
+    await client.login(settings.discord_bot_token)
+
+    worker = Worker(client, concurrency=settings.pipeline_workers)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await client.close()
+        stop_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())